@@ -1,8 +1,8 @@
 import json
-import requests
 from typing import Dict, Any
 from log import logger
 from core.base import AgentBase
+from core import transport
 
 class MovieHiveAgent(AgentBase):
     """Agent to fetch movie information using the OMDB API."""
@@ -41,7 +41,7 @@ class MovieHiveAgent(AgentBase):
             }
             
             # Sending the API request
-            response = requests.get(self.base_url, params=params)
+            response = transport.get(self.base_url, params=params)
             data = response.json()
             
             if data.get("Response") == "True":
@@ -76,7 +76,7 @@ class MovieHiveAgent(AgentBase):
                 "plot": "full"
             }
             
-            response = requests.get(self.base_url, params=test_params)
+            response = transport.get(self.base_url, params=test_params)
             data = response.json()
             
             if data.get("Response") == "True":
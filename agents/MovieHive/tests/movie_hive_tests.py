@@ -1,5 +1,6 @@
 import pytest
 import requests
+from core import transport
 from unittest.mock import Mock
 from agents.MovieHive import MovieHiveAgent
 
@@ -19,7 +20,7 @@ def mock_response():
 def movie_hive_agent(monkeypatch, mock_response):
     """Fixture to initialize MovieHiveAgent with mocked requests."""
     agent = MovieHiveAgent()
-    monkeypatch.setattr(requests, "get", Mock(return_value=mock_response))
+    monkeypatch.setattr(transport, "get", Mock(return_value=mock_response))
     return agent
 
 def test_execute_success(movie_hive_agent):
@@ -45,7 +46,7 @@ def test_execute_api_error(movie_hive_agent, monkeypatch):
     mock_error_response = Mock()
     mock_error_response.status_code = 200
     mock_error_response.json.return_value = {"Response": "False", "Error": "Movie not found!"}
-    monkeypatch.setattr(requests, "get", Mock(return_value=mock_error_response))
+    monkeypatch.setattr(transport, "get", Mock(return_value=mock_error_response))
     result = movie_hive_agent.execute(title="Unknown Movie", api_key="test_key")
     assert "error" in result
     assert "Movie not found!" in result["error"]
@@ -54,7 +55,7 @@ def test_execute_request_exception(movie_hive_agent, monkeypatch):
     """Test execution when request raises an exception."""
     def mock_request(*args, **kwargs):
         raise requests.RequestException("Connection error")
-    monkeypatch.setattr(requests, "get", mock_request)
+    monkeypatch.setattr(transport, "get", mock_request)
     
     result = movie_hive_agent.execute(title="Inception", api_key="test_key")
     assert "error" in result
@@ -70,7 +71,7 @@ def test_health_check_failure(movie_hive_agent, monkeypatch):
     """Test health check failure."""
     def mock_request(*args, **kwargs):
         raise requests.RequestException("Service unavailable")
-    monkeypatch.setattr(requests, "get", mock_request)
+    monkeypatch.setattr(transport, "get", mock_request)
     
     health = movie_hive_agent.health_check(api_key="test_key")
     assert health["status"] == "unhealthy"
@@ -1,8 +1,8 @@
-import http.client
 import json
 from typing import Dict, Any, Optional
 from log import logger
 from core.base import AgentBase
+from core import transport
 
 class AmazonProductAgent(AgentBase):
     """Agent to fetch product details from Amazon using the Real-Time Amazon Data API."""
@@ -42,7 +42,7 @@ class AmazonProductAgent(AgentBase):
                        f"&is_prime={is_prime}&deals_and_discounts={deals_and_discounts}"
             
             # Make API request
-            conn = http.client.HTTPSConnection(self.host)
+            conn = transport.PooledConnection(self.host)
             conn.request("GET", endpoint, headers=headers)
             response = conn.getresponse()
             data = response.read()
@@ -78,7 +78,7 @@ class AmazonProductAgent(AgentBase):
                 'x-rapidapi-host': self.host
             }
             
-            conn = http.client.HTTPSConnection(self.host)
+            conn = transport.PooledConnection(self.host)
             conn.request("GET", "/search?query=test&page=1&country=US", headers=headers)
             response = conn.getresponse()
             
@@ -27,7 +27,7 @@ def agent():
     return AmazonProductAgent(api_key="test_api_key")
 
 # Core functionality tests
-@patch('http.client.HTTPSConnection')
+@patch('core.transport.PooledConnection')
 def test_basic_search(mock_conn, agent, successful_response):
     mock_instance = MagicMock()
     mock_conn.return_value = mock_instance
@@ -40,7 +40,7 @@ def test_basic_search(mock_conn, agent, successful_response):
     mock_instance.request.assert_called_once()
 
 # Parameter tests
-@patch('http.client.HTTPSConnection')
+@patch('core.transport.PooledConnection')
 def test_search_with_params(mock_conn, agent, successful_response):
     mock_instance = MagicMock()
     mock_conn.return_value = mock_instance
@@ -65,7 +65,7 @@ def test_missing_required_params(agent):
     assert result["status"] == "failed"
     assert "required" in result["error"].lower()
 
-@patch('http.client.HTTPSConnection')
+@patch('core.transport.PooledConnection')
 def test_api_error_response(mock_conn, agent, error_response):
     mock_instance = MagicMock()
     mock_conn.return_value = mock_instance
@@ -76,7 +76,7 @@ def test_api_error_response(mock_conn, agent, error_response):
     assert result["status"] == "failed"
     assert "Not found" in result["error"] or "404" in result["error"]
 
-@patch('http.client.HTTPSConnection')
+@patch('core.transport.PooledConnection')
 def test_connection_exception(mock_conn, agent):
     mock_instance = MagicMock()
     mock_conn.return_value = mock_instance
@@ -88,7 +88,7 @@ def test_connection_exception(mock_conn, agent):
     assert "Network error" in result["error"]
 
 # Health check tests
-@patch('http.client.HTTPSConnection')
+@patch('core.transport.PooledConnection')
 def test_health_check(mock_conn, agent, successful_response):
     mock_instance = MagicMock()
     mock_conn.return_value = mock_instance
@@ -103,7 +103,7 @@ def test_health_check_without_api_key():
     result = agent.health_check()
     assert result["status"] == "unhealthy"
 
-@patch('http.client.HTTPSConnection')
+@patch('core.transport.PooledConnection')
 def test_malformed_json_response(mock_conn, agent):
     mock_instance = MagicMock()
     mock_conn.return_value = mock_instance
@@ -114,7 +114,7 @@ def test_malformed_json_response(mock_conn, agent):
     assert result["status"] == "failed"
     assert "Expecting value:" in result["error"] or "parse" in result["error"].lower()
 
-@patch('http.client.HTTPSConnection')
+@patch('core.transport.PooledConnection')
 def test_unexpected_status_code(mock_conn, agent):
     mock_instance = MagicMock()
     mock_conn.return_value = mock_instance
@@ -3,6 +3,7 @@ from typing import List, Optional
 import requests
 from pydantic import BaseModel
 from core.base import AgentBase
+from core import transport
 from log import logger
 
 
@@ -88,7 +89,7 @@ class FlightDetailsAgent(AgentBase):
 
         try:
             # Send the API request
-            response = requests.get(self.API_URL, params=params)
+            response = transport.get(self.API_URL, params=params)
 
             # Handle HTTP errors
             if response.status_code == 401:
@@ -133,7 +134,7 @@ class FlightDetailsAgent(AgentBase):
             raise ValueError("API key cannot be empty.")
 
         try:
-            response = requests.get(self.API_URL, params={"access_key": api_key})
+            response = transport.get(self.API_URL, params={"access_key": api_key})
 
             if response.status_code == 200:
                 return {"status": "healthy", "message": "AviationStack API is reachable."}
@@ -17,7 +17,7 @@ def agent():
     return FlightDetailsAgent()
 
 
-@patch("requests.get")
+@patch("core.transport.get")
 def test_execute_valid_request(mock_get, agent):
     """
     Test a valid request with the required and optional parameters.
@@ -59,7 +59,7 @@ def test_execute_valid_request(mock_get, agent):
     assert result["data"][0]["flight_status"] == "landed"
 
 
-@patch("requests.get")
+@patch("core.transport.get")
 def test_execute_invalid_api_key(mock_get, agent):
     """
     Test the behavior when an invalid API key is used.
@@ -71,7 +71,7 @@ def test_execute_invalid_api_key(mock_get, agent):
         agent.execute(api_key=INVALID_API_KEY)
 
 
-@patch("requests.get")
+@patch("core.transport.get")
 def test_execute_missing_required_params(mock_get, agent):
     """
     Test behavior when required parameters are missing.
@@ -83,7 +83,7 @@ def test_execute_missing_required_params(mock_get, agent):
         agent.execute(api_key=VALID_API_KEY)
 
 
-@patch("requests.get")
+@patch("core.transport.get")
 def test_execute_rate_limit_exceeded(mock_get, agent):
     """
     Test the behavior when the API rate limit is exceeded.
@@ -95,7 +95,7 @@ def test_execute_rate_limit_exceeded(mock_get, agent):
         agent.execute(api_key=VALID_API_KEY)
 
 
-@patch("requests.get")
+@patch("core.transport.get")
 def test_execute_server_error(mock_get, agent):
     """
     Test the behavior when the API returns a 500 server error.
@@ -107,7 +107,7 @@ def test_execute_server_error(mock_get, agent):
         agent.execute(api_key=VALID_API_KEY)
 
 
-@patch("requests.get")
+@patch("core.transport.get")
 def test_execute_optional_parameters(mock_get, agent):
     """
     Test behavior with additional optional parameters.
@@ -154,7 +154,7 @@ def test_execute_optional_parameters(mock_get, agent):
     assert result["data"][0]["flight_status"] == "landed"
 
 
-@patch("requests.get")
+@patch("core.transport.get")
 def test_health_check_healthy(mock_get, agent):
     """
     Test the health check method when the API is reachable.
@@ -166,7 +166,7 @@ def test_health_check_healthy(mock_get, agent):
     assert result["message"] == "AviationStack API is reachable."
 
 
-@patch("requests.get")
+@patch("core.transport.get")
 def test_health_check_unhealthy(mock_get, agent):
     """
     Test the health check method when the API is unreachable.
@@ -179,7 +179,7 @@ def test_health_check_unhealthy(mock_get, agent):
 
 
 
-@patch("requests.get")
+@patch("core.transport.get")
 def test_invalid_json_response(mock_get, agent):
     """
     Test the behavior when the API returns an invalid JSON response.
@@ -197,7 +197,7 @@ def test_invalid_json_response(mock_get, agent):
 
 
 
-@patch("requests.get")
+@patch("core.transport.get")
 def test_missing_api_key(mock_get, agent):
     """
     Test the behavior when no API key is provided.
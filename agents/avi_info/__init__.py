@@ -4,6 +4,7 @@ from typing import Any, Dict, Optional, List
 import requests
 from pydantic import BaseModel, ValidationError
 from core.base import AgentBase
+from core import transport
 from log import logger
 
 
@@ -55,7 +56,7 @@ class AviationDataFetcher(AgentBase):
         params["access_key"] = api_key
 
         try:
-            response = requests.get(f"{self.BASE_URL}{category}", params=params)
+            response = transport.get(f"{self.BASE_URL}{category}", params=params)
             response.raise_for_status()
             try:
                 response_data = response.json()
@@ -92,7 +93,7 @@ class AviationDataFetcher(AgentBase):
             }
 
         try:
-            response = requests.get(f"{self.BASE_URL}airports", params={"access_key": api_key})
+            response = transport.get(f"{self.BASE_URL}airports", params={"access_key": api_key})
 
             if response.status_code == 200:
                 return {"status": "healthy", "message": "AviationStack API is reachable."}
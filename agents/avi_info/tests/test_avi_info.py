@@ -13,7 +13,7 @@ def fetcher():
 def test_execute_success(fetcher):
     """Test successful API call with valid API key and category."""
     mock_response = {"data": "some_data"}
-    with patch("requests.get") as mock_get:
+    with patch("core.transport.get") as mock_get:
         mock_get.return_value = Mock(status_code=200)
         mock_get.return_value.json.return_value = mock_response
         result = fetcher.execute(api_key="valid_key", category="airports")
@@ -33,7 +33,7 @@ def test_execute_missing_api_key(fetcher):
 
 def test_execute_http_error(fetcher):
     """Test API call that returns an HTTP error (e.g., 404)."""
-    with patch("requests.get") as mock_get:
+    with patch("core.transport.get") as mock_get:
         mock_get.return_value = Mock(
             status_code=404,
             raise_for_status=Mock(side_effect=requests.exceptions.HTTPError("404 Client Error"))
@@ -46,7 +46,7 @@ def test_execute_http_error(fetcher):
 
 def test_execute_invalid_json(fetcher):
     """Test API call that returns invalid JSON."""
-    with patch("requests.get") as mock_get:
+    with patch("core.transport.get") as mock_get:
         mock_get.return_value = Mock(
             status_code=200,
             json=Mock(side_effect=ValueError("Invalid JSON"))
@@ -59,7 +59,7 @@ def test_execute_invalid_json(fetcher):
 
 def test_execute_request_exception(fetcher):
     """Test API call that raises a request exception (e.g., connection error)."""
-    with patch("requests.get", side_effect=requests.RequestException("Connection error")):
+    with patch("core.transport.get", side_effect=requests.RequestException("Connection error")):
         result = fetcher.execute(api_key="valid_key", category="airports")
         assert result == {
             "error": {"code": "request_exception", "message": "Connection error"}
@@ -68,7 +68,7 @@ def test_execute_request_exception(fetcher):
 
 def test_execute_invalid_api_key(fetcher):
     """Test API call with an invalid API key."""
-    with patch("requests.get") as mock_get:
+    with patch("core.transport.get") as mock_get:
         mock_get.return_value = Mock(
             status_code=401,
             json=Mock(return_value={"error": {"code": "invalid_access_key", "message": "Invalid API Key."}})
@@ -79,7 +79,7 @@ def test_execute_invalid_api_key(fetcher):
 
 def test_execute_bad_request(fetcher):
     """Test API call that results in a bad request (400 error)."""
-    with patch("requests.get") as mock_get:
+    with patch("core.transport.get") as mock_get:
         mock_get.return_value = Mock(
             status_code=400,
             json=Mock(return_value={"error": {"code": "bad_request", "message": "Bad request."}})
@@ -90,7 +90,7 @@ def test_execute_bad_request(fetcher):
 
 def test_execute_rate_limit_exceeded(fetcher):
     """Test API call that exceeds the rate limit (429 error)."""
-    with patch("requests.get") as mock_get:
+    with patch("core.transport.get") as mock_get:
         mock_get.return_value = Mock(
             status_code=429,
             json=Mock(return_value={"error": {"code": "rate_limit_exceeded", "message": "Rate limit exceeded."}})
@@ -101,7 +101,7 @@ def test_execute_rate_limit_exceeded(fetcher):
 
 def test_execute_server_error(fetcher):
     """Test API call that results in a server error (500 error)."""
-    with patch("requests.get") as mock_get:
+    with patch("core.transport.get") as mock_get:
         mock_get.return_value = Mock(
             status_code=500,
             json=Mock(return_value={"error": {"code": "server_error", "message": "Internal server error."}})
@@ -112,7 +112,7 @@ def test_execute_server_error(fetcher):
 
 def test_health_check(fetcher):
     """Test the health check method for API availability."""
-    with patch("requests.get") as mock_get:
+    with patch("core.transport.get") as mock_get:
         mock_get.return_value = Mock(status_code=200)
         result = fetcher.health_check(api_key="valid_key")
         assert result == {"status": "healthy", "message": "AviationStack API is reachable."}
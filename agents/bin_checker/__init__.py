@@ -3,6 +3,7 @@ from typing import List, Optional
 import requests
 from pydantic import BaseModel
 from core.base import AgentBase
+from core import transport
 from log import logger
 
 
@@ -52,6 +53,29 @@ class BINCheckerAgent(AgentBase):
         Raises:
             ValueError: If the BIN code is invalid or the API call fails.
         """
+        url, headers = self._prepare_request(bin_code, api_key)
+        try:
+            return self._parse_response(transport.get(url, headers=headers), bin_code)
+        except requests.RequestException as e:
+            logger.error(f"Request failed: {e}")
+            raise ValueError("Failed to connect to the BIN Checker API.") from e
+
+    async def aexecute(self, bin_code: str, api_key: str) -> dict:
+        """
+        Retrieve information for a given BIN code without blocking the event loop.
+
+        Takes the same arguments, returns the same result and raises the same
+        errors as ``execute``.
+        """
+        url, headers = self._prepare_request(bin_code, api_key)
+        try:
+            return self._parse_response(await transport.aget(url, headers=headers), bin_code)
+        except requests.RequestException as e:
+            logger.error(f"Request failed: {e}")
+            raise ValueError("Failed to connect to the BIN Checker API.") from e
+
+    def _prepare_request(self, bin_code, api_key):
+        """Validate the arguments and return the request URL and headers."""
         # Validate that the BIN code is a 6-digit number
         if not bin_code.isdigit() or len(bin_code) != 6:
             raise ValueError("BIN code must be a 6-digit number.")
@@ -59,45 +83,39 @@ class BINCheckerAgent(AgentBase):
         if not api_key:
             raise ValueError("API key cannot be empty.")
 
-        url = f"{self.API_URL}/{bin_code}"
-        headers = {"apikey": api_key}
         logger.info(f"Fetching BIN information for {bin_code}.")
-
+        return f"{self.API_URL}/{bin_code}", {"apikey": api_key}
+
+    def _parse_response(self, response, bin_code):
+        """Turn an API response into the BIN information, raising ValueError on API errors."""
+        # Handle known status codes without relying on specific fields
+        if response.status_code == 401:
+            raise ValueError("Invalid API key provided.")
+        elif response.status_code == 404:
+            logger.warning(f"BIN code {bin_code} not found.")
+            return {"status": "not_found", "message": "The BIN code does not exist in the database."}
+        elif response.status_code == 400:
+            logger.error("Bad request: Invalid parameters.")
+            raise ValueError("Bad request: Invalid or missing parameters.")
+        elif response.status_code == 429:
+            logger.error("Rate limit exceeded: Too many requests.")
+            raise ValueError("Rate limit exceeded: Try again later.")
+        elif 500 <= response.status_code < 600:
+            logger.error(f"Server error occurred: {response.status_code} - {response.text}")
+            raise ValueError(f"Unexpected server error: {response.status_code}")
+
+        # Parse the JSON response if the status code is 200
         try:
-            response = requests.get(url, headers=headers)
-
-            # Handle known status codes without relying on specific fields
-            if response.status_code == 401:
-                raise ValueError("Invalid API key provided.")
-            elif response.status_code == 404:
-                logger.warning(f"BIN code {bin_code} not found.")
-                return {"status": "not_found", "message": "The BIN code does not exist in the database."}
-            elif response.status_code == 400:
-                logger.error("Bad request: Invalid parameters.")
-                raise ValueError("Bad request: Invalid or missing parameters.")
-            elif response.status_code == 429:
-                logger.error("Rate limit exceeded: Too many requests.")
-                raise ValueError("Rate limit exceeded: Try again later.")
-            elif 500 <= response.status_code < 600:
-                logger.error(f"Server error occurred: {response.status_code} - {response.text}")
-                raise ValueError(f"Unexpected server error: {response.status_code}")
-
-            # Parse the JSON response if the status code is 200
-            try:
-                response_data = response.json()
-            except json.JSONDecodeError:
-                logger.error(f"Invalid JSON response: {response.text}")
-                raise ValueError("Invalid JSON response from the API.")
-            
-            # Handle unexpected response structure
-            if not isinstance(response_data, dict):
-                raise ValueError("Unexpected response structure.")
-
-            return response_data
+            response_data = response.json()
+        except json.JSONDecodeError:
+            logger.error(f"Invalid JSON response: {response.text}")
+            raise ValueError("Invalid JSON response from the API.")
+        
+        # Handle unexpected response structure
+        if not isinstance(response_data, dict):
+            raise ValueError("Unexpected response structure.")
 
-        except requests.RequestException as e:
-            logger.error(f"Request failed: {e}")
-            raise ValueError("Failed to connect to the BIN Checker API.") from e
+        return response_data
         
     def health_check(self, api_key: str) -> dict:
         """
@@ -114,7 +132,7 @@ class BINCheckerAgent(AgentBase):
         headers = {"apikey": api_key}
 
         try:
-            response = requests.post(url, headers=headers)
+            response = transport.post(url, headers=headers)
             response.raise_for_status()  # Raise an HTTPError for bad responses
             response_data = response.json()
 
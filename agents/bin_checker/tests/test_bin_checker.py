@@ -1,7 +1,8 @@
+import asyncio
 import json
 import re
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, AsyncMock, MagicMock
 from requests import HTTPError
 from agents.bin_checker import BINCheckerAgent
 
@@ -23,7 +24,7 @@ def bin_checker_agent():
     """Fixture to initialize the BINCheckerAgent."""
     return BINCheckerAgent()
 
-@patch("requests.get")
+@patch("core.transport.get")
 def test_execute_success(mock_get, bin_checker_agent):
     mock_get.return_value.status_code = 200
     mock_get.return_value.json = MagicMock(return_value=mock_valid_bin_check_response())
@@ -32,7 +33,16 @@ def test_execute_success(mock_get, bin_checker_agent):
     assert response["status"] == "success"
     assert response["bank_name"] == "Diners Club International"
 
-@patch("requests.get")
+@patch("core.transport.aget", new_callable=AsyncMock)
+def test_aexecute_success(mock_aget, bin_checker_agent):
+    mock_aget.return_value.status_code = 200
+    mock_aget.return_value.json = MagicMock(return_value=mock_valid_bin_check_response())
+
+    response = asyncio.run(bin_checker_agent.aexecute("302596", "valid-api-key"))
+    assert response["bank_name"] == "Diners Club International"
+    mock_aget.assert_awaited_once_with("https://api.apilayer.com/bincheck/302596", headers={"apikey": "valid-api-key"})
+
+@patch("core.transport.get")
 def test_execute_bin_not_found(mock_get, bin_checker_agent):
     # Mock the API response for BIN not found
     mock_get.return_value.status_code = 404
@@ -46,7 +56,7 @@ def test_execute_bin_not_found(mock_get, bin_checker_agent):
     assert response["status"] == "not_found"
     assert response["message"] == "The BIN code does not exist in the database."
 
-@patch("requests.get")
+@patch("core.transport.get")
 def test_execute_missing_status_key(mock_get, bin_checker_agent):
     """Test execution when the 'status' key is missing in the API response."""
     # Mock the API response with a valid status code but missing 'status' key
@@ -59,7 +69,7 @@ def test_execute_missing_status_key(mock_get, bin_checker_agent):
     result = bin_checker_agent.execute("123456", "valid_api_key")
     assert result == {}, "The response should be returned as-is when no 'status' key is present."
 
-@patch("requests.post")
+@patch("core.transport.post")
 def test_execute_invalid_bin_code(mock_post, bin_checker_agent):
     bin_code = "ABC123"
     api_key = "valid-api-key"
@@ -67,7 +77,7 @@ def test_execute_invalid_bin_code(mock_post, bin_checker_agent):
     with pytest.raises(ValueError, match="BIN code must be a 6-digit number."):
         bin_checker_agent.execute(bin_code, api_key)
 
-@patch("requests.get")
+@patch("core.transport.get")
 def test_execute_invalid_api_key(mock_get, bin_checker_agent):
     """Test execution with an invalid API key."""
     # Mock the API response for an invalid API key
@@ -80,7 +90,7 @@ def test_execute_invalid_api_key(mock_get, bin_checker_agent):
     with pytest.raises(ValueError, match=r"Invalid API key provided."):
         bin_checker_agent.execute("123456", "invalid_api_key")
 
-@patch("requests.post")
+@patch("core.transport.post")
 def test_health_check_success(mock_post, bin_checker_agent):
     # Mock the API response for health check
     mock_post.return_value.status_code = 200
@@ -89,7 +99,7 @@ def test_health_check_success(mock_post, bin_checker_agent):
     health_status = bin_checker_agent.health_check("valid-api-key")
     assert health_status["status"] == "healthy"
 
-@patch("requests.post")
+@patch("core.transport.post")
 def test_health_check_failure(mock_post, bin_checker_agent):
     # Mock the API response for health check failure
     mock_post.return_value.status_code = 500
@@ -98,7 +108,7 @@ def test_health_check_failure(mock_post, bin_checker_agent):
     with pytest.raises(ValueError):
         bin_checker_agent.health_check("invalid-api-key")
 
-@patch("requests.get")
+@patch("core.transport.get")
 def test_execute_unexpected_response(mock_get, bin_checker_agent):
     """Test execution with an unexpected response from the API."""
     # Mock the API response for an unexpected status code
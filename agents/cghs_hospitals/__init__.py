@@ -1,9 +1,20 @@
-import requests
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pydantic import BaseModel, Field, field_validator,ConfigDict
 from typing import Optional
 from core.base import AgentBase
+from core import transport
 from log import logger
 
+PAGE_LIMIT = 100     # Largest page the API serves
+PAGE_WORKERS = 4     # Pages fetched at once
+INDEX_TTL = 86400    # Seconds a fully fetched city is answered locally
+INDEX_DIRECTORY = ".plugflow_hospitals"
+
 
 class CGHSHospitalsParams(BaseModel):
     api_key: str = Field(..., alias="api-key", description="API key for data.gov.in", min_length=1)
@@ -13,6 +24,7 @@ class CGHSHospitalsParams(BaseModel):
     hospital_address: Optional[str] = Field(default=None)
     offset: int = Field(default=0, ge=0)
     limit: int = Field(default=10, ge=1, le=100)
+    all_pages: bool = Field(default=False, description="Return every matching hospital, ignoring offset and limit")
 
     model_config = ConfigDict(
         populate_by_name=True
@@ -32,6 +44,123 @@ class CGHSHospitalsParams(BaseModel):
         return v
 
 
+def _normalize(value):
+    return value.strip().casefold() if isinstance(value, str) else None
+
+
+class HospitalIndex:
+    """
+    Local copy of fully fetched hospital lists, indexed by city and hospital name.
+
+    A list is added once every page of a city, or of all cities, has been
+    fetched; lookups filtering on that city are then answered locally until
+    the list is older than ``ttl`` seconds. Each list is saved as a JSON file
+    in ``directory``, so it outlives the process. Filters match whole values,
+    ignoring case, as the API filters do.
+    """
+
+    FIELDS = {"city_name": "cityName", "hospital_name": "hospitalName", "hospital_address": "hospitalAddress"}
+
+    def __init__(self, ttl=INDEX_TTL, directory=INDEX_DIRECTORY):
+        """
+        Initialize the index.
+
+        Args:
+            ttl (float): Seconds a fetched list is used.
+            directory (str): Directory the lists are saved in, created on the
+                first write; None keeps them in memory only.
+        """
+        self.ttl = ttl
+        self.directory = directory
+        self._lists = {}
+        self._lock = threading.Lock()
+
+    def _path(self, city):
+        name = hashlib.sha256(city.encode("utf-8")).hexdigest()[:16] if city is not None else "all"
+        return os.path.join(self.directory, f"{name}.json")
+
+    def _entry(self, fetched_at, records):
+        by_field = {"city_name": {}, "hospital_name": {}}
+        for record in records:
+            for name, index in by_field.items():
+                index.setdefault(_normalize(record.get(self.FIELDS[name])), []).append(record)
+        return fetched_at, records, by_field
+
+    def add(self, city_name, records):
+        """Keep every hospital of a city, or of all cities when ``city_name`` is None."""
+        city = _normalize(city_name)
+        records = [dict(record) for record in records]
+        entry = self._entry(time.time(), records)
+        with self._lock:
+            self._lists[city] = entry
+            if self.directory is not None:
+                try:
+                    os.makedirs(self.directory, exist_ok=True)
+                    path = self._path(city)
+                    with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+                        json.dump({"city": city, "fetched_at": entry[0], "records": records}, f)
+                    os.replace(f"{path}.tmp", path)
+                except OSError as e:
+                    logger.warning(f"Could not save the hospitals of {city_name or 'all cities'}: {e}")
+
+    def _read(self, city):
+        try:
+            with open(self._path(city), encoding="utf-8") as f:
+                saved = json.load(f)
+            if saved["city"] != city:
+                return None
+            return self._entry(float(saved["fetched_at"]), saved["records"])
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring damaged hospital list {self._path(city)}: {e}")
+            return None
+
+    def _fresh(self, city):
+        entry = self._lists.get(city)
+        if entry is None and self.directory is not None:
+            entry = self._read(city)
+            if entry is not None:
+                self._lists[city] = entry
+        if entry is not None and time.time() - entry[0] >= self.ttl:
+            del self._lists[city]
+            return None
+        return entry
+
+    def lookup(self, city_name=None, hospital_name=None, hospital_address=None):
+        """
+        Return copies of the hospitals matching the filters, in API order.
+
+        Returns:
+            list | None: The hospitals, or None when the city has not been fully fetched.
+        """
+        filters = {"city_name": city_name, "hospital_name": hospital_name, "hospital_address": hospital_address}
+        filters = {name: _normalize(value) for name, value in filters.items() if value}
+        with self._lock:
+            entry = self._fresh(filters.get("city_name"))
+            if entry is None and "city_name" in filters:
+                entry = self._fresh(None)
+        if entry is None:
+            return None
+        _, records, by_field = entry
+        indexed = next((name for name in ("hospital_name", "city_name") if name in filters), None)
+        candidates = by_field[indexed].get(filters[indexed], []) if indexed else records
+        return [dict(record) for record in candidates
+                if all(_normalize(record.get(self.FIELDS[name])) == value for name, value in filters.items())]
+
+    def clear(self):
+        """Drop every list, in memory and on disk."""
+        with self._lock:
+            self._lists.clear()
+            if self.directory is not None and os.path.isdir(self.directory):
+                for filename in os.listdir(self.directory):
+                    if filename.endswith(".json"):
+                        os.remove(os.path.join(self.directory, filename))
+
+
+_index = HospitalIndex()
+
+
 class CGHSHospitalsAgent(AgentBase):
     """Agent to fetch CGHS empanelled hospitals using the data.gov.in API."""
 
@@ -41,6 +170,11 @@ class CGHSHospitalsAgent(AgentBase):
         """
         Fetch CGHS empanelled hospitals using validated input parameters.
 
+        With ``all_pages``, the first page gives the number of matching
+        hospitals and the other pages are fetched concurrently. Once every
+        hospital of a city is known, later lookups in that city are answered
+        from a local index without calling the API.
+
         Args:
             kwargs: Dictionary of request parameters matching CGHSHospitalsParams
 
@@ -49,36 +183,15 @@ class CGHSHospitalsAgent(AgentBase):
         """
         try:
             params = CGHSHospitalsParams(**kwargs)
-            query_params = {
-                "api-key": params.api_key,
-                "format": params.format,
-                "offset": params.offset,
-                "limit": params.limit
-            }
-
-            if params.city_name:
-                query_params["filters[cityName]"] = params.city_name
-            if params.hospital_name:
-                query_params["filters[hospitalName]"] = params.hospital_name
-            if params.hospital_address:
-                query_params["filters[hospitalAddress]"] = params.hospital_address
-
-            logger.info(f"Fetching CGHS hospitals with parameters: {query_params}")
-            response = requests.get(self.API_URL, params=query_params)
-
-            if response.status_code == 200:
-                data = response.json()
-                logger.info(f"Retrieved {len(data.get('records', []))} hospital(s).")
-                return {"status": "success", "data": data.get("records", [])}
-            elif response.status_code == 401:
-                logger.error("Unauthorized: Invalid API key.")
-                raise ValueError("Unauthorized: Invalid API key.")
-            elif response.status_code == 400:
-                logger.error("Bad request: Invalid parameters or URL.")
-                raise ValueError("Bad request: Invalid parameters or URL.")
+            records = self._lookup(params)
+            if records is not None:
+                if not params.all_pages:
+                    records = records[params.offset:params.offset + params.limit]
+            elif params.all_pages:
+                records = list(self._fetch_all(params))
             else:
-                logger.error(f"API returned error: {response.status_code}, {response.text}")
-                raise ValueError(f"API Error: {response.status_code} - {response.text}")
+                records = self._fetch_page(self._query(params, params.offset, params.limit)).get("records", [])
+            return {"status": "success", "data": records}
 
         except ValueError as ve:
             logger.error(f"Value error: {ve}")
@@ -87,6 +200,85 @@ class CGHSHospitalsAgent(AgentBase):
             logger.error(f"An unexpected error occurred: {e}")
             raise ValueError(f"An unexpected error occurred: {str(e)}") from e
 
+    def stream(self, **kwargs):
+        """
+        Yield every matching hospital, page by page as pages arrive.
+
+        Args:
+            kwargs: Dictionary of request parameters matching CGHSHospitalsParams;
+                ``offset`` and ``limit`` are ignored.
+
+        Yields:
+            dict: Hospital record.
+        """
+        params = CGHSHospitalsParams(**kwargs)
+        records = self._lookup(params)
+        yield from records if records is not None else self._fetch_all(params)
+
+    @staticmethod
+    def _lookup(params):
+        if params.format != "json":
+            return None
+        records = _index.lookup(params.city_name, params.hospital_name, params.hospital_address)
+        if records is not None:
+            logger.info(f"Found {len(records)} hospital(s) in the local index.")
+        return records
+
+    @staticmethod
+    def _query(params, offset, limit):
+        query_params = {
+            "api-key": params.api_key,
+            "format": params.format,
+            "offset": offset,
+            "limit": limit
+        }
+
+        if params.city_name:
+            query_params["filters[cityName]"] = params.city_name
+        if params.hospital_name:
+            query_params["filters[hospitalName]"] = params.hospital_name
+        if params.hospital_address:
+            query_params["filters[hospitalAddress]"] = params.hospital_address
+        return query_params
+
+    def _fetch_page(self, query_params):
+        logger.info(f"Fetching CGHS hospitals with parameters: {query_params}")
+        response = transport.get(self.API_URL, params=query_params)
+
+        if response.status_code == 200:
+            data = response.json()
+            logger.info(f"Retrieved {len(data.get('records', []))} hospital(s).")
+            return data
+        elif response.status_code == 401:
+            logger.error("Unauthorized: Invalid API key.")
+            raise ValueError("Unauthorized: Invalid API key.")
+        elif response.status_code == 400:
+            logger.error("Bad request: Invalid parameters or URL.")
+            raise ValueError("Bad request: Invalid parameters or URL.")
+        else:
+            logger.error(f"API returned error: {response.status_code}, {response.text}")
+            raise ValueError(f"API Error: {response.status_code} - {response.text}")
+
+    def _fetch_all(self, params):
+        """Yield every matching hospital, fetching the pages after the first with ``PAGE_WORKERS`` threads."""
+        if params.format != "json":
+            raise ValueError("Fetching all pages requires the json format.")
+        first = self._fetch_page(self._query(params, 0, PAGE_LIMIT))
+        records = list(first.get("records", []))
+        yield from records
+        total = int(first.get("total", len(records)))
+        offsets = range(PAGE_LIMIT, total, PAGE_LIMIT)
+        if offsets:
+            logger.info(f"Fetching {len(offsets)} more page(s) of {total} hospital(s).")
+            with ThreadPoolExecutor(max_workers=PAGE_WORKERS) as pool:
+                pages = pool.map(lambda offset: self._fetch_page(self._query(params, offset, PAGE_LIMIT)), offsets)
+                for page in pages:
+                    page_records = page.get("records", [])
+                    records.extend(page_records)
+                    yield from page_records
+        if not params.hospital_name and not params.hospital_address:
+            _index.add(params.city_name, records)
+
     def health_check(self):
         """
         Check if the CGHS hospitals API is reachable and functional.
@@ -98,7 +290,7 @@ class CGHSHospitalsAgent(AgentBase):
             dummy_key = "579b464db66ec23bdd0000"  # sample/test key
             logger.info("Performing health check...")
 
-            response = requests.get(
+            response = transport.get(
                 self.API_URL,
                 params={
                     "api-key": dummy_key,
@@ -1,6 +1,7 @@
 import pytest
 import requests
-from agents.cghs_hospitals import CGHSHospitalsAgent
+from core import transport
+from agents.cghs_hospitals import CGHSHospitalsAgent, HospitalIndex
 import re
 
 
@@ -9,6 +10,13 @@ def agent():
     return CGHSHospitalsAgent()
 
 
+@pytest.fixture(autouse=True)
+def hospital_index(monkeypatch, tmp_path):
+    index = HospitalIndex(directory=str(tmp_path))
+    monkeypatch.setattr("agents.cghs_hospitals._index", index)
+    return index
+
+
 def test_execute_success(monkeypatch, agent):
     def mock_get(url, params=None, **kwargs):
         class MockResponse:
@@ -25,7 +33,7 @@ def test_execute_success(monkeypatch, agent):
                 }
         return MockResponse()
 
-    monkeypatch.setattr(requests, "get", mock_get)
+    monkeypatch.setattr(transport, "get", mock_get)
 
     response = agent.execute(api_key="test_api_key", city_name="Delhi")
     assert response["status"] == "success"
@@ -46,7 +54,7 @@ def test_execute_invalid_api_key(monkeypatch, agent):
             text = "Unauthorized"
         return MockResponse()
 
-    monkeypatch.setattr(requests, "get", mock_get)
+    monkeypatch.setattr(transport, "get", mock_get)
 
     with pytest.raises(ValueError, match="Invalid API key"):
         agent.execute(api_key="invalid_key")
@@ -58,7 +66,7 @@ def test_execute_bad_request(monkeypatch, agent):
             text = "Bad Request"
         return MockResponse()
 
-    monkeypatch.setattr(requests, "get", mock_get)
+    monkeypatch.setattr(transport, "get", mock_get)
 
     with pytest.raises(ValueError, match=r"Bad request: Invalid parameters or URL\."):
         agent.execute(api_key="test_api_key", city_name="InvalidCity")
@@ -71,7 +79,7 @@ def test_execute_unexpected_error(monkeypatch, agent):
             text = "Internal Server Error"
         return MockResponse()
 
-    monkeypatch.setattr(requests, "get", mock_get)
+    monkeypatch.setattr(transport, "get", mock_get)
 
     with pytest.raises(ValueError) as exc_info:
         agent.execute(api_key="test_api_key")
@@ -88,7 +96,7 @@ def test_health_check_success(monkeypatch, agent):
             status_code = 200
         return MockResponse()
 
-    monkeypatch.setattr(requests, "get", mock_get)
+    monkeypatch.setattr(transport, "get", mock_get)
 
     health = agent.health_check()
     assert health["status"] == "healthy"
@@ -101,7 +109,7 @@ def test_health_check_unauthorized(monkeypatch, agent):
             status_code = 401
         return MockResponse()
 
-    monkeypatch.setattr(requests, "get", mock_get)
+    monkeypatch.setattr(transport, "get", mock_get)
 
     result = agent.health_check()
     assert result["status"] == "healthy"
@@ -114,7 +122,7 @@ def test_health_check_unexpected_status(monkeypatch, agent):
             status_code = 503
         return MockResponse()
 
-    monkeypatch.setattr(requests, "get", mock_get)
+    monkeypatch.setattr(transport, "get", mock_get)
 
     health = agent.health_check()
     assert health["status"] == "unhealthy"
@@ -125,8 +133,50 @@ def test_health_check_failure(monkeypatch, agent):
     def mock_get(url, params=None, **kwargs):
         raise Exception("Network failure")
 
-    monkeypatch.setattr(requests, "get", mock_get)
+    monkeypatch.setattr(transport, "get", mock_get)
 
     health = agent.health_check()
     assert health["status"] == "unhealthy"
     assert "Network failure" in health["message"]
+
+
+def test_execute_all_pages_fans_out_and_indexes(monkeypatch, agent):
+    hospitals = [{"hospitalName": f"Hospital {i}", "cityName": "Delhi", "hospitalAddress": f"{i} Ring Road"}
+                 for i in range(250)]
+    offsets = []
+
+    def mock_get(url, params=None, **kwargs):
+        offsets.append(params["offset"])
+        assert params["filters[cityName]"] == "Delhi"
+        class MockResponse:
+            status_code = 200
+            def json(self):
+                page = hospitals[params["offset"]:params["offset"] + params["limit"]]
+                return {"total": len(hospitals), "count": len(page), "records": page}
+        return MockResponse()
+
+    monkeypatch.setattr(transport, "get", mock_get)
+
+    response = agent.execute(api_key="test_api_key", city_name="Delhi", all_pages=True)
+    assert response["data"] == hospitals
+    assert sorted(offsets) == [0, 100, 200]
+
+    # Repeat lookups in the city are answered from the local index.
+    assert list(agent.stream(api_key="test_api_key", city_name="delhi")) == hospitals
+    assert agent.execute(api_key="test_api_key", city_name="Delhi", offset=5, limit=2)["data"] == hospitals[5:7]
+    found = agent.execute(api_key="test_api_key", city_name="Delhi", hospital_name="hospital 42")
+    assert found["data"] == [hospitals[42]]
+    assert len(offsets) == 3
+
+
+def test_index_is_saved_to_disk_and_returns_copies(tmp_path):
+    hospitals = [{"hospitalName": "AIIMS", "cityName": "Delhi"}, {"hospitalName": "Safdarjung", "cityName": "Delhi"}]
+    HospitalIndex(directory=str(tmp_path)).add("Delhi", hospitals)
+
+    reloaded = HospitalIndex(directory=str(tmp_path))
+    found = reloaded.lookup("delhi", "aiims")
+    assert found == [hospitals[0]]
+    found[0]["hospitalName"] = "changed"
+    assert reloaded.lookup("Delhi", "AIIMS") == [hospitals[0]]
+    assert HospitalIndex(ttl=0, directory=str(tmp_path)).lookup("Delhi") is None
+    assert HospitalIndex(directory=None).lookup("Delhi") is None
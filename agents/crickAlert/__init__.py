@@ -1,7 +1,7 @@
-import http.client
 import json
-from typing import Dict, Any, Optional, List, Union
+from typing import Dict, Any, Iterator, Optional, List, Union
 from core.base import AgentBase
+from core import transport
 from log import logger
 
 class CrickAlertAgent(AgentBase):
@@ -18,6 +18,64 @@ class CrickAlertAgent(AgentBase):
         self.rapid_api_host = "cricbuzz-cricket.p.rapidapi.com"
         self.base_url = "cricbuzz-cricket.p.rapidapi.com"
 
+    def _fetch_matches(self, **kwargs: Any) -> Iterator[Dict[str, Any]]:
+        """
+        Fetch matches from the API and yield those matching the search term.
+
+        Raises:
+            ValueError: If the API key is missing or the request fails.
+            json.JSONDecodeError: If the response is not valid JSON.
+        """
+        self.rapid_api_key = kwargs.get("api_key", self.rapid_api_key)
+        if not self.rapid_api_key:
+            raise ValueError("API key must be provided")
+
+        search_term = kwargs.get("search_term", "").strip().lower()
+        endpoint = kwargs.get("endpoint", "matches/v1/recent")
+
+        headers = {
+            'x-rapidapi-key': self.rapid_api_key,
+            'x-rapidapi-host': self.rapid_api_host
+        }
+
+        logger.info(f"Fetching cricket matches from endpoint: {endpoint}")
+        if search_term:
+            logger.info(f"Searching for matches containing: {search_term}")
+
+        conn = transport.PooledConnection(self.base_url)
+        try:
+            conn.request("GET", f"/{endpoint}", headers=headers)
+            response = conn.getresponse()
+            data = response.read().decode('utf-8')
+        finally:
+            conn.close()
+
+        if response.status != 200:
+            raise ValueError(f"API request failed with status {response.status}: {data}")
+
+        result = json.loads(data)
+        for type_match in result.get("typeMatches", []):
+            for series_match in type_match.get("seriesMatches", []):
+                for match in series_match.get("seriesAdWrapper", {}).get("matches", []):
+                    if not search_term or self._matches_term(match, search_term):
+                        yield match
+
+    @staticmethod
+    def _matches_term(match: Dict[str, Any], search_term: str) -> bool:
+        """Tell whether the series, teams, venue, format or description of a match contain the search term."""
+        match_info = match.get("matchInfo", {})
+        venue_info = match_info.get("venueInfo", {})
+        fields = (
+            match_info.get("seriesName", ""),
+            match_info.get("team1", {}).get("teamName", ""),
+            match_info.get("team2", {}).get("teamName", ""),
+            venue_info.get("ground", ""),
+            venue_info.get("city", ""),
+            match_info.get("matchFormat", ""),
+            match_info.get("matchDesc", ""),
+        )
+        return any(search_term in field.lower() for field in fields)
+
     def execute(self, **kwargs: Any) -> Union[str, Dict[str, str]]:
         """
         Fetch cricket matches based on the specified endpoint and search term.
@@ -31,80 +89,9 @@ class CrickAlertAgent(AgentBase):
         Returns:
             Union[str, Dict[str, str]]: Match data or error information
         """
-        conn = None
         try:
-            self.rapid_api_key = kwargs.get("api_key", self.rapid_api_key)
-            if not self.rapid_api_key:
-                raise ValueError("API key must be provided")
-
+            filtered_matches = list(self._fetch_matches(**kwargs))
             search_term = kwargs.get("search_term", "").strip().lower()
-            endpoint = kwargs.get("endpoint", "matches/v1/recent")
-
-            headers = {
-                'x-rapidapi-key': self.rapid_api_key,
-                'x-rapidapi-host': self.rapid_api_host
-            }
-
-            logger.info(f"Fetching cricket matches from endpoint: {endpoint}")
-            if search_term:
-                logger.info(f"Searching for matches containing: {search_term}")
-
-            conn = http.client.HTTPSConnection(self.base_url)
-            conn.request("GET", f"/{endpoint}", headers=headers)
-            
-            response = conn.getresponse()
-            data = response.read().decode('utf-8')
-            
-            if response.status != 200:
-                raise ValueError(f"API request failed with status {response.status}: {data}")
-
-            result = json.loads(data)
-            all_matches = []
-            
-            # Process matches
-            for type_match in result.get("typeMatches", []):
-                for series_match in type_match.get("seriesMatches", []):
-                    matches = series_match.get("seriesAdWrapper", {}).get("matches", [])
-                    if matches:
-                        all_matches.extend(matches)
-            
-            # Filter matches based on search term
-            filtered_matches = []
-            if all_matches:
-                for match in all_matches:
-                    if not search_term:
-                        filtered_matches.append(match)
-                        continue
-                        
-                    match_info = match.get("matchInfo", {})
-                    
-                    # Check series name
-                    series_name = match_info.get("seriesName", "").lower()
-                    if search_term in series_name:
-                        filtered_matches.append(match)
-                        continue
-                        
-                    # Check team names
-                    team1_name = match_info.get("team1", {}).get("teamName", "").lower()
-                    team2_name = match_info.get("team2", {}).get("teamName", "").lower()
-                    if search_term in team1_name or search_term in team2_name:
-                        filtered_matches.append(match)
-                        continue
-                        
-                    # Check venue information
-                    venue_info = match_info.get("venueInfo", {})
-                    ground = venue_info.get("ground", "").lower()
-                    city = venue_info.get("city", "").lower()
-                    if search_term in ground or search_term in city:
-                        filtered_matches.append(match)
-                        continue
-                        
-                    # Check match format and description
-                    match_format = match_info.get("matchFormat", "").lower()
-                    match_desc = match_info.get("matchDesc", "").lower()
-                    if search_term in match_format or search_term in match_desc:
-                        filtered_matches.append(match)
-            
             return {
                 "status": "success",
                 "matches": filtered_matches,
@@ -118,9 +105,24 @@ class CrickAlertAgent(AgentBase):
         except Exception as e:
             logger.error(f"Error fetching cricket matches: {e}")
             return {"error": str(e), "status": "failed"}
-        finally:
-            if conn:
-                conn.close()
+
+    def stream(self, **kwargs: Any) -> Iterator[Dict[str, Any]]:
+        """
+        Yield the matches of ``execute`` one at a time.
+
+        Args:
+            **kwargs: Same keyword arguments as ``execute``.
+
+        Yields:
+            Dict[str, Any]: A match matching the search term.
+
+        Raises:
+            ValueError: If the API key is missing, the request fails or the response is not valid JSON.
+        """
+        try:
+            yield from self._fetch_matches(**kwargs)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON response: {str(e)}") from e
 
     def health_check(self) -> Dict[str, str]:
         """
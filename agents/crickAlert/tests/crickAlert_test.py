@@ -86,7 +86,7 @@ def test_execute_success(cricket_agent, mock_cricket_data):
     mock_response = MockResponse(200, mock_cricket_data)
     mock_conn = MockConnection(mock_response)
     
-    with patch('http.client.HTTPSConnection', return_value=mock_conn):
+    with patch('core.transport.PooledConnection', return_value=mock_conn):
         result = cricket_agent.execute(api_key="test_api_key")
     
     assert result["status"] == "success"
@@ -100,7 +100,7 @@ def test_execute_with_search_term(cricket_agent, mock_cricket_data):
     mock_response = MockResponse(200, mock_cricket_data)
     mock_conn = MockConnection(mock_response)
     
-    with patch('http.client.HTTPSConnection', return_value=mock_conn):
+    with patch('core.transport.PooledConnection', return_value=mock_conn):
         result = cricket_agent.execute(
             api_key="test_api_key",
             search_term="mumbai"
@@ -116,7 +116,7 @@ def test_execute_no_matches_found(cricket_agent):
     mock_response = MockResponse(200, mock_data)
     mock_conn = MockConnection(mock_response)
     
-    with patch('http.client.HTTPSConnection', return_value=mock_conn):
+    with patch('core.transport.PooledConnection', return_value=mock_conn):
         result = cricket_agent.execute(api_key="test_api_key")
     
     assert result["status"] == "success"
@@ -136,7 +136,7 @@ def test_execute_api_error(cricket_agent):
     mock_response = MockResponse(400, {"error": "Bad Request"})
     mock_conn = MockConnection(mock_response)
     
-    with patch('http.client.HTTPSConnection', return_value=mock_conn):
+    with patch('core.transport.PooledConnection', return_value=mock_conn):
         result = cricket_agent.execute(api_key="test_api_key")
     
     assert isinstance(result, dict)
@@ -157,7 +157,7 @@ def test_search_term_matching(cricket_agent, mock_cricket_data):
         ("test", 0),  # No matches
     ]
     
-    with patch('http.client.HTTPSConnection', return_value=mock_conn):
+    with patch('core.transport.PooledConnection', return_value=mock_conn):
         for search_term, expected_count in test_cases:
             result = cricket_agent.execute(
                 api_key="test_api_key",
@@ -170,7 +170,7 @@ def test_health_check_success(cricket_agent, mock_cricket_data):
     mock_response = MockResponse(200, mock_cricket_data)
     mock_conn = MockConnection(mock_response)
     
-    with patch('http.client.HTTPSConnection', return_value=mock_conn):
+    with patch('core.transport.PooledConnection', return_value=mock_conn):
         result = cricket_agent.health_check()
     
     assert result["status"] == "healthy"
@@ -189,7 +189,7 @@ def test_health_check_failure(cricket_agent):
     mock_response = MockResponse(500, {"error": "Internal Server Error"})
     mock_conn = MockConnection(mock_response)
     
-    with patch('http.client.HTTPSConnection', return_value=mock_conn):
+    with patch('core.transport.PooledConnection', return_value=mock_conn):
         result = cricket_agent.health_check()
     
     assert result["status"] == "unhealthy"
@@ -1,10 +1,19 @@
+import contextvars
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from pydantic import BaseModel, Field, ValidationError, field_validator
-from typing import Dict
+from typing import Dict, List, Optional, Sequence, Union
 from core.base import AgentBase
+from core import transport
+from core.crossrates import KeyedCrossRates
 from log import logger
 import re
 
+RATE_WORKERS = 8      # Currencies looked up at once
+
+# Rates against USD shared by every instance using the same API key; each currency costs one lookup.
+_cross_rates = KeyedCrossRates()
+
 class CurrencyExchangeRequestModel(BaseModel):
     """
     Pydantic model for validating currency exchange request parameters.
@@ -26,22 +35,36 @@ class CurrencyExchangeAgent(AgentBase):
     """
     BASE_URL = "https://www.alphavantage.co/query"
 
-    def execute(self, apikey: str, from_currency: str, to_currency: str) -> Dict:
+    def execute(self, apikey: str, from_currency: Optional[str] = None, to_currency: Optional[str] = None,
+                amounts: Optional[List[float]] = None, currencies: Optional[List[str]] = None) -> Dict:
         """
         Fetch the real-time exchange rate for a currency pair.
+
+        With ``amounts`` or ``currencies``, rates are derived from cached rates
+        against USD instead, see ``convert`` and ``cross_rates``.
         
         Args:
             apikey (str): API key for authentication.
             from_currency (str): The currency to convert from (e.g., USD, BTC).
             to_currency (str): The currency to convert to (e.g., USD, EUR).
+            amounts (Optional[List[float]]): Amounts to convert from ``from_currency`` to ``to_currency``.
+            currencies (Optional[List[str]]): Currencies to return the cross-rate matrix of.
 
         Returns:
-            Dict: JSON response containing exchange rate details.
+            Dict: JSON response containing exchange rate details; with ``amounts``
+            the list of converted amounts, with ``currencies`` the matrix.
 
         Raises:
             ValueError: If the request fails, or the response contains errors.
             ValidationError: If input parameters fail validation.
         """
+        if amounts is not None:
+            if from_currency is None or to_currency is None:
+                raise ValueError("from_currency and to_currency are required to convert amounts")
+            return self.convert(apikey, amounts, from_currency, to_currency)
+        if currencies is not None:
+            return self.cross_rates(apikey, currencies)
+
         # Input Validation
         try:
             request_model = CurrencyExchangeRequestModel(
@@ -65,7 +88,7 @@ class CurrencyExchangeAgent(AgentBase):
 
         # Make API Request
         try:
-            response = requests.get(self.BASE_URL, params=params)
+            response = transport.get(self.BASE_URL, params=params)
             response.raise_for_status()
             logger.debug(f"API response status code: {response.status_code}")
         except requests.RequestException as e:
@@ -81,6 +104,66 @@ class CurrencyExchangeAgent(AgentBase):
         logger.info("Successfully fetched currency exchange rate.")
         return json_response
 
+    def _fetch_rates(self, apikey: str):
+        """
+        Return a ``CrossRates`` fetch function looking up the rate of each currency against the pivot.
+
+        Currencies are looked up with up to ``RATE_WORKERS`` threads, each in a copy
+        of the caller's context so the current agent and deadline still apply.
+        """
+        def quote(base, currency):
+            rate = self.execute(apikey, base, currency)["Realtime Currency Exchange Rate"]
+            try:
+                return float(rate["5. Exchange Rate"])
+            except (KeyError, TypeError, ValueError) as e:
+                logger.error(f"Unexpected API response for {base} to {currency}: {e}")
+                raise ValueError(f"Unexpected API response: no exchange rate for {base} to {currency}") from e
+
+        def fetch(base, currencies):
+            with ThreadPoolExecutor(max_workers=min(RATE_WORKERS, len(currencies))) as pool:
+                futures = [pool.submit(contextvars.copy_context().run, quote, base, currency)
+                           for currency in currencies]
+                return {currency: future.result() for currency, future in zip(currencies, futures)}
+        return fetch
+
+    def convert(self, apikey: str, amounts: Sequence[float], from_currency: Union[str, Sequence[str]],
+                to_currency: Union[str, Sequence[str]]) -> List[float]:
+        """
+        Convert many amounts with cross rates derived from cached rates against USD.
+
+        Args:
+            apikey (str): API key for authentication.
+            amounts (Sequence[float]): Amounts to convert.
+            from_currency (Union[str, Sequence[str]]): Currency of all amounts, or of each one.
+            to_currency (Union[str, Sequence[str]]): Currency to convert all amounts to, or each one.
+
+        Returns:
+            List[float]: The converted amounts.
+
+        Raises:
+            ValueError: If a currency is invalid or its rate cannot be fetched.
+        """
+        engine = _cross_rates.for_key(apikey)
+        converted = engine.convert(amounts, from_currency, to_currency, self._fetch_rates(apikey))
+        logger.info(f"Converted {len(converted)} amounts.")
+        return converted.tolist()
+
+    def cross_rates(self, apikey: str, currencies: Sequence[str]) -> Dict[str, Dict[str, float]]:
+        """
+        Return the exchange rate between every pair of currencies, with one lookup per currency.
+
+        Args:
+            apikey (str): API key for authentication.
+            currencies (Sequence[str]): Currency codes (e.g., USD, EUR, BTC).
+
+        Returns:
+            Dict[str, Dict[str, float]]: ``{from_currency: {to_currency: rate}}``.
+
+        Raises:
+            ValueError: If a currency is invalid or its rate cannot be fetched.
+        """
+        return _cross_rates.for_key(apikey).matrix(currencies, self._fetch_rates(apikey))
+
     def health_check(self, apikey: str) -> Dict:
         """
         Perform a health check to verify if the Alpha Vantage API is operational.
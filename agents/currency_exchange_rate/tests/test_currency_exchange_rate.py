@@ -24,7 +24,7 @@ def test_valid_currency_exchange():
         }
     }
     
-    with patch("requests.get") as mock_get:
+    with patch("core.transport.get") as mock_get:
         mock_get.return_value.status_code = 200
         mock_get.return_value.json.return_value = mock_response
         response = fetcher.execute(apikey="<KEY>", from_currency="BTC", to_currency="EUR")
@@ -70,7 +70,7 @@ def test_api_network_error():
     Test fetcher handling of network errors.
     """
     fetcher = CurrencyExchangeAgent()
-    with patch("requests.get") as mock_get:
+    with patch("core.transport.get") as mock_get:
         mock_get.side_effect = RequestException("Network error")
         
         with pytest.raises(ValueError, match="Network or API error"):
@@ -83,7 +83,7 @@ def test_api_response_missing_key():
     fetcher = CurrencyExchangeAgent()
     incomplete_response = {"Error Message": "Invalid API call."}
 
-    with patch("requests.get") as mock_get:
+    with patch("core.transport.get") as mock_get:
         mock_get.return_value.status_code = 200
         mock_get.return_value.json.return_value = incomplete_response
         
@@ -102,7 +102,7 @@ def test_health_check_success():
         }
     }
 
-    with patch("requests.get") as mock_get:
+    with patch("core.transport.get") as mock_get:
         mock_get.return_value.status_code = 200
         mock_get.return_value.json.return_value = mock_response
         
@@ -116,7 +116,7 @@ def test_health_check_failure():
     """
     fetcher = CurrencyExchangeAgent()
 
-    with patch("requests.get") as mock_get:
+    with patch("core.transport.get") as mock_get:
         mock_get.side_effect = RequestException("API failure")
         
         result = fetcher.health_check(apikey="demo")
@@ -137,7 +137,7 @@ def test_api_invalid_status_code():
     Test fetcher behavior when API returns a non-200 status code.
     """
     fetcher = CurrencyExchangeAgent()
-    with patch("requests.get") as mock_get:
+    with patch("core.transport.get") as mock_get:
         mock_get.side_effect = requests.RequestException("500 Internal Server Error")
 
         with pytest.raises(ValueError, match=r"Network or API error.*500.*"):
@@ -155,7 +155,7 @@ def test_partial_api_response():
         }
     }
 
-    with patch("requests.get") as mock_get:
+    with patch("core.transport.get") as mock_get:
         mock_get.return_value.status_code = 200
         mock_get.return_value.json.return_value = partial_response
 
@@ -163,3 +163,76 @@ def test_partial_api_response():
         assert "Realtime Currency Exchange Rate" in response
         assert response["Realtime Currency Exchange Rate"].get("3. To_Currency Code") is None
 
+
+
+def test_convert_looks_up_each_currency_once(monkeypatch):
+    """
+    Test that cross rates cost one lookup per currency rather than one per pair.
+    """
+    from core.crossrates import KeyedCrossRates
+    monkeypatch.setattr("agents.currency_exchange_rate._cross_rates", KeyedCrossRates())
+    rates = {"EUR": "0.5", "GBP": "0.25", "BTC": "0.00001"}
+    looked_up = []
+
+    def mock_get(url, params):
+        looked_up.append(params["to_currency"])
+        response = requests.Response()
+        response.status_code = 200
+        response._content = ('{"Realtime Currency Exchange Rate": {"5. Exchange Rate": "%s"}}'
+                             % rates[params["to_currency"]]).encode()
+        return response
+
+    monkeypatch.setattr("core.transport.get", mock_get)
+    fetcher = CurrencyExchangeAgent()
+    matrix = fetcher.execute(apikey="<KEY>", currencies=["EUR", "GBP", "BTC"])
+    assert matrix["EUR"]["GBP"] == 0.5
+    assert matrix["BTC"]["EUR"] == pytest.approx(50000.0)
+    assert fetcher.convert("<KEY>", [10, 20], "GBP", "EUR") == [20.0, 40.0]
+    assert sorted(looked_up) == ["BTC", "EUR", "GBP"]
+
+
+def test_cross_rates_reject_responses_without_a_rate(monkeypatch):
+    """
+    Test that a quote missing its rate, or a conversion missing its currencies, raises ValueError.
+    """
+    from core.crossrates import KeyedCrossRates
+    monkeypatch.setattr("agents.currency_exchange_rate._cross_rates", KeyedCrossRates())
+    fetcher = CurrencyExchangeAgent()
+    with patch("core.transport.get") as mock_get:
+        mock_get.return_value.status_code = 200
+        mock_get.return_value.json.return_value = {"Realtime Currency Exchange Rate": {"1. From_Currency Code": "USD"}}
+        with pytest.raises(ValueError, match="no exchange rate for USD to EUR"):
+            fetcher.execute(apikey="<KEY>", currencies=["EUR"])
+    with pytest.raises(ValueError, match="from_currency and to_currency are required"):
+        fetcher.execute(apikey="<KEY>", from_currency="USD", amounts=[1])
+
+
+def test_missing_rates_are_looked_up_concurrently(monkeypatch):
+    """
+    Test that a cold cross-rate matrix looks its currencies up in parallel rather than one after another.
+    """
+    import threading
+    import time
+    from core.crossrates import KeyedCrossRates
+    monkeypatch.setattr("agents.currency_exchange_rate._cross_rates", KeyedCrossRates())
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def mock_get(url, params):
+        with lock:
+            active.append(1)
+            peak.append(len(active))
+        time.sleep(0.05)
+        with lock:
+            active.pop()
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b'{"Realtime Currency Exchange Rate": {"5. Exchange Rate": "2"}}'
+        return response
+
+    monkeypatch.setattr("core.transport.get", mock_get)
+    currencies = ["EUR", "GBP", "JPY", "INR", "CHF", "CAD"]
+    matrix = CurrencyExchangeAgent().execute(apikey="<KEY>", currencies=currencies)
+    assert matrix["EUR"]["GBP"] == 1.0
+    assert len(peak) == len(currencies) and max(peak) > 1
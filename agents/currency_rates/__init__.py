@@ -1,9 +1,14 @@
 import json
 from itertools import islice
 from core.base import AgentBase
+from core import transport
+from core.crossrates import KeyedCrossRates
 from log import logger
 import requests
 
+# Rates against USD shared by every instance using the same API key; one table download serves all pairs.
+_cross_rates = KeyedCrossRates()
+
 class CurrencyRatesAgent(AgentBase):
     """Agent to fetch Currency exchange rates."""
     valid_currency_codes = [
@@ -26,42 +31,120 @@ class CurrencyRatesAgent(AgentBase):
     "ZWL"
     ]
 
-    def execute(self, api_key, base_currency, target_currency):
+    def execute(self, api_key, base_currency=None, target_currency=None, amounts=None, currencies=None):
         """
         Fetch the conversion rate for two currencies.
 
+        Every rate is derived from a cached table of rates against USD, so
+        any number of pairs costs one download per API key. With ``amounts``
+        or ``currencies``, see ``convert`` and ``cross_rates``.
+
         Args:
             api_key (str): The API key used to authenticate and access the API.
             base_currency (str): The ISO 4217 three-letter currency code representing the currency to convert from.  
             target_currency (str): The ISO 4217 three-letter currency code representing the currency to convert to.
+            amounts (list, optional): Amounts to convert from ``base_currency`` to ``target_currency``.
+            currencies (list, optional): Currencies to return the cross-rate matrix of.
 
         Returns:
-            str: JSON-formatted string containing fetched currency rates.
+            str: JSON-formatted string containing fetched currency rates; with
+            ``amounts`` the converted amounts, with ``currencies`` the matrix.
 
         Raises:
-            ValueError: If the base_currency code or target_currency code is not valid
+            ValueError: If the base_currency code or target_currency code is not valid, or
+                missing when converting ``amounts``.
 
         """
+        if amounts is not None:
+            if base_currency is None or target_currency is None:
+                raise ValueError("base_currency and target_currency are required to convert amounts")
+            return self.convert(api_key, amounts, base_currency, target_currency)
+        if currencies is not None:
+            return self.cross_rates(api_key, currencies)
 
         if (base_currency not in self.valid_currency_codes) or (target_currency not in self.valid_currency_codes):
             raise ValueError(f"Invalid currency code. Valid currency codes are :{', '.join(self.valid_currency_codes)}")
         
         try:
             logger.info(f"Fetching currency conversion rate from {base_currency} to {target_currency}")
-            url = f"https://v6.exchangerate-api.com/v6/{api_key}/pair/{base_currency}/{target_currency}"
-            response = requests.get(url)
-            response.raise_for_status()
-            
-            rate = response.json()
-            rate_readable = json.dumps(rate, indent = 4)
+            rate = _cross_rates.for_key(api_key).rate(base_currency, target_currency, self._fetch_table(api_key))
+            result = {
+                "result": "success",
+                "base_code": base_currency,
+                "target_code": target_currency,
+                "conversion_rate": rate
+            }
+            rate_readable = json.dumps(result, indent = 4)
             #Log the JSON-formatted rate
-            print(rate_readable)
+            logger.info(f"Fetched currency rate: {rate_readable}")
             return rate_readable
         except Exception as e:
             logger.error(f"An error occurred: {e}")
             raise ValueError("Failed to fetch currency rates. ") from e
 
 
+    def _validate(self, codes):
+        """Raise a ValueError unless every code is a supported currency."""
+        invalid = sorted({code for code in codes if code not in self.valid_currency_codes})
+        if invalid:
+            raise ValueError(f"Invalid currency code: {', '.join(map(str, invalid))}")
+
+    def _fetch_table(self, api_key):
+        """Return a ``CrossRates`` fetch function downloading the rate table of a base currency."""
+        def fetch(base, currencies):
+            url = f"https://v6.exchangerate-api.com/v6/{api_key}/latest/{base}"
+            try:
+                response = transport.get(url)
+                response.raise_for_status()
+            except requests.RequestException as e:
+                logger.error(f"An error occurred: {e}")
+                raise ValueError("Failed to fetch currency rates. ") from e
+            data = response.json()
+            if data.get("result") != "success":
+                raise ValueError(f"Failed to fetch currency rates: {data.get('error-type', 'unexpected response')}")
+            return data["conversion_rates"]
+        return fetch
+
+    def convert(self, api_key, amounts, from_currency, to_currency):
+        """
+        Convert many amounts with rates derived from one cached rate table.
+
+        Args:
+            api_key (str): The API key used to authenticate and access the API.
+            amounts (list): Amounts to convert.
+            from_currency (str | list): Currency of all amounts, or of each one.
+            to_currency (str | list): Currency to convert all amounts to, or each one.
+
+        Returns:
+            list: The converted amounts.
+
+        Raises:
+            ValueError: If a currency code is not valid or the rates cannot be fetched.
+        """
+        for codes in (from_currency, to_currency):
+            self._validate([codes] if isinstance(codes, str) else codes)
+        engine = _cross_rates.for_key(api_key)
+        converted = engine.convert(amounts, from_currency, to_currency, self._fetch_table(api_key))
+        logger.info(f"Converted {len(converted)} amounts.")
+        return converted.tolist()
+
+    def cross_rates(self, api_key, currencies):
+        """
+        Return the exchange rate between every pair of currencies, from one cached rate table.
+
+        Args:
+            api_key (str): The API key used to authenticate and access the API.
+            currencies (list): ISO 4217 currency codes.
+
+        Returns:
+            dict: ``{from_currency: {to_currency: rate}}``.
+
+        Raises:
+            ValueError: If a currency code is not valid or the rates cannot be fetched.
+        """
+        self._validate(currencies)
+        return _cross_rates.for_key(api_key).matrix(currencies, self._fetch_table(api_key))
+
     def health_check(self, api_key):
         """
         Check if the currency rate API is functional.
@@ -84,7 +167,7 @@ class CurrencyRatesAgent(AgentBase):
             url = f"https://v6.exchangerate-api.com/v6/{api_key}/pair/{base_currency}/{target_currency}"
 
            
-            response = requests.get(url, timeout=5)
+            response = transport.get(url, timeout=5)
             response.raise_for_status()  
 
             # Check the response content
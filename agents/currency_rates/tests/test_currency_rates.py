@@ -3,6 +3,14 @@ import requests
 from unittest.mock import patch, Mock
 from agents.currency_rates import CurrencyRatesAgent
 
+@pytest.fixture(autouse=True)
+def cross_rates(monkeypatch):
+    """
+    Fixture giving every test empty rate caches.
+    """
+    from core.crossrates import KeyedCrossRates
+    monkeypatch.setattr("agents.currency_rates._cross_rates", KeyedCrossRates())
+
 @pytest.fixture
 def currency_rates_agent():
     """
@@ -10,7 +18,7 @@ def currency_rates_agent():
     """
     return CurrencyRatesAgent()
 
-@patch("agents.currency_rates.requests.get")
+@patch("agents.currency_rates.transport.get")
 def test_execute_success(mock_get, currency_rates_agent):
     """
     Test successful execution of the CurrencyRatesAgent.
@@ -23,8 +31,7 @@ def test_execute_success(mock_get, currency_rates_agent):
     mock_response = {
         "result": "success",
         "base_code": "USD",
-        "target_code": "GBP",
-        "conversion_rate": 0.75
+        "conversion_rates": {"USD": 1, "GBP": 0.75, "EUR": 0.9}
     }
     mock_get.return_value.json.return_value = mock_response
     mock_get.return_value.status_code = 200
@@ -34,6 +41,11 @@ def test_execute_success(mock_get, currency_rates_agent):
     assert "\"GBP\"" in result
     assert "\"conversion_rate\": 0.75" in result
 
+    # Other pairs are derived from the same table.
+    assert "\"conversion_rate\": 1.2" in currency_rates_agent.execute(api_key, "GBP", "EUR")
+    assert mock_get.call_count == 1
+    assert mock_get.call_args[0][0].endswith("/latest/USD")
+
 def test_execute_failure(currency_rates_agent):
     """
     Test execution failure due to invalid inputs.
@@ -59,7 +71,7 @@ def test_health_check_success(currency_rates_agent):
         "conversion_rate": 0.75
     }
 
-    with patch("agents.currency_rates.requests.get") as mock_get:
+    with patch("agents.currency_rates.transport.get") as mock_get:
         mock_get.return_value = Mock(status_code=200, json=lambda: mock_response)
 
         health = currency_rates_agent.health_check(api_key)
@@ -72,9 +84,48 @@ def test_health_check_failure(currency_rates_agent):
     """
     api_key = '<KEY>'
 
-    with patch("agents.currency_rates.requests.get") as mock_get:
+    with patch("agents.currency_rates.transport.get") as mock_get:
         mock_get.side_effect = Exception("Mocked service failure")
 
         health = currency_rates_agent.health_check(api_key)
         assert health["status"] == "unhealthy"
         assert "Mocked service failure" in health["message"]
+
+@patch("agents.currency_rates.transport.get")
+def test_convert_uses_one_rate_table(mock_get, currency_rates_agent, monkeypatch):
+    """
+    Test that bulk conversions and cross rates share one downloaded rate table.
+    """
+    mock_get.return_value.json.return_value = {
+        "result": "success",
+        "base_code": "USD",
+        "conversion_rates": {"USD": 1, "GBP": 0.75, "EUR": 0.9, "INR": 90}
+    }
+
+    converted = currency_rates_agent.execute('<KEY>', "GBP", ["EUR", "INR"], amounts=[3, 1.5])
+    assert converted == pytest.approx([3.6, 180.0])
+    matrix = currency_rates_agent.execute('<KEY>', currencies=["EUR", "INR"])
+    assert matrix["EUR"]["INR"] == pytest.approx(100.0)
+    assert mock_get.call_count == 1
+    assert mock_get.call_args[0][0].endswith("/latest/USD")
+
+    with pytest.raises(ValueError, match="Invalid currency code: XXX"):
+        currency_rates_agent.convert('<KEY>', [1], "XXX", "USD")
+    with pytest.raises(ValueError, match="base_currency and target_currency are required"):
+        currency_rates_agent.execute('<KEY>', target_currency="USD", amounts=[1])
+
+
+@patch("agents.currency_rates.transport.get")
+def test_rates_are_not_shared_between_api_keys(mock_get, currency_rates_agent):
+    """
+    Test that rates cached with one API key are not served to a caller using another.
+    """
+    valid = Mock()
+    valid.json.return_value = {"result": "success", "conversion_rates": {"USD": 1, "GBP": 0.75}}
+    invalid = Mock()
+    invalid.json.return_value = {"result": "error", "error-type": "invalid-key"}
+    mock_get.side_effect = lambda url: valid if "/good/" in url else invalid
+
+    assert "0.75" in currency_rates_agent.execute("good", "USD", "GBP")
+    with pytest.raises(ValueError, match="Failed to fetch currency rates"):
+        currency_rates_agent.execute("bad", "USD", "GBP")
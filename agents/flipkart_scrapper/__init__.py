@@ -5,6 +5,7 @@ from pydantic import BaseModel, HttpUrl, ValidationError
 from typing import List, Optional
 from itertools import islice
 from core.base import AgentBase
+from core import transport
 from log import logger
 import random
 
@@ -52,7 +53,7 @@ class FlipkartScrapperAgent(AgentBase):
                 'User-Agent': random.choice(user_agents)
             }
 
-            response = requests.get(search_url, headers=headers)
+            response = transport.get(search_url, headers=headers)
 
             #response = requests.get(search_url, headers={'User-Agent': 'Mozilla/5.0'})
             response.raise_for_status()
@@ -59,7 +59,7 @@ def flipkart_scrapper_agent(monkeypatch):
     }
 
     # Patch the requests module with mock data
-    monkeypatch.setattr("agents.flipkart_scrapper.requests", MockRequests(mock_data))
+    monkeypatch.setattr("agents.flipkart_scrapper.transport", MockRequests(mock_data))
     return agent
 
 
@@ -89,7 +89,7 @@ def test_execute_empty_response(flipkart_scrapper_agent, monkeypatch):
         # Simulate an empty HTML response
         return MockResponse("", 200)  # Simulate an empty HTML response
 
-    monkeypatch.setattr("agents.flipkart_scrapper.requests.get", mock_get_empty)
+    monkeypatch.setattr("agents.flipkart_scrapper.transport.get", mock_get_empty)
     
     item_name = "empty"
     max_products = 2
@@ -105,7 +105,7 @@ def test_execute_invalid_url(flipkart_scrapper_agent, monkeypatch):
         # Simulate an invalid response with 404 status code
         return MockResponse("Error", 404)
     
-    monkeypatch.setattr("agents.flipkart_scrapper.requests.get", mock_get_invalid)
+    monkeypatch.setattr("agents.flipkart_scrapper.transport.get", mock_get_invalid)
 
     item_name = "invalid_item"
     max_products = 1
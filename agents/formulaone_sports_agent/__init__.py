@@ -3,6 +3,7 @@ import json  # For parsing and formatting JSON data
 import logging
 from urllib.parse import urlencode
 from core.base import AgentBase  # Base class for agents
+from core import transport
 
 logger = logging.getLogger(__name__)
 
@@ -38,7 +39,7 @@ class SportsAgent(AgentBase):
     @staticmethod
     def fetch_data(url, headers):
         try:
-            response = requests.get(url, headers=headers)
+            response = transport.get(url, headers=headers)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
@@ -53,7 +54,7 @@ class SportsAgent(AgentBase):
         :return: Dictionary with the health status of the API.
         """
         try:
-            response = requests.get(
+            response = transport.get(
                 "https://v1.formula-1.api-sports.io/competitions",
                 headers={"x-apisports-key": apikey}  # Correct API header
             )
@@ -1,6 +1,7 @@
 import json
 from itertools import islice
 from core.base import AgentBase
+from core import transport
 from log import logger
 import requests
 
@@ -46,7 +47,7 @@ class GitHubActivitiesAgent(AgentBase):
             headers = {
                 "Accept": "application/vnd.github+json"
             }
-            response = requests.get(url, headers=headers)
+            response = transport.get(url, headers=headers)
             # check HTTP response status
             response.raise_for_status() 
             try:
@@ -109,7 +110,7 @@ class GitHubActivitiesAgent(AgentBase):
             headers = {
                 "Accept": "application/vnd.github+json"
             }
-            response = requests.get(url, headers=headers)
+            response = transport.get(url, headers=headers)
             response.raise_for_status()  
             events = response.json()
             if not isinstance(events, list) or not events:
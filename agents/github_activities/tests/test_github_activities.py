@@ -27,7 +27,7 @@ def github_activities_agent(monkeypatch):
         mock_response._content = b'[{"type": "PushEvent", "actor": {"login": "MockUser"}}]'
         return mock_response
        
-    monkeypatch.setattr("requests.get", mock_get)
+    monkeypatch.setattr("core.transport.get", mock_get)
     return agent
 
 
@@ -61,7 +61,7 @@ def test_health_check_failure(monkeypatch):
         raise Exception("Mock service failure")
 
     # Patch the `requests.get` method to simulate a failure
-    monkeypatch.setattr("requests.get", mock_get)
+    monkeypatch.setattr("core.transport.get", mock_get)
 
     agent = GitHubActivitiesAgent()
     health = agent.health_check()
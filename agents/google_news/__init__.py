@@ -1,5 +1,6 @@
 import json  # For parsing and formatting JSON data
 from core.base import AgentBase  # Base class for agents
+from core import transport
 from log import logger  # Logging utility
 import requests  # For making HTTP requests
 
@@ -49,7 +50,7 @@ class NewsFetcher(AgentBase):
 
         try:
             # Make a GET request to the API
-            response = requests.get(url)
+            response = transport.get(url)
             response.raise_for_status()  # Raise an exception for HTTP errors
 
             # Parse and format the JSON response
@@ -78,7 +79,7 @@ class NewsFetcher(AgentBase):
             )
 
             # Make a test request to the API
-            response = requests.get(url)
+            response = transport.get(url)
             response.raise_for_status()  # Raise an exception for non-2xx responses
 
             # Attempt to parse the response JSON
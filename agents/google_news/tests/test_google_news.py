@@ -13,7 +13,7 @@ def news_fetcher_agent():
     return NewsFetcher()
 
 
-@patch("agents.google_news.requests.get")  # Patching the requests.get method used in the NewsFetcher module
+@patch("agents.google_news.transport.get")  # Patching the requests.get method used in the NewsFetcher module
 def test_execute_success(mock_get, news_fetcher_agent):
     """
     Test successful execution of the NewsFetcher.
@@ -65,7 +65,7 @@ def test_health_check_success(news_fetcher_agent):
     mock_response = {"articles": [{"title": "Health Check News"}]}
 
     # Patch the requests.get method to simulate a successful API call
-    with patch("agents.google_news.requests.get") as mock_get:
+    with patch("agents.google_news.transport.get") as mock_get:
         mock_get.return_value = Mock(status_code=200, json=lambda: mock_response)  # Configure mock response
 
         # Call the health method and validate the response
@@ -82,7 +82,7 @@ def test_health_check_failure(news_fetcher_agent):
     apikey = '<KEY>'
 
     # Patch the requests.get method to simulate an API failure
-    with patch("agents.google_news.requests.get") as mock_get:
+    with patch("agents.google_news.transport.get") as mock_get:
         mock_get.side_effect = Exception("Mocked service failure")  # Simulate an exception during the API call
 
         # Call the health method and validate the response
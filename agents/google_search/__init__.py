@@ -1,5 +1,6 @@
 import json  # For parsing and formatting JSON data
 from core.base import AgentBase  # Base class for agents
+from core import transport
 from log import logger  # Logging utility
 import requests  # For making HTTP requests
 from pydantic import BaseModel, Field, ValidationError
@@ -72,7 +73,7 @@ class Search(AgentBase):
 
         try:
             # Make the HTTP GET request
-            response = requests.get(self.BASE_URL, params=params)
+            response = transport.get(self.BASE_URL, params=params)
 
             # Check for successful response
             if response.status_code == 200:
@@ -95,7 +96,7 @@ class Search(AgentBase):
         :return: Dictionary with the health status of the API.
         """
         try:
-            response = requests.get(
+            response = transport.get(
                 "https://serpapi.com/search",
                 headers={"Authorization": apikey}
             )
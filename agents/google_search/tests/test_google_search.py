@@ -12,7 +12,7 @@ def google_search_agent():
     return Search()
 
 
-@patch("agents.google_search.requests.get")  # Patching the requests.get method used in the Search module
+@patch("agents.google_search.transport.get")  # Patching the requests.get method used in the Search module
 def test_execute_success(mock_get, google_search_agent):
     """
     Test successful execution of the Google Search agent.
@@ -73,7 +73,7 @@ def test_health_check_success(google_search_agent):
         }
     }
 
-    with patch("agents.google_search.requests.get") as mock_get:
+    with patch("agents.google_search.transport.get") as mock_get:
         mock_get.return_value = Mock(status_code=200, json=lambda: mock_response)
 
         health = google_search_agent.health_check(apikey)
@@ -95,7 +95,7 @@ def test_health_check_failure(google_search_agent):
         }
     }
 
-    with patch("agents.google_search.requests.get") as mock_get:
+    with patch("agents.google_search.transport.get") as mock_get:
         mock_get.return_value = Mock(status_code=400, json=lambda: mock_response)
 
         health = google_search_agent.health_check(apikey)
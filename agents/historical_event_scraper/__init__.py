@@ -1,51 +1,53 @@
-import json
-from datetime import datetime
 from core.base import AgentBase
+from core import transport
 from log import logger
-import requests
 
 class HistoricalEventsAgent(AgentBase):
     """Agent to fetch historical events for the current date."""
 
-    def execute(self, month, day):
-        """
-        Fetch historical events for today's date from the API and return as a list of dictionaries.
-
-        Returns:
-            list: A list of dictionaries containing historical event data.
-
-        Raises:
-            ValueError: If the API request fails or data cannot be retrieved.
-        """
+    def _fetch_events(self, month, day):
+        """Return the events of a date from the API."""
         try:
-            # Get the current date
-            today = datetime.now()
-            # month = today.month
-            # day = today.day
-
             # Construct the API URL
             url = f"https://byabbe.se/on-this-day/{month}/{day}/events.json"
             logger.info(f"Fetching events from URL: {url}")
 
             # Fetch data from the API
-            response = requests.get(url)
+            response = transport.get(url)
             response.raise_for_status()  # Raise an exception for HTTP errors
 
             # Parse JSON response
-            events_data = response.json()
-            events = events_data.get("events", [])
-            
-            # Convert the list of events to a JSON-formatted string
-            events_json = json.dumps(events, indent=4)
-
-            # Log the JSON-formatted events
-            print(f"Historical Events on {today.strftime('%B %d')}:\n{events_json}")
-
+            events = response.json().get("events", [])
+            logger.info(f"Fetched {len(events)} historical events for {month}/{day}.")
             return events
         except Exception as e:
             logger.error(f"An error occurred: {e}")
             raise ValueError("Failed to fetch historical events. Please check the API or your connection.") from e
 
+    def execute(self, month, day):
+        """
+        Fetch historical events for the given date from the API and return as a list of dictionaries.
+
+        Returns:
+            list: A list of dictionaries containing historical event data.
+
+        Raises:
+            ValueError: If the API request fails or data cannot be retrieved.
+        """
+        return self._fetch_events(month, day)
+
+    def stream(self, month, day):
+        """
+        Yield the historical events of the given date one at a time.
+
+        Yields:
+            dict: Historical event data.
+
+        Raises:
+            ValueError: If the API request fails or data cannot be retrieved.
+        """
+        yield from self._fetch_events(month, day)
+
     def health_check(self):
         """
         Check if the On This Day API is functional.
@@ -58,7 +60,7 @@ class HistoricalEventsAgent(AgentBase):
             
             # Test the API with a known valid date
             test_url = "https://byabbe.se/on-this-day/1/1/events.json"
-            response = requests.get(test_url)
+            response = transport.get(test_url)
             response.raise_for_status()
             
             # Attempt to parse and fetch the first event
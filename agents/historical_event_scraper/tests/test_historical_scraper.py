@@ -46,7 +46,7 @@ def historical_event_scraper(monkeypatch):
     """Fixture to initialize the HistoricalEventsAgent with mocked requests."""
     agent = HistoricalEventsAgent()
     # Patch the requests.get function with the mock class
-    monkeypatch.setattr("agents.historical_event_scraper.requests.get", MockRequests.get)
+    monkeypatch.setattr("agents.historical_event_scraper.transport.get", MockRequests.get)
     return agent
 
 
@@ -63,7 +63,7 @@ def test_execute_no_events(historical_event_scraper, monkeypatch):
     def mock_no_events(*args, **kwargs):
         return MockResponse({"events": []})
 
-    monkeypatch.setattr("agents.historical_event_scraper.requests.get", mock_no_events)
+    monkeypatch.setattr("agents.historical_event_scraper.transport.get", mock_no_events)
     response = historical_event_scraper.execute(11, 26)
     assert response == [], "Expected an empty list when no events are available."
 
@@ -73,7 +73,7 @@ def test_execute_invalid_url(historical_event_scraper, monkeypatch):
     def mock_invalid_url(*args, **kwargs):
         raise ValueError("Invalid URL")
 
-    monkeypatch.setattr("agents.historical_event_scraper.requests.get", mock_invalid_url)
+    monkeypatch.setattr("agents.historical_event_scraper.transport.get", mock_invalid_url)
     with pytest.raises(ValueError, match="Failed to fetch historical events. Please check the API or your connection."):
         historical_event_scraper.execute(11, 26)
 
@@ -90,7 +90,7 @@ def test_health_check_failure(monkeypatch):
     def mock_service_failure(*args, **kwargs):
         raise Exception("Mock service failure")
 
-    monkeypatch.setattr("agents.historical_event_scraper.requests.get", mock_service_failure)
+    monkeypatch.setattr("agents.historical_event_scraper.transport.get", mock_service_failure)
     agent = HistoricalEventsAgent()
     health = agent.health_check()
     assert health["status"] == "unhealthy", "Expected health status to be 'unhealthy'."
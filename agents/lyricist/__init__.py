@@ -1,8 +1,8 @@
 import json
-import requests
 from typing import Dict, Any
 from log import logger
 from core.base import AgentBase
+from core import transport
 
 class LyricsAgent(AgentBase):
     """Agent to fetch song lyrics using the Lyrics.ovh API."""
@@ -32,7 +32,7 @@ class LyricsAgent(AgentBase):
                 raise ValueError("Artist and song title cannot be empty.")
             
             url = f"{self.base_url}/{artist}/{title}"
-            response = requests.get(url)
+            response = transport.get(url)
             
             if response.status_code == 200:
                 data = response.json()
@@ -62,7 +62,7 @@ class LyricsAgent(AgentBase):
         try:
             logger.info("Performing lyrics API health check...")
             test_url = f"{self.base_url}/Coldplay/Yellow"
-            response = requests.get(test_url)
+            response = transport.get(test_url)
             
             if response.status_code == 200:
                 logger.info("Lyrics API health check passed.")
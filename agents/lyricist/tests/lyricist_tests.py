@@ -1,5 +1,6 @@
 import pytest
 import requests
+from core import transport
 from unittest.mock import Mock
 from agents.lyricist import LyricsAgent
 
@@ -15,7 +16,7 @@ def mock_response():
 def lyrics_agent(monkeypatch, mock_response):
     """Fixture to initialize LyricsAgent with mocked requests."""
     agent = LyricsAgent()
-    monkeypatch.setattr(requests, "get", Mock(return_value=mock_response))
+    monkeypatch.setattr(transport, "get", Mock(return_value=mock_response))
     return agent
 
 def test_execute_success(lyrics_agent):
@@ -35,7 +36,7 @@ def test_execute_api_error(lyrics_agent, monkeypatch):
     """Test execution when API returns an error."""
     mock_error_response = Mock()
     mock_error_response.status_code = 404
-    monkeypatch.setattr(requests, "get", Mock(return_value=mock_error_response))
+    monkeypatch.setattr(transport, "get", Mock(return_value=mock_error_response))
     
     result = lyrics_agent.execute(artist="TestArtist", title="TestSong")
     assert "error" in result
@@ -46,7 +47,7 @@ def test_execute_no_lyrics(lyrics_agent, monkeypatch):
     mock_empty_response = Mock()
     mock_empty_response.status_code = 200
     mock_empty_response.json.return_value = {"lyrics": ""}
-    monkeypatch.setattr(requests, "get", Mock(return_value=mock_empty_response))
+    monkeypatch.setattr(transport, "get", Mock(return_value=mock_empty_response))
     
     result = lyrics_agent.execute(artist="TestArtist", title="TestSong")
     assert "error" in result
@@ -56,7 +57,7 @@ def test_execute_request_exception(lyrics_agent, monkeypatch):
     """Test execution when request raises an exception."""
     def mock_request(*args, **kwargs):
         raise requests.RequestException("Connection error")
-    monkeypatch.setattr(requests, "get", mock_request)
+    monkeypatch.setattr(transport, "get", mock_request)
     
     result = lyrics_agent.execute(artist="TestArtist", title="TestSong")
     assert "error" in result
@@ -72,7 +73,7 @@ def test_health_check_failure(lyrics_agent, monkeypatch):
     """Test health check failure."""
     def mock_request(*args, **kwargs):
         raise requests.RequestException("Service unavailable")
-    monkeypatch.setattr(requests, "get", mock_request)
+    monkeypatch.setattr(transport, "get", mock_request)
     
     health = lyrics_agent.health_check()
     assert health["status"] == "unhealthy"
@@ -1,7 +1,7 @@
-import http.client
 import json
 import urllib.parse
 from core.base import AgentBase
+from core import transport
 from log import logger
 
 class SpotifySearchAgent(AgentBase):
@@ -63,7 +63,7 @@ class SpotifySearchAgent(AgentBase):
 
             logger.info(f"Searching Spotify for: {query}")
 
-            conn = http.client.HTTPSConnection(self.base_url)
+            conn = transport.PooledConnection(self.base_url)
             conn.request("GET", endpoint, headers=headers)
             
             response = conn.getresponse()
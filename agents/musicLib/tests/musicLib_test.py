@@ -91,7 +91,7 @@ def test_filter_album_data(spotify_agent):
         "year": 2024
     }
 
-@patch('http.client.HTTPSConnection')
+@patch('core.transport.PooledConnection')
 def test_execute_success(mock_connection, spotify_agent, mock_successful_response):
     """Test successful API request execution"""
     mock_conn = MockConnection(MockResponse(200, mock_successful_response))
@@ -108,7 +108,7 @@ def test_execute_success(mock_connection, spotify_agent, mock_successful_respons
     assert result["albums"][0]["artist"] == "Test Artist"
     assert result["albums"][0]["year"] == 2024
 
-@patch('http.client.HTTPSConnection')
+@patch('core.transport.PooledConnection')
 def test_execute_api_error(mock_connection, spotify_agent):
     """Test handling of API error response"""
     error_response = {"message": "API Error"}
@@ -139,7 +139,7 @@ def test_execute_missing_api_key(spotify_agent):
     assert result["status"] == "failed"
     assert "API key must be provided" in result["error"]
 
-@patch('http.client.HTTPSConnection')
+@patch('core.transport.PooledConnection')
 def test_health_check_success(mock_connection, spotify_agent, mock_successful_response):
     """Test successful health check"""
     mock_conn = MockConnection(MockResponse(200, mock_successful_response))
@@ -149,7 +149,7 @@ def test_health_check_success(mock_connection, spotify_agent, mock_successful_re
     assert result["status"] == "healthy"
     assert result["message"] == "Spotify API service is available"
 
-@patch('http.client.HTTPSConnection')
+@patch('core.transport.PooledConnection')
 def test_health_check_failure(mock_connection, spotify_agent):
     """Test failed health check"""
     error_response = {"message": "Service unavailable"}
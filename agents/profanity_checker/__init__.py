@@ -1,7 +1,7 @@
 import json
-import requests
 from pydantic import BaseModel
 from core.base import AgentBase
+from core import transport
 from log import logger
 
 class ProfanityCheckResponse(BaseModel):
@@ -41,7 +41,7 @@ class ProfanityCheckerAgent(AgentBase):
 
         try:
             logger.info("Sending request to profanity API.")
-            response = requests.post(url, headers=headers, data=payload)
+            response = transport.post(url, headers=headers, data=payload)
 
             if response.status_code != 200:
                 logger.error(f"API call failed: {response.status_code} - {response.text}")
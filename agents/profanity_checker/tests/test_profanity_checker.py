@@ -36,7 +36,7 @@ def profanity_checker_agent():
     return ProfanityCheckerAgent()
 
 
-@patch("requests.post")
+@patch("core.transport.post")
 def test_execute_success(mock_post, profanity_checker_agent):
     """Test successful execution of profanity check."""
     # Mock the API response
@@ -53,7 +53,7 @@ def test_execute_success(mock_post, profanity_checker_agent):
     assert result["censored_content"] == "this is a ****** sentence", "Censorship did not work."
 
 
-@patch("requests.post")
+@patch("core.transport.post")
 def test_execute_empty_text(mock_post, profanity_checker_agent):
     """Test execution with empty text."""
     text = ""
@@ -63,7 +63,7 @@ def test_execute_empty_text(mock_post, profanity_checker_agent):
         profanity_checker_agent.execute(text, api_key)
 
 
-@patch("requests.post")
+@patch("core.transport.post")
 def test_execute_invalid_api_key(mock_post, profanity_checker_agent):
     """Test execution with invalid API key."""
     # Mock the API failure response
@@ -77,7 +77,7 @@ def test_execute_invalid_api_key(mock_post, profanity_checker_agent):
         profanity_checker_agent.execute(text, invalid_api_key)
 
 
-@patch("requests.post")
+@patch("core.transport.post")
 def test_execute_unexpected_response(mock_post, profanity_checker_agent):
     """Test execution with unexpected API response."""
     # Mock an unexpected response
@@ -91,7 +91,7 @@ def test_execute_unexpected_response(mock_post, profanity_checker_agent):
         profanity_checker_agent.execute(text, api_key)
 
 
-@patch("requests.post")
+@patch("core.transport.post")
 def test_health_check_success(mock_post, profanity_checker_agent):
     """Test health check success."""
     # Mock the API response for health check
@@ -113,7 +113,7 @@ def test_health_check_success(mock_post, profanity_checker_agent):
     # Check if the response has the expected status
     assert health_status["status"] == "healthy", "Expected health status to be 'healthy'."
     
-@patch("requests.post")
+@patch("core.transport.post")
 def test_health_check_failure(mock_post, profanity_checker_agent):
     """Test health check failure."""
     # Mock a failed health check response
@@ -1,6 +1,10 @@
-import json
-from typing import Dict, List
-from textblob import TextBlob
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+import numpy as np
+from textblob.en import sentiment as pattern_sentiment
 from pydantic import BaseModel, Field, ValidationError
 from core.base import AgentBase
 from log import logger
@@ -15,6 +19,42 @@ class CommentAnalysis(BaseModel):
     review_length: int = Field(..., description="Length of the comment in words.")
 
 
+SYLLABLE_CACHE_SIZE = 65536   # Distinct words whose syllable count is remembered
+BATCH_CHUNK_SIZE = 2000       # Comments sent to a worker process at a time
+STREAM_CHUNK_SIZE = 100       # Comments analyzed together before their results are streamed
+
+VOWEL_CODES = np.array([ord(vowel) for vowel in 'aeiouy'], dtype=np.uint32)
+
+AnalysisRow = Tuple[float, float, float, int]  # Polarity, subjectivity, readability score, word count
+
+
+@lru_cache(maxsize=SYLLABLE_CACHE_SIZE)
+def count_syllables(word: str) -> int:
+    """
+    Estimate the number of syllables of a word by counting its vowel groups.
+
+    Args:
+        word (str): The word to count.
+
+    Returns:
+        int: The estimated number of syllables, at least 1.
+    """
+    vowels = 'aeiouy'
+    word = word.lower()
+    count = 0
+    if len(word) > 3:
+        if word.endswith('e'):
+            word = word[:-1]
+
+    # Count vowel groups
+    for index in range(len(word)):
+        if (word[index] in vowels and
+            (index == 0 or word[index-1] not in vowels)):
+            count += 1
+
+    return max(1, count)
+
+
 class ReadabilityScorer:
     """Custom readability scoring implementation."""
     @staticmethod
@@ -28,32 +68,23 @@ class ReadabilityScorer:
         Returns:
             float: A readability score similar to Flesch Reading Ease.
         """
-        # Count sentences (minimum 1 to avoid division by zero)
-        sentences = max(1, len([s for s in text.split('.') if s.strip()]))
-        
-        # Count words
         words = text.split()
-        word_count = len(words)
-        
-        # Count syllables (simplified estimation)
-        def count_syllables(word: str) -> int:
-            vowels = 'aeiouy'
-            word = word.lower()
-            count = 0
-            if len(word) > 3:
-                if word.endswith('e'):
-                    word = word[:-1]
-            
-            # Count vowel groups
-            for index in range(len(word)):
-                if (word[index] in vowels and 
-                    (index == 0 or word[index-1] not in vowels)):
-                    count += 1
-            
-            return max(1, count)
-        
-        syllable_count = sum(count_syllables(word) for word in words)
-        
+        return ReadabilityScorer.score(ReadabilityScorer.count_sentences(text), len(words),
+                                       sum(count_syllables(word) for word in words))
+
+    @staticmethod
+    def count_sentences(text: str) -> int:
+        """Count the sentences of a text, at least 1 to avoid division by zero."""
+        return max(1, len([s for s in text.split('.') if s.strip()]))
+
+    @staticmethod
+    def score(sentences: int, word_count: int, syllable_count: int) -> float:
+        """
+        Compute the readability score from the sentence, word and syllable counts of a text.
+
+        Returns:
+            float: The score, bounded between 0 and 100.
+        """
         # Custom Flesch-like readability calculation
         try:
             score = 206.835 - (
@@ -65,6 +96,75 @@ class ReadabilityScorer:
             return 50.0  # Default score if calculation fails
 
 
+def syllable_counts(words: Sequence[str]) -> np.ndarray:
+    """
+    Estimate the syllables of many words at once, as ``count_syllables`` does.
+
+    The lowercased words are laid out end to end, each followed by a space, as one
+    array of code points; vowel groups are found with array operations over
+    that buffer and counted per word.
+
+    Args:
+        words (Sequence[str]): Words without whitespace.
+
+    Returns:
+        np.ndarray: The syllable count of every word, at least 1.
+    """
+    lowered = [word.lower() for word in words]
+    lengths = np.fromiter(map(len, lowered), dtype=np.int64, count=len(lowered))
+    codes = np.frombuffer("".join(f"{word} " for word in lowered).encode("utf-32-le"), dtype=np.uint32)
+    starts = np.cumsum(lengths + 1) - lengths - 1
+
+    vowels = np.isin(codes, VOWEL_CODES)
+    # A final 'e' of a word longer than 3 letters is silent.
+    ends = (starts + lengths - 1)[lengths > 3]
+    vowels[ends[codes[ends] == ord('e')]] = False
+    # Separators are not vowels, so a group never spans two words.
+    group_starts = vowels & ~np.concatenate(([False], vowels[:-1]))
+    word_ids = np.repeat(np.arange(len(lowered)), lengths + 1)
+    return np.maximum(1, np.bincount(word_ids[group_starts], minlength=len(lowered)))
+
+
+def readability_scores(sentences: np.ndarray, word_counts: np.ndarray, syllables: np.ndarray) -> np.ndarray:
+    """Compute ``ReadabilityScorer.score`` for arrays of sentence, word and syllable counts."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scores = 206.835 - (1.015 * (word_counts / sentences) - 84.6 * (syllables / word_counts))
+    return np.where(word_counts == 0, 50.0, np.clip(scores, 0, 100))
+
+
+def analyze_texts(texts: Sequence[str]) -> List[AnalysisRow]:
+    """
+    Compute the metrics of many comment texts.
+
+    Identical texts are analyzed once. The words of all texts are numbered
+    against a shared vocabulary, syllables are counted once per distinct word
+    with ``syllable_counts`` and summed per text with ``np.bincount``, and the
+    readability scores are computed on whole arrays. Sentiment comes straight
+    from the pattern analyzer ``TextBlob.sentiment`` wraps, without building a
+    blob per comment.
+
+    Args:
+        texts (Sequence[str]): The comment texts.
+
+    Returns:
+        List[AnalysisRow]: The metrics of every text, in order.
+    """
+    unique = list(dict.fromkeys(texts))
+    words = [text.split() for text in unique]
+    word_counts = np.fromiter(map(len, words), dtype=np.int64, count=len(unique))
+    vocabulary = {}
+    word_ids = np.fromiter((vocabulary.setdefault(word, len(vocabulary)) for text in words for word in text),
+                           dtype=np.int64, count=int(word_counts.sum()))
+    text_ids = np.repeat(np.arange(len(unique)), word_counts)
+    syllables = np.bincount(text_ids, weights=syllable_counts(list(vocabulary))[word_ids], minlength=len(unique))
+    sentences = np.fromiter(map(ReadabilityScorer.count_sentences, unique), dtype=np.int64, count=len(unique))
+    scores = readability_scores(sentences, word_counts, syllables)
+
+    rows = {text: (*pattern_sentiment(text), float(score), int(count))
+            for text, score, count in zip(unique, scores, word_counts)}
+    return [rows[text] for text in texts]
+
+
 class YouTubeReviewAnalyzer(AgentBase):
     """Agent to analyze YouTube comments."""
 
@@ -83,53 +183,128 @@ class YouTubeReviewAnalyzer(AgentBase):
         Returns:
             CommentAnalysis: A validated Pydantic model containing analysis results.
         """
-        blob = TextBlob(comment_text)
-        analysis_data = {
-            "comment": comment_text,
-            "sentiment_polarity": blob.sentiment.polarity,
-            "sentiment_subjectivity": blob.sentiment.subjectivity,
-            "readability_score": self.readability_scorer.calculate_flesch_reading_ease(comment_text),
-            "review_length": len(comment_text.split())
-        }
+        return self._build_analysis(comment_text, analyze_texts([comment_text])[0])
+
+    @staticmethod
+    def _build_analysis(comment_text: str, row: AnalysisRow) -> CommentAnalysis:
+        """Validate the metrics computed by ``analyze_texts`` for a comment."""
+        polarity, subjectivity, readability, length = row
         try:
-            return CommentAnalysis(**analysis_data)
+            return CommentAnalysis(comment=comment_text, sentiment_polarity=polarity,
+                                   sentiment_subjectivity=subjectivity, readability_score=readability,
+                                   review_length=length)
         except ValidationError as e:
             logger.error(f"Validation error for comment analysis: {e}")
             raise ValueError("Invalid analysis data.") from e
 
-    def process_comments(self, comments_data: List[Dict]) -> List[Dict]:
+    def analyze_batch(self, texts: Sequence[str], workers: Optional[int] = None) -> List[AnalysisRow]:
         """
-        Process a list of comment dictionaries and return analysis results.
+        Compute the metrics of many comments, optionally across worker processes.
+
+        The throughput is logged in comments per second.
 
         Args:
-            comments_data (List[Dict]): A list of comment data dictionaries.
+            texts (Sequence[str]): The comment texts.
+            workers (int, optional): Number of worker processes. Batches of at
+                most ``BATCH_CHUNK_SIZE`` comments are analyzed in-process.
 
         Returns:
-            List[Dict]: A list of processed analysis results.
+            List[AnalysisRow]: The rows of ``analyze_texts``, in order.
         """
-        results = []
+        started = time.perf_counter()
+        if workers and workers > 1 and len(texts) > BATCH_CHUNK_SIZE:
+            chunks = [texts[i:i + BATCH_CHUNK_SIZE] for i in range(0, len(texts), BATCH_CHUNK_SIZE)]
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                rows = [row for chunk in pool.map(analyze_texts, chunks) for row in chunk]
+        else:
+            rows = analyze_texts(texts)
+        elapsed = max(time.perf_counter() - started, 1e-9)
+        logger.info(f"Analyzed {len(texts)} comments in {elapsed:.2f}s ({len(texts) / elapsed:.0f} comments/sec).")
+        return rows
+
+    def _process(self, comments_data: Iterable[Dict],
+                 analyze: Callable[[Sequence[str]], List[AnalysisRow]]) -> List[Dict]:
+        """Analyze comments with ``analyze`` and build their results, skipping comments that fail."""
+        comments = []
         for comment in comments_data:
             try:
-                analysis = self.analyze_comment(comment["comment"])
-                result = {
-                    "author": comment.get("author", "Unknown"),
-                    "original_comment": comment["comment"],
-                    "likes": comment.get("likes", 0),
-                    "time": comment.get("time", "Unknown"),
-                    "analysis": analysis.model_dump()
-                }
-                results.append(result)
+                if not isinstance(comment["comment"], str):
+                    raise TypeError(f"Comment text must be a string, not {type(comment['comment']).__name__}")
+                comments.append(comment)
             except Exception as e:
                 logger.error(f"Error processing comment: {e}")
+
+        rows = analyze([comment["comment"] for comment in comments])
+        results = []
+        for comment, row in zip(comments, rows):
+            try:
+                analysis = self._build_analysis(comment["comment"], row)
+            except ValueError as e:
+                logger.error(f"Error processing comment: {e}")
+                continue
+            results.append({
+                "author": comment.get("author", "Unknown"),
+                "original_comment": comment["comment"],
+                "likes": comment.get("likes", 0),
+                "time": comment.get("time", "Unknown"),
+                "analysis": analysis.model_dump()
+            })
         return results
 
-    def execute(self, video_url: str, max_comments: int = 10):
+    def iter_processed_comments(self, comments_data: Iterable[Dict],
+                                chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[Dict]:
+        """
+        Analyze comments in chunks, yielding the results of each chunk as soon as it is ready.
+
+        Args:
+            comments_data (Iterable[Dict]): Comment data dictionaries.
+            chunk_size (int): Comments analyzed together by ``analyze_texts``.
+
+        Yields:
+            Dict: The analysis result of a comment; comments that fail are skipped.
+        """
+        comments = iter(comments_data)
+        while True:
+            chunk = list(islice(comments, chunk_size))
+            if not chunk:
+                return
+            yield from self._process(chunk, analyze_texts)
+
+    def process_comments(self, comments_data: List[Dict], workers: Optional[int] = None) -> List[Dict]:
+        """
+        Process a list of comment dictionaries and return analysis results.
+
+        Args:
+            comments_data (List[Dict]): A list of comment data dictionaries.
+            workers (int, optional): Number of worker processes, see ``analyze_batch``.
+
+        Returns:
+            List[Dict]: A list of processed analysis results; comments that fail are skipped.
+        """
+        return self._process(comments_data, lambda texts: self.analyze_batch(texts, workers=workers))
+
+    def _fetch_comments(self, video_url: str, max_comments: int) -> List[Dict]:
+        """Return the comments of a video to analyze."""
+        logger.info(f"Fetching and analyzing comments for video: {video_url}")
+        # For this example, we'll use sample comments
+        # Replace with actual YouTube API integration or comment fetching logic
+        return [
+            {
+                "author": "TestUser",
+                "comment": "This is a great video!",
+                "likes": 42,
+                "time": "2 days ago"
+            }
+        ][:max_comments]
+
+    def execute(self, video_url: str, max_comments: int = 10, workers: Optional[int] = None):
         """
         Fetch comments and perform analysis on a YouTube video.
 
         Args:
             video_url (str): The URL of the YouTube video.
             max_comments (int): Maximum number of comments to analyze.
+            workers (int, optional): Number of worker processes analyzing the comments.
 
         Returns:
             list: A list of analyzed comments.
@@ -138,28 +313,34 @@ class YouTubeReviewAnalyzer(AgentBase):
             ValueError: If an error occurs during analysis.
         """
         try:
-            logger.info(f"Fetching and analyzing comments for video: {video_url}")
-            # For this example, we'll use sample comments
-            # Replace with actual YouTube API integration or comment fetching logic
-            sample_comments = [
-                {
-                    "author": "TestUser",
-                    "comment": "This is a great video!",
-                    "likes": 42,
-                    "time": "2 days ago"
-                }
-            ]
-            # Process comments
-            results = self.process_comments(sample_comments)
-            # Log results as JSON
-            results_json = json.dumps(results, indent=4)
-            logger.info(f"Analysis results: {results_json}")
-            print(results_json)
+            results = self.process_comments(self._fetch_comments(video_url, max_comments), workers=workers)
+            logger.info(f"Analyzed {len(results)} comments.")
             return results
         except Exception as e:
             logger.error(f"Error analyzing YouTube comments: {e}")
             raise ValueError("Failed to analyze comments.") from e
 
+    def stream(self, video_url: str, max_comments: int = 10):
+        """
+        Fetch comments of a YouTube video and yield each analysis as soon as it is ready.
+
+        Args:
+            video_url (str): The URL of the YouTube video.
+            max_comments (int): Maximum number of comments to analyze.
+
+        Yields:
+            dict: An analyzed comment.
+
+        Raises:
+            ValueError: If the comments cannot be fetched.
+        """
+        try:
+            comments = self._fetch_comments(video_url, max_comments)
+        except Exception as e:
+            logger.error(f"Error analyzing YouTube comments: {e}")
+            raise ValueError("Failed to analyze comments.") from e
+        yield from self.iter_processed_comments(comments)
+
     def health_check(self):
         """
         Check if the analyzer is functional.
@@ -1,4 +1,5 @@
 import pytest
+from agents import review_sentiment
 from agents.review_sentiment import YouTubeReviewAnalyzer
 
 
@@ -132,4 +133,52 @@ def test_large_comment(youtube_review_analyzer):
     }
     response = youtube_review_analyzer.process_comments([large_comment])
     assert len(response) == 1, "Expected one comment in the response."
-    assert response[0]["analysis"]["review_length"] > 1000, "Expected review length to be greater than 1000."
\ No newline at end of file
+    assert response[0]["analysis"]["review_length"] > 1000, "Expected review length to be greater than 1000."
+
+# Polarity, subjectivity, readability and length computed by the original per-comment TextBlob scorer.
+SCORED_COMMENTS = {
+    "This is a great video!": (1.0, 0.75, 100.0, 5),
+    "Terrible audio. Boring too.": (-1.0, 1.0, 100.0, 4),
+    "": (0.0, 0.0, 50.0, 0),
+    "the cat sat " * 80: (0.0, 0.0, 47.835000000000036, 240),
+    "İstanbul theatre make queue " * 60: (0.0, 0.0, 90.13500000000003, 240),
+    "Long sentence. " + "Everybody absolutely loved it " * 50: (0.6852941176470586, 0.7921568627450979, 100.0, 202),
+}
+
+
+def test_batch_matches_the_original_scorer(monkeypatch):
+    """Test that batch analysis, in-process and across workers, gives the scores of the original scorer."""
+    analyzer = YouTubeReviewAnalyzer()
+    texts = list(SCORED_COMMENTS) + ["This is a great video!"]
+    expected = [SCORED_COMMENTS[text] for text in texts]
+
+    assert analyzer.analyze_batch(texts) == expected
+    monkeypatch.setattr("agents.review_sentiment.BATCH_CHUNK_SIZE", 2)
+    assert analyzer.analyze_batch(texts, workers=2) == expected
+    assert analyzer.analyze_comment(texts[3]).readability_score == expected[3][2]
+
+
+def test_stream_analyzes_comments_in_chunks(monkeypatch):
+    """Test that streamed comments are analyzed a chunk at a time, in order."""
+    analyzer = YouTubeReviewAnalyzer()
+    chunks = []
+    real_analyze_texts = review_sentiment.analyze_texts
+
+    def counting_analyze_texts(texts):
+        chunks.append(len(texts))
+        return real_analyze_texts(texts)
+
+    monkeypatch.setattr(review_sentiment, "analyze_texts", counting_analyze_texts)
+    comments = [{"comment": text} for text in SCORED_COMMENTS] * 50
+    results = list(analyzer.iter_processed_comments(comments))
+    assert chunks == [100, 100, 100]
+    assert [result["analysis"]["readability_score"] for result in results] == \
+        [row[2] for row in SCORED_COMMENTS.values()] * 50
+
+
+def test_process_comments_skips_invalid_comments():
+    """Test that comments without text are skipped while the others are analyzed."""
+    analyzer = YouTubeReviewAnalyzer()
+    results = analyzer.process_comments([{"comment": "Nice!"}, {"invalid_key": "x"}, {"comment": None}])
+    assert [result["original_comment"] for result in results] == ["Nice!"]
+    assert results[0]["author"] == "Unknown"
@@ -2,8 +2,13 @@ import requests
 from pydantic import BaseModel, Field, ValidationError, field_validator
 from typing import Optional
 from core.base import AgentBase
+from core import timeseries, transport
 from log import logger
 
+SERIES_KEY = "Time Series (Daily)"
+COMPACT_SIZE = 100          # Rows of a 'compact' Alpha Vantage response
+DEFAULT_MAX_AGE = 3600      # Seconds before the latest days are fetched again
+
 
 class DailyRequestModel(BaseModel):
     """Pydantic model for validating daily stock request parameters."""
@@ -31,15 +36,24 @@ class StockDailyFetcher(AgentBase):
     """Agent to fetch daily stock data from Alpha Vantage."""
     BASE_URL = "https://www.alphavantage.co/query"
 
-    def execute(self, apikey: str, symbol: str, outputsize: str = "compact", datatype: str = "json") -> str:
+    def execute(self, apikey: str, symbol: str, outputsize: str = "compact", datatype: str = "json",
+                start: Optional[str] = None, end: Optional[str] = None, max_age: float = DEFAULT_MAX_AGE):
         """
         Fetch daily stock data based on the provided parameters.
 
+        JSON series are kept in the local series store (see ``core.timeseries``):
+        only the days missing since the last call are downloaded, and at most
+        once every ``max_age`` seconds, so repeated calls and range queries are
+        answered from disk.
+
         Args:
             apikey (str): The API key for authentication.
             symbol (str): The stock symbol (e.g., 'IBM').
             outputsize (str): The size of the output data ('compact' or 'full').
             datatype (str): The response format ('json' or 'csv').
+            start (Optional[str]): First date returned (YYYY-MM-DD), for JSON data.
+            end (Optional[str]): Last date returned (YYYY-MM-DD), for JSON data.
+            max_age (float): Seconds stored data is served without checking for new days.
 
         Returns:
             str: JSON string or CSV string containing stock data.
@@ -47,6 +61,31 @@ class StockDailyFetcher(AgentBase):
         Raises:
             ValueError: If the request fails or the symbol is invalid.
         """
+        store = timeseries.get_store()
+        if store is None or datatype != "json":
+            return self._fetch(apikey, symbol, outputsize, datatype)
+
+        responses = []
+
+        def fetch(full):
+            data = self._fetch(apikey, symbol, "full" if full else "compact", datatype)
+            responses.append(data)
+            if SERIES_KEY not in data:
+                return None
+            return data[SERIES_KEY], {"source": data.get("Meta Data", {})}
+
+        series = store.sync(("TIME_SERIES_DAILY", symbol.upper()), fetch, max_age, full=outputsize == "full")
+        if series is None:
+            return responses[-1]  # Rate limit notes and other answers without a series
+        if start or end:
+            series = series.between(timeseries.parse_time(start) if start else None,
+                                    timeseries.parse_time(end, end=True) if end else None)
+        elif outputsize == "compact":
+            series = series.tail(COMPACT_SIZE)
+        return {"Meta Data": series.meta.get("source", {}), SERIES_KEY: series.to_records("%Y-%m-%d")}
+
+    def _fetch(self, apikey: str, symbol: str, outputsize: str, datatype: str):
+        """Download daily stock data from Alpha Vantage."""
         params = {
             "function": "TIME_SERIES_DAILY",
             "symbol": symbol,
@@ -58,7 +97,7 @@ class StockDailyFetcher(AgentBase):
         logger.debug(f"Constructed URL with parameters: {params}")
 
         try:
-            response = requests.get(self.BASE_URL, params=params)
+            response = transport.get(self.BASE_URL, params=params)
             response.raise_for_status()
         except requests.RequestException as e:
             logger.error("Failed to fetch stock data. Please check the API or network.")
@@ -90,7 +129,8 @@ class StockDailyFetcher(AgentBase):
                 apikey=apikey,
                 symbol="IBM",
                 outputsize="compact",
-                datatype="json"
+                datatype="json",
+                max_age=0
             )
             if "Meta Data" in test_result:
                 return {"status": "healthy", "message": "Service is operational"}
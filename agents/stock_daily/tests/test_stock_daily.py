@@ -1,9 +1,18 @@
 import pytest
 import requests
+from core import timeseries, transport
 from pydantic import ValidationError
 from agents.stock_daily import StockDailyFetcher, DailyRequestModel
 
 
+@pytest.fixture(autouse=True)
+def series_store(monkeypatch, tmp_path):
+    """Fixture keeping downloaded series in a temporary store instead of the working tree."""
+    store = timeseries.SeriesStore(str(tmp_path / "series"))
+    monkeypatch.setattr(timeseries, "_store", store)
+    return store
+
+
 def test_valid_request():
     """
     Test a valid request to the StockDailyFetcher with proper parameters.
@@ -71,7 +80,7 @@ def test_network_error(monkeypatch):
     def mock_requests_get(*args, **kwargs):
         raise requests.RequestException("Network error")
 
-    monkeypatch.setattr(requests, "get", mock_requests_get)
+    monkeypatch.setattr(transport, "get", mock_requests_get)
 
     fetcher = StockDailyFetcher()
     with pytest.raises(ValueError, match="Failed to fetch stock data"):
@@ -145,3 +154,33 @@ def test_large_output_size():
     )
     assert len(response["Time Series (Daily)"]) > 1000, "Expected more than 1000 records for full output size"
 
+
+
+def test_series_store_answers_repeat_and_range_queries(monkeypatch):
+    """
+    Keep the downloaded series on disk.
+    Ensures repeat calls and date ranges are answered without new requests.
+    """
+    days = {f"2024-01-{day:02d}": {"1. open": f"{day}.0000", "5. volume": "100"} for day in range(2, 10)}
+    requests_made = []
+
+    class Response:
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return {"Meta Data": {"2. Symbol": "IBM"}, "Time Series (Daily)": dict(reversed(days.items()))}
+
+    def mock_get(url, params):
+        requests_made.append(params["outputsize"])
+        return Response()
+
+    monkeypatch.setattr(transport, "get", mock_get)
+
+    fetcher = StockDailyFetcher()
+    first = fetcher.execute(apikey="<KEY>", symbol="IBM", outputsize="full")
+    assert first["Time Series (Daily)"] == dict(reversed(days.items()))
+    ranged = fetcher.execute(apikey="<KEY>", symbol="ibm", outputsize="full", start="2024-01-03", end="2024-01-04")
+    assert list(ranged["Time Series (Daily)"]) == ["2024-01-04", "2024-01-03"]
+    assert ranged["Meta Data"] == {"2. Symbol": "IBM"}
+    assert requests_made == ["full"]
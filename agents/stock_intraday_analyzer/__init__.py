@@ -1,9 +1,153 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import requests
+from numpy.lib.stride_tricks import sliding_window_view
 from pydantic import BaseModel, Field, ValidationError, field_validator
-from typing import Optional
+from typing import Dict, List, Optional, Union
 from core.base import AgentBase
+from core import timeseries, transport
 from log import logger
 
+COMPACT_SIZE = 100      # Bars of a 'compact' Alpha Vantage response
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+DEFAULT_WINDOW = 20     # Bars covered by the rolling indicators
+EMA_BLOCK = 256         # Bars per vectorized EMA step; keeps decay powers within float range
+FETCH_WORKERS = 4       # Symbols loaded at once by ``analyze``
+
+
+def series_arrays(series: timeseries.Series) -> Dict[str, np.ndarray]:
+    """
+    Return the columns of a stored series as NumPy arrays, without copying them.
+
+    Returns:
+        Dict[str, np.ndarray]: ``timestamp`` (int64 seconds) and ``open``,
+        ``high``, ``low``, ``close`` and ``volume`` (float64).
+    """
+    arrays = {"timestamp": np.frombuffer(series.timestamps, dtype=np.int64)}
+    for name, values in series.columns.items():
+        arrays[name.split(". ", 1)[-1]] = np.frombuffer(values, dtype=np.float64)
+    return arrays
+
+
+def ema(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Exponential moving average with smoothing ``2 / (window + 1)``, seeded with the first value.
+
+    The recursion is unrolled per block of ``EMA_BLOCK`` values as
+    ``ema[t] = decay**t * (ema[0] + alpha * cumsum(x / decay**k)[t])``.
+    """
+    alpha = 2 / (window + 1)
+    decay = 1 - alpha
+    result = np.empty_like(values)
+    level = values[0] if len(values) else 0.0
+    for start in range(0, len(values), EMA_BLOCK):
+        block = values[start:start + EMA_BLOCK]
+        powers = decay ** np.arange(1, len(block) + 1)
+        result[start:start + len(block)] = powers * (level + alpha * np.cumsum(block / powers))
+        level = result[start + len(block) - 1]
+    return result
+
+
+def compute_indicators(bars: Dict[str, np.ndarray], window: int = DEFAULT_WINDOW) -> Dict[str, np.ndarray]:
+    """
+    Compute technical indicators over intraday bars, one value per bar.
+
+    Args:
+        bars (Dict[str, np.ndarray]): Columns as returned by ``series_arrays``.
+        window (int): Bars covered by the rolling indicators, at least 2.
+
+    Returns:
+        Dict[str, np.ndarray]: ``vwap`` (restarting every day), ``return`` over
+        ``window`` bars, ``volatility`` (standard deviation of the log returns
+        of the last ``window`` bars), ``sma``, ``ema`` and ``drawdown`` from
+        the running high. Bars without enough history hold NaN.
+    """
+    if window < 2:
+        raise ValueError("The indicator window must cover at least 2 bars.")
+    close, volume = bars["close"], bars["volume"]
+    count = len(close)
+
+    # VWAP: cumulative sums restarting at the first bar of every day.
+    day = bars["timestamp"] // 86400
+    starts = np.flatnonzero(np.diff(day, prepend=day[:1] - 1))
+    lengths = np.diff(np.append(starts, count))
+
+    def daily_cumsum(values):
+        total = np.cumsum(values)
+        return total - np.repeat(np.concatenate(([0.0], total[starts[1:] - 1])), lengths)
+
+    typical = (bars["high"] + bars["low"] + close) / 3
+    with np.errstate(invalid="ignore", divide="ignore"):
+        vwap = daily_cumsum(typical * volume) / daily_cumsum(volume)
+
+    returns = np.full(count, np.nan)
+    returns[window:] = close[window:] / close[:-window] - 1
+
+    volatility = np.full(count, np.nan)
+    if count > window:
+        log_returns = np.diff(np.log(close))
+        volatility[window:] = sliding_window_view(log_returns, window).std(axis=1, ddof=1)
+
+    sma = np.full(count, np.nan)
+    if count >= window:
+        sma[window - 1:] = sliding_window_view(close, window).mean(axis=1)
+
+    return {
+        "vwap": vwap,
+        "return": returns,
+        "volatility": volatility,
+        "sma": sma,
+        "ema": ema(close, window),
+        "drawdown": close / np.maximum.accumulate(close) - 1 if count else close,
+    }
+
+
+def _number(value):
+    return None if np.isnan(value) else round(float(value), 6)
+
+
+def summarize(series: timeseries.Series, window: int = DEFAULT_WINDOW, include_bars: bool = False) -> Dict:
+    """
+    Return the latest indicators of a series with its total return and maximum drawdown.
+
+    Args:
+        series (Series): Intraday bars.
+        window (int): Bars covered by the rolling indicators.
+        include_bars (bool): Also return every indicator for every bar.
+
+    Returns:
+        Dict: The summary, with None for values that need more bars.
+    """
+    if not len(series):
+        return {"bars": 0}
+    bars = series_arrays(series)
+    indicators = compute_indicators(bars, window)
+    close = bars["close"]
+    summary = {
+        "bars": len(series),
+        "first": timeseries.format_time(series.timestamps[0], TIME_FORMAT),
+        "last": timeseries.format_time(series.timestamps[-1], TIME_FORMAT),
+        "close": float(close[-1]),
+        **{name: _number(values[-1]) for name, values in indicators.items()},
+        "total_return": _number(close[-1] / close[0] - 1),
+        "max_drawdown": _number(indicators["drawdown"].min()),
+    }
+    if include_bars:
+        summary["timestamps"] = [timeseries.format_time(t, TIME_FORMAT) for t in series.timestamps]
+        summary["indicators"] = {name: [_number(v) for v in values] for name, values in indicators.items()}
+    return summary
+
+
+def _select(series: timeseries.Series, outputsize: str, start: Optional[str], end: Optional[str]) -> timeseries.Series:
+    """Return the bars of a series a request asks for."""
+    if start or end:
+        return series.between(timeseries.parse_time(start) if start else None,
+                              timeseries.parse_time(end, end=True) if end else None)
+    if outputsize == "compact":
+        return series.tail(COMPACT_SIZE)
+    return series
+
 
 class IntradayRequestModel(BaseModel):
     """Pydantic model for validating intraday request parameters."""
@@ -25,23 +169,143 @@ class StockDataFetcher(AgentBase):
     """Agent to fetch intraday stock data from Alpha Vantage."""
     BASE_URL = "https://www.alphavantage.co/query"
 
-    def execute(self, apikey: str, symbol: str, interval: str, outputsize: str = "compact", month: Optional[str] = None) -> str:
+    def execute(self, apikey: str, symbol: str, interval: str, outputsize: str = "compact", month: Optional[str] = None,
+                start: Optional[str] = None, end: Optional[str] = None, max_age: Optional[float] = None,
+                indicators: bool = False, window: int = DEFAULT_WINDOW) -> str:
         """
         Fetch intraday stock data based on the provided parameters.
 
+        Series are kept in the local series store (see ``core.timeseries``):
+        only the bars missing since the last call are downloaded, and at most
+        once every ``max_age`` seconds. Past months are downloaded once.
+
         Args:
             apikey (str): The API key for authentication.
-            symbol (str): The stock symbol (e.g., 'META').
+            symbol (str): The stock symbol (e.g., 'META'); with ``indicators``,
+                a comma-separated list of symbols.
             interval (str): The time interval between data points (e.g., '1min').
             outputsize (str): The size of the output data ('compact' or 'full').
             month (Optional[str]): The month to fetch data for (e.g., '2020-01').
+            start (Optional[str]): First date or date-time returned.
+            end (Optional[str]): Last date or date-time returned.
+            max_age (Optional[float]): Seconds stored data is served without checking
+                for new bars; one interval by default.
+            indicators (bool): Return the indicators of ``analyze`` instead of the bars.
+            window (int): Bars covered by the rolling indicators.
 
         Returns:
             str: JSON string containing stock data.
 
         Raises:
-            ValueError: If the request fails or the symbol is invalid.
+            ValueError: If the parameters are invalid, the request fails or the symbol is invalid.
+        """
+        self._validate(apikey, symbol, interval, outputsize, month)
+        if indicators:
+            return self.analyze(apikey, symbol.split(","), interval, outputsize=outputsize, month=month,
+                                start=start, end=end, max_age=max_age, window=window)
+        if timeseries.get_store() is None:
+            return self._fetch(apikey, symbol, interval, outputsize, month)
+
+        series, response = self._load_series(apikey, symbol, interval, outputsize, month, max_age)
+        if series is None:
+            return response  # Rate limit notes and other answers without a series
+        series = _select(series, outputsize, start, end)
+        return {"Meta Data": series.meta.get("source", {}),
+                f"Time Series ({interval})": series.to_records(TIME_FORMAT)}
+
+    def analyze(self, apikey: str, symbols: Union[str, List[str]], interval: str, outputsize: str = "compact",
+                month: Optional[str] = None, start: Optional[str] = None, end: Optional[str] = None,
+                max_age: Optional[float] = None, window: int = DEFAULT_WINDOW,
+                include_bars: bool = False) -> Dict[str, Dict]:
+        """
+        Compute VWAP, rolling return, volatility, SMA, EMA and drawdown for many symbols.
+
+        The bars of each symbol are converted once into NumPy arrays and every
+        indicator is computed over the whole array. Symbols are loaded
+        ``FETCH_WORKERS`` at a time; a symbol that fails holds an ``error``.
+
+        Args:
+            apikey (str): The API key for authentication.
+            symbols (Union[str, List[str]]): Stock symbols.
+            interval (str): The time interval between data points (e.g., '1min').
+            outputsize (str): 'compact' for the latest 100 bars or 'full'.
+            month (Optional[str]): The month to analyze (e.g., '2020-01').
+            start (Optional[str]): First date or date-time analyzed.
+            end (Optional[str]): Last date or date-time analyzed.
+            max_age (Optional[float]): See ``execute``.
+            window (int): Bars covered by the rolling indicators.
+            include_bars (bool): Also return every indicator for every bar.
+
+        Returns:
+            Dict[str, Dict]: The summary of ``summarize`` per symbol.
+
+        Raises:
+            ValueError: If the parameters are invalid.
+        """
+        symbols = [symbols] if isinstance(symbols, str) else symbols
+        symbols = list(dict.fromkeys(symbol.strip().upper() for symbol in symbols if symbol.strip()))
+        self._validate(apikey, ",".join(symbols), interval, outputsize, month)
+
+        def analyze_symbol(symbol):
+            try:
+                series, response = self._load_series(apikey, symbol, interval, outputsize, month, max_age)
+                if series is None:
+                    return {"error": str(next(iter(response.values()), "No data returned"))}
+                return summarize(_select(series, outputsize, start, end), window, include_bars)
+            except Exception as e:
+                logger.error(f"Failed to analyze {symbol}: {e}")
+                return {"error": str(e)}
+
+        with ThreadPoolExecutor(max_workers=max(1, min(FETCH_WORKERS, len(symbols)))) as pool:
+            results = dict(zip(symbols, pool.map(analyze_symbol, symbols)))
+        logger.info(f"Analyzed {len(symbols)} symbols.")
+        return results
+
+    @staticmethod
+    def _validate(apikey: str, symbol: str, interval: str, outputsize: str, month: Optional[str]):
+        """Raise a ValueError unless the parameters pass ``IntradayRequestModel``."""
+        try:
+            IntradayRequestModel(symbol=symbol, interval=interval, apikey=apikey, outputsize=outputsize, month=month)
+        except ValidationError as e:
+            logger.error(f"Input validation failed: {e}")
+            raise ValueError(f"Input validation failed: {e}") from e
+
+    def _load_series(self, apikey: str, symbol: str, interval: str, outputsize: str, month: Optional[str],
+                     max_age: Optional[float]):
         """
+        Return the bars of a symbol, through the series store when it is enabled.
+
+        Returns:
+            tuple: The ``Series``, or None, and the last Alpha Vantage answer, if any.
+        """
+        series_key = f"Time Series ({interval})"
+        if max_age is None:
+            past_month = month is not None and month < time.strftime("%Y-%m", time.gmtime())
+            max_age = float("inf") if past_month else int(interval[:-3]) * 60
+        responses = []
+
+        def fetch(full):
+            data = self._fetch(apikey, symbol, interval, "full" if full else "compact", month)
+            responses.append(data)
+            if series_key not in data:
+                return None
+            return data[series_key], {"source": data.get("Meta Data", {})}
+
+        # A month is downloaded whole: it costs one call either way.
+        full = outputsize == "full" or month is not None
+        store = timeseries.get_store()
+        if store is None:
+            fetched = fetch(full)
+            if fetched is None:
+                return None, responses[-1]
+            timestamps, columns, decimals = timeseries.from_records(fetched[0])
+            return timeseries.Series(timestamps, columns, {**fetched[1], "decimals": decimals}), responses[-1]
+        key = ("TIME_SERIES_INTRADAY", symbol.upper(), interval, month or "latest")
+        series = store.sync(key, fetch, max_age, full=full)
+        return series, responses[-1] if responses else None
+
+    def _fetch(self, apikey: str, symbol: str, interval: str, outputsize: str, month: Optional[str]):
+        """Download intraday stock data from Alpha Vantage."""
         params = {
             "function": "TIME_SERIES_INTRADAY",
             "symbol": symbol,
@@ -49,11 +313,13 @@ class StockDataFetcher(AgentBase):
             "outputsize": outputsize,
             "apikey": apikey,
         }
+        if month:
+            params["month"] = month
 
         logger.debug(f"Constructed URL with parameters: {params}")
 
         try:
-            response = requests.get(self.BASE_URL, params=params)
+            response = transport.get(self.BASE_URL, params=params)
             response.raise_for_status()
         except requests.RequestException as e:
             logger.error("Failed to fetch stock data. Please check the API or network.")
@@ -85,7 +351,8 @@ class StockDataFetcher(AgentBase):
                 apikey=apikey,
                 symbol="IBM",
                 interval="1min",
-                outputsize="compact"
+                outputsize="compact",
+                max_age=0
             )
             if "Time Series (1min)" in test_result:
                 return {"status": "healthy", "message": "Service is operational"}
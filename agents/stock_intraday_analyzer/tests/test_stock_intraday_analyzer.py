@@ -1,8 +1,17 @@
 import pytest # type: ignore
 from unittest.mock import patch, MagicMock
+from core import timeseries
 from agents.stock_intraday_analyzer import StockDataFetcher
 
 
+@pytest.fixture(autouse=True)
+def series_store(monkeypatch, tmp_path):
+    """Fixture keeping downloaded series in a temporary store instead of the working tree."""
+    store = timeseries.SeriesStore(str(tmp_path / "series"))
+    monkeypatch.setattr(timeseries, "_store", store)
+    return store
+
+
 # Mock data for a successful API response
 MOCK_SUCCESS_RESPONSE = {
     "Meta Data": {
@@ -30,7 +39,7 @@ MOCK_ERROR_RESPONSE = {
 }
 
 # Test the execute method for a successful response
-@patch("agents.stock_intraday_analyzer.requests.get")
+@patch("agents.stock_intraday_analyzer.transport.get")
 def test_execute_success(mock_get):
     # Mock the response object
     mock_response = MagicMock()
@@ -50,7 +59,7 @@ def test_execute_success(mock_get):
 
 
 # Test the execute method for an invalid symbol
-@patch("agents.stock_intraday_analyzer.requests.get")
+@patch("agents.stock_intraday_analyzer.transport.get")
 def test_execute_invalid_symbol(mock_get):
     # Mock the response object
     mock_response = MagicMock()
@@ -65,6 +74,18 @@ def test_execute_invalid_symbol(mock_get):
         fetcher.execute(apikey=api_key, symbol="INVALID_SYMBOL", interval="1min", outputsize="compact")
 
 
+# Test that an invalid interval is rejected before anything is fetched
+@patch("agents.stock_intraday_analyzer.transport.get")
+def test_execute_invalid_interval(mock_get):
+    fetcher = StockDataFetcher()
+
+    with pytest.raises(ValueError, match="Invalid interval: hourly"):
+        fetcher.execute(apikey="mock_api_key", symbol="META", interval="hourly")
+    with pytest.raises(ValueError, match="Invalid interval: hourly"):
+        fetcher.analyze("mock_api_key", ["META", "IBM"], "hourly")
+    mock_get.assert_not_called()
+
+
 # Test the health_check method for a healthy API
 @patch("agents.stock_intraday_analyzer.StockDataFetcher.execute")
 def test_health_check_success(mock_execute):
@@ -93,3 +114,40 @@ def test_health_check_failure(mock_execute):
     # Assertions
     assert health["status"] == "unhealthy"
     assert "Failed to fetch stock data" in health["message"]
+
+
+# Test the indicators computed for several symbols in one call
+@patch("agents.stock_intraday_analyzer.transport.get")
+def test_analyze_many_symbols(mock_get):
+    closes = [10.0, 11.0, 12.0, 9.0, 13.0]
+    bars = {
+        f"2020-01-31 10:0{i}:00": {"1. open": f"{c:.4f}", "2. high": f"{c:.4f}", "3. low": f"{c:.4f}",
+                                   "4. close": f"{c:.4f}", "5. volume": "100"}
+        for i, c in enumerate(closes)
+    }
+
+    def respond(url, params):
+        mock_response = MagicMock()
+        if params["symbol"] == "META":
+            mock_response.json.return_value = {"Meta Data": {}, "Time Series (1min)": bars}
+        else:
+            mock_response.json.return_value = {"Note": "API call frequency exceeded"}
+        return mock_response
+
+    mock_get.side_effect = respond
+
+    fetcher = StockDataFetcher()
+    results = fetcher.execute(apikey="mock_api_key", symbol="meta, IBM", interval="1min", indicators=True, window=2)
+
+    meta = results["META"]
+    assert (meta["bars"], meta["first"], meta["close"]) == (5, "2020-01-31 10:00:00", 13.0)
+    assert meta["vwap"] == 11.0
+    assert meta["sma"] == 11.0
+    assert meta["return"] == round(13.0 / 12.0 - 1, 6)
+    assert meta["max_drawdown"] == -0.25
+    assert meta["total_return"] == 0.3
+    assert results["IBM"] == {"error": "API call frequency exceeded"}
+
+    detailed = fetcher.analyze("mock_api_key", ["META"], "1min", window=3, include_bars=True)["META"]
+    assert detailed["indicators"]["sma"][:3] == [None, None, 11.0]
+    assert detailed["indicators"]["ema"][:2] == [10.0, 10.5]
@@ -1,14 +1,23 @@
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, List, Dict, Any
+import pandas as pd
 from pydantic import BaseModel, Field, ValidationError
 from core.base import AgentBase
+from core.cache import MISS, MemoryCache
 from log import logger
 import yfinance as yf
 
+MAX_TICKERS = 500     # Largest watchlist one request may analyze
+INFO_WORKERS = 8      # Concurrent ``Ticker.info`` lookups
+INFO_TTL = 3600       # Seconds a ticker's company info is reused
+
+_info_cache = MemoryCache(max_entries=MAX_TICKERS * 4)
+
 
 class TickerRequest(BaseModel):
     """Model for ticker request inputs."""
     stock_tickers: str
-    max_tickers: int = Field(5, ge=1, le=10, description="Maximum number of tickers to analyze")
+    max_tickers: int = Field(5, ge=1, le=MAX_TICKERS, description="Maximum number of tickers to analyze")
     start_date: Optional[str] = None
     end_date: Optional[str] = None
 
@@ -48,8 +57,7 @@ class TickerAgent(AgentBase):
             if not tickers:
                 raise ValueError("No valid stock tickers provided.")
 
-            # Analyze each ticker
-            ticker_results = [self._analyze_single_ticker(ticker, request.start_date, request.end_date) for ticker in tickers]
+            ticker_results = self._analyze_tickers(tickers, request.start_date, request.end_date)
 
             # Log results as JSON
             logger.info("Ticker analysis completed.")
@@ -63,44 +71,101 @@ class TickerAgent(AgentBase):
             logger.error(f"Ticker analysis failed: {e}")
             raise ValueError(f"Failed to analyze tickers: {e}") from e
 
-    def _analyze_single_ticker(self, ticker: str, start_date: Optional[str], end_date: Optional[str]) -> TickerData:
+    def _analyze_tickers(self, tickers: List[str], start_date: Optional[str],
+                         end_date: Optional[str]) -> List[TickerData]:
         """
-        Analyze a single ticker and return its data.
+        Analyze tickers with one bulk price download and concurrent company lookups.
+
+        A failed download leaves the prices of every ticker empty, with the
+        failure as the ticker's error.
 
         Args:
-            ticker (str): Ticker symbol.
+            tickers (List[str]): Ticker symbols.
             start_date (Optional[str]): Start date for historical data.
             end_date (Optional[str]): End date for historical data.
 
         Returns:
-            TickerData: Analyzed ticker data model.
+            List[TickerData]: Analyzed ticker data, in the order of ``tickers``.
         """
+        unique = list(dict.fromkeys(tickers))
         try:
-            stock = yf.Ticker(ticker)
-            hist = stock.history(start=start_date, end=end_date, period="2d")
-
-            current_price = hist['Close'][-1] if not hist.empty else None
-            previous_close = hist['Close'][-2] if len(hist) > 1 else None
-            price_change_percent = (
-                ((current_price - previous_close) / previous_close) * 100
-                if current_price and previous_close else None
-            )
-
-            info = stock.info
-            return TickerData(
-                ticker=ticker,
-                current_price=current_price,
-                previous_close=previous_close,
-                price_change_percent=round(price_change_percent, 2) if price_change_percent else None,
-                company_name=info.get("longName", "N/A"),
-                sector=info.get("sector", "N/A"),
-                market_cap=info.get("marketCap"),
-                pe_ratio=info.get("trailingPE"),
-                dividend_yield=info.get("dividendYield")
-            )
+            prices, price_error = self._fetch_prices(unique, start_date, end_date), None
         except Exception as e:
-            logger.error(f"Error analyzing ticker {ticker}: {e}")
-            return TickerData(ticker=ticker, error=str(e))
+            # Report the failed download on every ticker rather than failing the request.
+            logger.error(f"Price download failed: {e}")
+            prices, price_error = {ticker: {} for ticker in unique}, f"Price download failed: {e}"
+        with ThreadPoolExecutor(max_workers=min(INFO_WORKERS, len(unique))) as pool:
+            infos = dict(zip(unique, pool.map(self._fetch_info, unique)))
+
+        results = {}
+        for ticker in unique:
+            info = infos[ticker]
+            if isinstance(info, Exception):
+                logger.error(f"Error analyzing ticker {ticker}: {info}")
+                results[ticker] = TickerData(ticker=ticker, error=str(info))
+                continue
+            try:
+                results[ticker] = TickerData(
+                    ticker=ticker,
+                    **prices[ticker],
+                    company_name=info.get("longName", "N/A"),
+                    sector=info.get("sector", "N/A"),
+                    market_cap=info.get("marketCap"),
+                    pe_ratio=info.get("trailingPE"),
+                    dividend_yield=info.get("dividendYield"),
+                    error=price_error
+                )
+            except Exception as e:
+                logger.error(f"Error analyzing ticker {ticker}: {e}")
+                results[ticker] = TickerData(ticker=ticker, error=str(e))
+        return [results[ticker] for ticker in tickers]
+
+    @staticmethod
+    def _fetch_prices(tickers: List[str], start_date: Optional[str],
+                      end_date: Optional[str]) -> Dict[str, Dict[str, Optional[float]]]:
+        """
+        Download the closes of every ticker at once and compute their change column-wise.
+
+        Returns:
+            Dict[str, Dict[str, Optional[float]]]: ``current_price``, ``previous_close``
+            and ``price_change_percent`` of every ticker.
+        """
+        data = yf.download(tickers, start=start_date, end=end_date, period="2d",
+                           progress=False, auto_adjust=True)
+        close = data["Close"] if data is not None and not data.empty else pd.DataFrame()
+        if isinstance(close, pd.Series):
+            close = close.to_frame(tickers[0])
+        close = close.reindex(columns=tickers)
+
+        # Rank the valid closes of each column from the latest, so tickers
+        # trading on different calendars each get their own last two closes.
+        valid = close.notna()
+        rank = valid[::-1].cumsum()[::-1].where(valid)
+        current = close.where(rank == 1).max()
+        previous = close.where(rank == 2).max()
+        change = (current - previous) / previous * 100
+        # A flat price has no reported change, as for a missing one.
+        change = change.where((current != 0) & (previous != 0) & (change != 0)).round(2)
+
+        def value(series, ticker):
+            return None if pd.isna(series[ticker]) else float(series[ticker])
+
+        return {ticker: {"current_price": value(current, ticker),
+                         "previous_close": value(previous, ticker),
+                         "price_change_percent": value(change, ticker)}
+                for ticker in tickers}
+
+    @staticmethod
+    def _fetch_info(ticker: str):
+        """Return the company info of a ticker, cached for ``INFO_TTL`` seconds, or the exception raised."""
+        info = _info_cache.get(ticker)
+        if info is MISS:
+            try:
+                info = yf.Ticker(ticker).info
+            except Exception as e:
+                return e
+            _info_cache.set(ticker, info, INFO_TTL)
+        return info
 
     def health_check(self) -> Dict[str, str]:
         """
@@ -58,3 +58,61 @@ def test_health_check_unhealthy(ticker_agent, mock_yfinance):
     request = {"stock_tickers": "", "max_tickers": 1}
     with pytest.raises(ValueError, match="No valid stock tickers provided."):
         ticker_agent.execute(request)
+
+
+def test_bulk_download_computes_changes_per_ticker(monkeypatch):
+    """Test that one bulk download serves every ticker and company info is fetched once per ticker."""
+    import pandas as pd
+    import agents.ticker as ticker_module
+
+    index = pd.to_datetime(["2024-01-02", "2024-01-03", "2024-01-04"])
+    close = pd.DataFrame({"AAPL": [100.0, 110.0, float("nan")], "MSFT": [50.0, 50.0, 55.0],
+                          "BAD": [float("nan")] * 3}, index=index)
+    downloads = []
+
+    def fake_download(tickers, **kwargs):
+        downloads.append(list(tickers))
+        return pd.concat({"Close": close[tickers]}, axis=1)
+
+    class FakeTicker:
+        def __init__(self, symbol):
+            self.symbol = symbol
+
+        @property
+        def info(self):
+            if self.symbol == "BAD":
+                raise ValueError("Unknown ticker")
+            return {"longName": f"{self.symbol} Inc.", "marketCap": 1000}
+
+    monkeypatch.setattr(ticker_module.yf, "download", fake_download)
+    monkeypatch.setattr(ticker_module.yf, "Ticker", FakeTicker)
+    monkeypatch.setattr(ticker_module, "_info_cache", ticker_module.MemoryCache())
+
+    results = ticker_module.TickerAgent().execute({"stock_tickers": "aapl, MSFT, BAD, AAPL", "max_tickers": 4})
+    assert downloads == [["AAPL", "MSFT", "BAD"]]
+    assert [r["ticker"] for r in results] == ["AAPL", "MSFT", "BAD", "AAPL"]
+    assert (results[0]["current_price"], results[0]["previous_close"]) == (110.0, 100.0)
+    assert results[0]["price_change_percent"] == 10.0
+    assert results[0]["company_name"] == "AAPL Inc."
+    assert results[1]["price_change_percent"] == 10.0
+    assert results[2]["error"] == "Unknown ticker"
+
+
+def test_failed_download_is_reported_per_ticker(monkeypatch):
+    """Test that a failed bulk download becomes an error on each ticker instead of failing the request."""
+    import agents.ticker as ticker_module
+
+    def failing_download(tickers, **kwargs):
+        raise ConnectionError("rate limited")
+
+    class FakeTicker:
+        def __init__(self, symbol):
+            self.info = {"longName": f"{symbol} Inc."}
+
+    monkeypatch.setattr(ticker_module.yf, "download", failing_download)
+    monkeypatch.setattr(ticker_module.yf, "Ticker", FakeTicker)
+    monkeypatch.setattr(ticker_module, "_info_cache", ticker_module.MemoryCache())
+
+    results = ticker_module.TickerAgent().execute({"stock_tickers": "AAPL,MSFT", "max_tickers": 2})
+    assert [r["company_name"] for r in results] == ["AAPL Inc.", "MSFT Inc."]
+    assert all(r["current_price"] is None and r["error"] == "Price download failed: rate limited" for r in results)
@@ -42,12 +42,12 @@ class TranslatorAgent(AgentBase):
             }
 
             translation_json = json.dumps(translation_result)
-            print(translation_json)
+            logger.info(f"Translation result: {translation_json}")
 
             return translation_result
 
         except Exception as e:
-            print(f"Translation error: {e}")
+            logger.error(f"Translation error: {e}")
             raise ValueError(f"Failed to translate text. {str(e)}") from e
         
 
@@ -1,6 +1,6 @@
-import http.client
 import json
 from core.base import AgentBase
+from core import transport
 from log import logger
 
 class TwitterHashtagAgent(AgentBase):
@@ -131,7 +131,7 @@ Media:
             logger.info(f"Fetching tweets for hashtag: {hashtag}")
 
             # Making the request
-            conn = http.client.HTTPSConnection(self.base_url)
+            conn = transport.PooledConnection(self.base_url)
             conn.request("POST", "/hashtag/hashtag", payload, headers)
             
             response = conn.getresponse()
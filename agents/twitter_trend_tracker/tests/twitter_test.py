@@ -106,7 +106,7 @@ def test_execute_success(twitter_agent, mock_tweet_data):
     mock_response = MockResponse(200, mock_tweet_data)
     mock_conn = MockConnection(mock_response)
     
-    with patch('http.client.HTTPSConnection', return_value=mock_conn):
+    with patch('core.transport.PooledConnection', return_value=mock_conn):
         result = twitter_agent.execute(
             hashtag="test",
             api_key="test_api_key"
@@ -142,7 +142,7 @@ def test_execute_api_error(twitter_agent):
     mock_response = MockResponse(400, {"error": "Bad Request"})
     mock_conn = MockConnection(mock_response)
     
-    with patch('http.client.HTTPSConnection', return_value=mock_conn):
+    with patch('core.transport.PooledConnection', return_value=mock_conn):
         result = twitter_agent.execute(
             hashtag="test",
             api_key="test_api_key"
@@ -157,7 +157,7 @@ def test_execute_with_custom_parameters(twitter_agent, mock_tweet_data):
     mock_response = MockResponse(200, mock_tweet_data)
     mock_conn = MockConnection(mock_response)
     
-    with patch('http.client.HTTPSConnection', return_value=mock_conn):
+    with patch('core.transport.PooledConnection', return_value=mock_conn):
         twitter_agent.execute(
             hashtag="test",
             api_key="test_api_key",
@@ -176,7 +176,7 @@ def test_health_check_success(twitter_agent, mock_tweet_data):
     mock_response = MockResponse(200, mock_tweet_data)
     mock_conn = MockConnection(mock_response)
     
-    with patch('http.client.HTTPSConnection', return_value=mock_conn):
+    with patch('core.transport.PooledConnection', return_value=mock_conn):
         result = twitter_agent.health_check()
     
     assert result["status"] == "healthy"
@@ -195,7 +195,7 @@ def test_health_check_failure(twitter_agent):
     mock_response = MockResponse(500, {"error": "Internal Server Error"})
     mock_conn = MockConnection(mock_response)
     
-    with patch('http.client.HTTPSConnection', return_value=mock_conn):
+    with patch('core.transport.PooledConnection', return_value=mock_conn):
         result = twitter_agent.health_check()
     
     assert result["status"] == "unhealthy"
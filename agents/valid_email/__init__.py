@@ -1,5 +1,5 @@
-import requests
 from core.base import AgentBase
+from core import transport
 from log import logger
 
 class EmailValidationAgent(AgentBase):
@@ -29,7 +29,7 @@ class EmailValidationAgent(AgentBase):
                 raise ValueError("Missing email parameter. Provide a valid email.")
 
             logger.info(f"Validating email via API: {email}")
-            response = requests.get(
+            response = transport.get(
                 f"{self.API_URL}?email={email}",
                 headers={"X-Api-Key": api_key}
             )
@@ -64,7 +64,7 @@ class EmailValidationAgent(AgentBase):
             dummy_key = "test_key_should_fail"
             logger.info("Performing health check...")
 
-            response = requests.get(
+            response = transport.get(
                 f"{self.API_URL}?email={test_email}",
                 headers={"X-Api-Key": dummy_key}
             )
@@ -1,6 +1,7 @@
 import pytest
 from agents.valid_email import EmailValidationAgent
 import requests
+from core import transport
 from unittest.mock import MagicMock
 
 
@@ -21,7 +22,7 @@ def test_execute_valid_email(monkeypatch, email_agent):
         "local_part": "info"
     }
 
-    monkeypatch.setattr(requests, "get", lambda *args, **kwargs: mock_response)
+    monkeypatch.setattr(transport, "get", lambda *args, **kwargs: mock_response)
 
     result = email_agent.execute("info@example.com", "fake_api_key")
     assert result["status"] == "success"
@@ -37,7 +38,7 @@ def test_execute_invalid_email(monkeypatch, email_agent):
         "email": "45645y.in"
     }
 
-    monkeypatch.setattr(requests, "get", lambda *args, **kwargs: mock_response)
+    monkeypatch.setattr(transport, "get", lambda *args, **kwargs: mock_response)
 
     result = email_agent.execute("45645y.in", "fake_api_key")
     assert result["status"] == "success"
@@ -62,7 +63,7 @@ def test_execute_invalid_api_key(monkeypatch, email_agent):
     mock_response.status_code = 401
     mock_response.text = "Unauthorized"
 
-    monkeypatch.setattr(requests, "get", lambda *args, **kwargs: mock_response)
+    monkeypatch.setattr(transport, "get", lambda *args, **kwargs: mock_response)
 
     with pytest.raises(ValueError, match="Unauthorized: Invalid API key."):
         email_agent.execute("info@example.com", "invalid_key")
@@ -73,7 +74,7 @@ def test_health_check_success(monkeypatch, email_agent):
     mock_response = MagicMock()
     mock_response.status_code = 401  # Still considered reachable
 
-    monkeypatch.setattr(requests, "get", lambda *args, **kwargs: mock_response)
+    monkeypatch.setattr(transport, "get", lambda *args, **kwargs: mock_response)
 
     result = email_agent.health_check()
     assert result["status"] == "healthy"
@@ -85,7 +86,7 @@ def test_health_check_failure(monkeypatch, email_agent):
     def raise_error(*args, **kwargs):
         raise Exception("Service unavailable")
 
-    monkeypatch.setattr(requests, "get", raise_error)
+    monkeypatch.setattr(transport, "get", raise_error)
 
     result = email_agent.health_check()
     assert result["status"] == "unhealthy"
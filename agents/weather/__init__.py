@@ -1,7 +1,7 @@
-import requests
 from typing import Dict, Any, Optional
 from log import logger
 from core.base import AgentBase
+from core import transport
 
 class WeatherAgent(AgentBase):
     """Agent to fetch weather data using the Open Weather API from RapidAPI."""
@@ -31,82 +31,99 @@ class WeatherAgent(AgentBase):
             dict: A dictionary containing the weather data or an error message.
         """
         try:
-            api_key = kwargs.get('api_key', self.api_key)
-            
-            if not api_key:
-                raise ValueError("API key must be provided")
-            
-            city = kwargs.get('city', '').strip()
-            country_code = kwargs.get('country_code', '').strip()
-            
-            if not city:
-                raise ValueError("City name cannot be empty")
-            
-            logger.info(f"Fetching weather for city: {city}")
-            
-            # Prepare request headers
-            headers = {
-                'x-rapidapi-key': api_key,
-                'x-rapidapi-host': self.host
-            }
-            
-            # Prepare URL
-            if country_code:
-                url = f"{self.base_url}/city/{city}/{country_code}"
-            else:
-                url = f"{self.base_url}/city/{city}"
-            
-            # Make API request
-            logger.info(f"Making request to {url}")
-            response = requests.get(url, headers=headers)
-            
-            # Handle API response
-            if response.status_code == 200:
-                weather_data = response.json()
-                
-                # Transform to a cleaner format
-                result = {
-                    "location": {
-                        "name": city,
-                        "country": country_code or weather_data.get("sys", {}).get("country", "Unknown")
-                    },
-                    "temperature": {
-                        "current": weather_data.get("main", {}).get("temp"),
-                        "feels_like": weather_data.get("main", {}).get("feels_like"),
-                        "min": weather_data.get("main", {}).get("temp_min"),
-                        "max": weather_data.get("main", {}).get("temp_max")
-                    },
-                    "weather": {
-                        "description": weather_data.get("weather", [{}])[0].get("description", "Unknown"),
-                        "main": weather_data.get("weather", [{}])[0].get("main", "Unknown"),
-                        "icon": weather_data.get("weather", [{}])[0].get("icon")
-                    },
-                    "wind": {
-                        "speed": weather_data.get("wind", {}).get("speed"),
-                        "direction": weather_data.get("wind", {}).get("deg")
-                    },
-                    "humidity": weather_data.get("main", {}).get("humidity"),
-                    "pressure": weather_data.get("main", {}).get("pressure"),
-                    "clouds": weather_data.get("clouds", {}).get("all"),
-                    "visibility": weather_data.get("visibility")
-                }
-                
-                logger.info("Successfully fetched weather information")
-                return result
-            else:
-                error_msg = f"API request failed with status code {response.status_code}"
-                try:
-                    error_data = response.json()
-                    if 'message' in error_data:
-                        error_msg = f"API error: {error_data['message']}"
-                except:
-                    pass
-                logger.error(error_msg)
-                return {"error": error_msg, "status": "failed"}
-                
+            url, headers, city, country_code = self._prepare_request(kwargs)
+            return self._parse_response(transport.get(url, headers=headers), city, country_code)
         except Exception as e:
             logger.error(f"An error occurred while fetching weather: {e}")
             return {"error": str(e), "status": "failed"}
+
+    async def aexecute(self, **kwargs) -> Dict[str, Any]:
+        """
+        Fetch weather details for the specified city without blocking the event loop.
+
+        Takes the same arguments and returns the same result as ``execute``.
+        """
+        try:
+            url, headers, city, country_code = self._prepare_request(kwargs)
+            return self._parse_response(await transport.aget(url, headers=headers), city, country_code)
+        except Exception as e:
+            logger.error(f"An error occurred while fetching weather: {e}")
+            return {"error": str(e), "status": "failed"}
+
+    def _prepare_request(self, kwargs):
+        """Validate the arguments and return the request URL, headers, city and country code."""
+        api_key = kwargs.get('api_key', self.api_key)
+        
+        if not api_key:
+            raise ValueError("API key must be provided")
+        
+        city = kwargs.get('city', '').strip()
+        country_code = kwargs.get('country_code', '').strip()
+        
+        if not city:
+            raise ValueError("City name cannot be empty")
+        
+        logger.info(f"Fetching weather for city: {city}")
+        
+        # Prepare request headers
+        headers = {
+            'x-rapidapi-key': api_key,
+            'x-rapidapi-host': self.host
+        }
+        
+        # Prepare URL
+        if country_code:
+            url = f"{self.base_url}/city/{city}/{country_code}"
+        else:
+            url = f"{self.base_url}/city/{city}"
+        
+        logger.info(f"Making request to {url}")
+        return url, headers, city, country_code
+
+    def _parse_response(self, response, city, country_code):
+        """Turn an API response into the weather result or an error result."""
+        if response.status_code == 200:
+            weather_data = response.json()
+            
+            # Transform to a cleaner format
+            result = {
+                "location": {
+                    "name": city,
+                    "country": country_code or weather_data.get("sys", {}).get("country", "Unknown")
+                },
+                "temperature": {
+                    "current": weather_data.get("main", {}).get("temp"),
+                    "feels_like": weather_data.get("main", {}).get("feels_like"),
+                    "min": weather_data.get("main", {}).get("temp_min"),
+                    "max": weather_data.get("main", {}).get("temp_max")
+                },
+                "weather": {
+                    "description": weather_data.get("weather", [{}])[0].get("description", "Unknown"),
+                    "main": weather_data.get("weather", [{}])[0].get("main", "Unknown"),
+                    "icon": weather_data.get("weather", [{}])[0].get("icon")
+                },
+                "wind": {
+                    "speed": weather_data.get("wind", {}).get("speed"),
+                    "direction": weather_data.get("wind", {}).get("deg")
+                },
+                "humidity": weather_data.get("main", {}).get("humidity"),
+                "pressure": weather_data.get("main", {}).get("pressure"),
+                "clouds": weather_data.get("clouds", {}).get("all"),
+                "visibility": weather_data.get("visibility")
+            }
+            
+            logger.info("Successfully fetched weather information")
+            return result
+        else:
+            error_msg = f"API request failed with status code {response.status_code}"
+            try:
+                error_data = response.json()
+                if 'message' in error_data:
+                    error_msg = f"API error: {error_data['message']}"
+            except:
+                pass
+            logger.error(error_msg)
+            return {"error": error_msg, "status": "failed"}
     
     def health_check(self) -> Dict[str, str]:
         """
@@ -128,7 +145,7 @@ class WeatherAgent(AgentBase):
             }
             
             test_url = f"{self.base_url}/city/london/GB"
-            response = requests.get(test_url, headers=headers)
+            response = transport.get(test_url, headers=headers)
             
             if response.status_code == 200:
                 logger.info("Open Weather API health check passed")
@@ -1,6 +1,8 @@
+import asyncio
 import pytest
 import requests
-from unittest.mock import Mock, patch
+from core import transport
+from unittest.mock import AsyncMock, Mock, patch
 from agents.weather import WeatherAgent
 
 @pytest.fixture
@@ -42,7 +44,7 @@ def mock_weather_response():
 def weather_agent(monkeypatch, mock_weather_response):
     """Fixture to initialize WeatherAgent with mocked requests."""
     agent = WeatherAgent(api_key="test_api_key")
-    monkeypatch.setattr(requests, "get", Mock(return_value=mock_weather_response))
+    monkeypatch.setattr(transport, "get", Mock(return_value=mock_weather_response))
     return agent
 
 def test_execute_success(weather_agent):
@@ -55,6 +57,15 @@ def test_execute_success(weather_agent):
     assert result["weather"]["description"] == "scattered clouds"
     assert result["humidity"] == 65
 
+def test_aexecute_matches_execute(weather_agent, monkeypatch, mock_weather_response):
+    """The async path sends the same request and returns the same result."""
+    aget = AsyncMock(return_value=mock_weather_response)
+    monkeypatch.setattr(transport, "aget", aget)
+    result = asyncio.run(weather_agent.aexecute(city="London", country_code="GB"))
+
+    assert result == weather_agent.execute(city="London", country_code="GB")
+    assert aget.call_args == transport.get.call_args
+
 def test_execute_empty_city(weather_agent):
     """Test execution with empty city."""
     result = weather_agent.execute(city="", country_code="GB")
@@ -66,7 +77,7 @@ def test_execute_empty_city(weather_agent):
 def test_execute_missing_api_key(monkeypatch, mock_weather_response):
     """Test execution with missing API key."""
     agent = WeatherAgent()  # No API key provided
-    monkeypatch.setattr(requests, "get", Mock(return_value=mock_weather_response))
+    monkeypatch.setattr(transport, "get", Mock(return_value=mock_weather_response))
     
     result = agent.execute(city="London", country_code="GB")
     
@@ -79,7 +90,7 @@ def test_execute_api_error(weather_agent, monkeypatch):
     mock_error_response = Mock()
     mock_error_response.status_code = 404
     mock_error_response.json.return_value = {"message": "City not found"}
-    monkeypatch.setattr(requests, "get", Mock(return_value=mock_error_response))
+    monkeypatch.setattr(transport, "get", Mock(return_value=mock_error_response))
     
     result = weather_agent.execute(city="NonExistentCity", country_code="XX")
     
@@ -92,7 +103,7 @@ def test_execute_request_exception(weather_agent, monkeypatch):
     def mock_request(*args, **kwargs):
         raise requests.RequestException("Connection error")
     
-    monkeypatch.setattr(requests, "get", mock_request)
+    monkeypatch.setattr(transport, "get", mock_request)
     
     result = weather_agent.execute(city="London", country_code="GB")
     
@@ -112,7 +123,7 @@ def test_health_check_failure(weather_agent, monkeypatch):
     def mock_request(*args, **kwargs):
         raise requests.RequestException("Service unavailable")
     
-    monkeypatch.setattr(requests, "get", mock_request)
+    monkeypatch.setattr(transport, "get", mock_request)
     
     health = weather_agent.health_check()
     
@@ -124,7 +135,7 @@ def test_health_check_api_error(weather_agent, monkeypatch):
     mock_error_response = Mock()
     mock_error_response.status_code = 401
     mock_error_response.json.return_value = {"message": "Invalid API key"}
-    monkeypatch.setattr(requests, "get", Mock(return_value=mock_error_response))
+    monkeypatch.setattr(transport, "get", Mock(return_value=mock_error_response))
     
     health = weather_agent.health_check()
     
@@ -138,7 +149,7 @@ def test_execute_invalid_location(weather_agent, monkeypatch):
     mock_error_response = Mock()
     mock_error_response.status_code = 404
     mock_error_response.json.return_value = {"message": "City not found"}
-    monkeypatch.setattr(requests, "get", Mock(return_value=mock_error_response))
+    monkeypatch.setattr(transport, "get", Mock(return_value=mock_error_response))
     
     # Test with invalid city
     result = weather_agent.execute(city="NonExistentCity", country_code="IN")
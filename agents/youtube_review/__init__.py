@@ -1,9 +1,31 @@
 import json
-from itertools import islice
+import os
 from core.base import AgentBase
 from log import logger
 from youtube_comment_downloader import YoutubeCommentDownloader
 
+CHECKPOINT_EVERY = 100  # Comments between two checkpoint writes
+
+
+def _load_checkpoint(path, video_url):
+    """Return the saved progress of a pull, or a fresh one when there is none."""
+    if not path or not os.path.exists(path):
+        return {"video_url": video_url, "emitted": 0, "last_cid": None, "done": False}
+    with open(path, encoding="utf-8") as f:
+        state = json.load(f)
+    if state.get("video_url") != video_url:
+        raise ValueError(f"Checkpoint {path} belongs to {state.get('video_url')}, not {video_url}")
+    return state
+
+
+def _save_checkpoint(path, state):
+    """Write the progress of a pull atomically."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
+
+
 class YoutubeReviewAgent(AgentBase):
     """Agent to fetch YouTube comments."""
 
@@ -21,19 +43,66 @@ class YoutubeReviewAgent(AgentBase):
         Raises:
             ValueError: If the URL is invalid or comments cannot be fetched.
         """
-        try:
+        comments = list(self.stream(video_url, max_comments=max_comments))
+        logger.info(f"Fetched {len(comments)} comments.")
+        return comments
+
+    def stream(self, video_url, max_comments=None, checkpoint=None):
+        """
+        Yield comments from a YouTube video as the downloader fetches them.
+
+        Only the current page of comments is held in memory. With a
+        ``checkpoint`` file, the number of comments emitted and the id of the
+        last one are saved every ``CHECKPOINT_EVERY`` comments and when the
+        stream stops; a later call with the same file resumes after that
+        comment. A comment counts as emitted once the consumer asks for the
+        next one, so an interrupted pull repeats at most the comment it was
+        handling.
+
+        Args:
+            video_url (str): The URL of the YouTube video.
+            max_comments (int, optional): Maximum number of comments of the whole pull,
+                including those emitted before a resume. Unlimited by default.
+            checkpoint (str, optional): Path of the checkpoint file.
+
+        Yields:
+            dict: Comment data.
+
+        Raises:
+            ValueError: If the URL is invalid, comments cannot be fetched or the
+                checkpoint belongs to another video.
+        """
+        state = _load_checkpoint(checkpoint, video_url)
+        if state["done"] or (max_comments is not None and state["emitted"] >= max_comments):
+            return
+        skipping = state["last_cid"] is not None
+        if skipping:
+            logger.info(f"Resuming after {state['emitted']} comments from video: {video_url}")
+        else:
             logger.info(f"Fetching comments from video: {video_url}")
-            downloader = YoutubeCommentDownloader()
-            comments = downloader.get_comments_from_url(video_url)
-            limited_comments = list(islice(comments, max_comments))
-                        # Convert the list of comments to a JSON-formatted string
-            comments_json = json.dumps(limited_comments, indent=4)
-            #Log the JSON-formatted comments
-            print(comments_json)
-            return limited_comments
+        try:
+            comments = YoutubeCommentDownloader().get_comments_from_url(video_url)
+            for comment in comments:
+                if skipping:
+                    # The downloader cannot restart mid-thread; fetched pages are replayed up to the last comment.
+                    skipping = comment.get("cid") != state["last_cid"]
+                    continue
+                yield comment
+                state["emitted"] += 1
+                state["last_cid"] = comment.get("cid")
+                if checkpoint and state["emitted"] % CHECKPOINT_EVERY == 0:
+                    _save_checkpoint(checkpoint, state)
+                if max_comments is not None and state["emitted"] >= max_comments:
+                    return
+            if skipping:
+                logger.warning(f"Comment {state['last_cid']} of the checkpoint is gone; nothing left to resume.")
+            state["done"] = True
         except Exception as e:
             logger.error(f"An error occurred: {e}")
             raise ValueError("Failed to fetch comments. Please check the video URL and try again.") from e
+        finally:
+            if checkpoint:
+                _save_checkpoint(checkpoint, state)
 
     def health_check(self):
         """
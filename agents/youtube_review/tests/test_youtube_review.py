@@ -58,3 +58,45 @@ def test_health_check_failure(monkeypatch):
     assert health["status"] == "unhealthy", "Expected health status to be 'unhealthy'."
     assert "Mock service failure" in health["message"], "Expected failure message in health check."
 
+
+
+class ManyCommentsDownloader:
+    """Mock downloader yielding numbered comments and counting how many were produced."""
+    produced = 0
+
+    def get_comments_from_url(self, url, sort_by=None):
+        for i in range(5):
+            ManyCommentsDownloader.produced += 1
+            yield {"cid": f"c{i}", "text": f"Comment {i}"}
+
+
+def test_stream_is_lazy_and_resumes_from_checkpoint(monkeypatch, tmp_path):
+    """Test that streaming fetches comments on demand and resumes after the checkpointed one."""
+    monkeypatch.setattr("agents.youtube_review.YoutubeCommentDownloader", ManyCommentsDownloader)
+    ManyCommentsDownloader.produced = 0
+    checkpoint = str(tmp_path / "checkpoint.json")
+    agent = YoutubeReviewAgent()
+    video_url = "https://www.youtube.com/watch?v=valid123"
+
+    stream = agent.stream(video_url, checkpoint=checkpoint)
+    assert [next(stream)["cid"], next(stream)["cid"]] == ["c0", "c1"]
+    assert ManyCommentsDownloader.produced == 2
+    stream.close()  # Interrupted while handling c1
+
+    resumed = [comment["cid"] for comment in agent.stream(video_url, checkpoint=checkpoint)]
+    assert resumed == ["c1", "c2", "c3", "c4"]
+    assert list(agent.stream(video_url, checkpoint=checkpoint)) == []
+
+    with pytest.raises(ValueError, match="belongs to"):
+        list(agent.stream("https://www.youtube.com/watch?v=other", checkpoint=checkpoint))
+
+
+def test_stream_limits_the_whole_pull(monkeypatch, tmp_path):
+    """Test that max_comments counts the comments emitted before a resume."""
+    monkeypatch.setattr("agents.youtube_review.YoutubeCommentDownloader", ManyCommentsDownloader)
+    checkpoint = str(tmp_path / "checkpoint.json")
+    agent = YoutubeReviewAgent()
+    video_url = "https://www.youtube.com/watch?v=valid123"
+
+    assert [c["cid"] for c in agent.stream(video_url, max_comments=2, checkpoint=checkpoint)] == ["c0", "c1"]
+    assert [c["cid"] for c in agent.stream(video_url, max_comments=3, checkpoint=checkpoint)] == ["c2"]
@@ -0,0 +1,317 @@
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import platform
+import resource
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from core.cassette import CassetteLibrary
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+RESULTS_VERSION = 1
+DEFAULT_CALLS = 50
+DEFAULT_CONCURRENCY = 8
+MEMORY_CALLS = 5               # Calls traced by ``tracemalloc`` for the peak memory measurement
+DEFAULT_THRESHOLD = 0.2        # Relative slowdown reported as a regression by ``compare``
+
+# Per-agent measurements compared across runs; higher is worse for all but throughput.
+COMPARED = ("cold_start_ms", "warm_p50_ms", "warm_p95_ms", "throughput_per_s", "peak_memory_kb")
+
+
+def load_fixtures(names=None, fixtures_dir=FIXTURES_DIR):
+    """
+    Load benchmark fixtures.
+
+    Fixtures are cassettes (see ``core.cassette``) whose ``params`` are the
+    arguments the agent is called with. Agents that cannot run against
+    recorded responses (interactive prompts, third-party clients) have a
+    ``skip`` reason instead.
+
+    Args:
+        names (iterable, optional): Restrict to these agents.
+        fixtures_dir (str): Directory of ``<agent>.json`` fixtures.
+
+    Returns:
+        CassetteLibrary: The fixtures, keyed by agent name in ``cassettes``.
+
+    Raises:
+        ValueError: If a requested agent has no fixture.
+    """
+    library = CassetteLibrary(fixtures_dir)
+    if names:
+        missing = set(names) - set(library.cassettes)
+        if missing:
+            raise ValueError(f"No benchmark fixture for: {', '.join(sorted(missing))}")
+        library.cassettes = {name: library.cassettes[name] for name in sorted(library.cassettes) if name in names}
+    return library
+
+
+@contextlib.contextmanager
+def quiet():
+    """Silence agent prints and info logging while measuring."""
+    logging.disable(logging.INFO)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            yield
+    finally:
+        logging.disable(logging.NOTSET)
+
+
+def _is_error(result):
+    return isinstance(result, dict) and ("error" in result or result.get("status") in ("error", "failed"))
+
+
+def _setup_transport(stub_url):
+    """Point the shared transport at the stub server, without rate limits or the local series store."""
+    from core import timeseries, transport
+    from core.ratelimit import RateLimiter
+    from benchmarks.stub import route_to_stub
+
+    timeseries.configure(None)  # Agents keeping series on disk would stop calling the stub after the first call
+    shared = transport.configure(limiter=RateLimiter())
+    if stub_url:
+        route_to_stub(shared, stub_url)
+    return shared
+
+
+def _call(agent_name, agent_instance, params):
+    """Execute an agent in its scope, bypassing the response cache and call coalescing."""
+    from core.context import agent_scope
+
+    with agent_scope(agent_name, agent_instance):
+        return agent_instance.execute(**params)
+
+
+def _percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def cold_run(agent_name, params, stub_url):
+    """
+    Time the first call of an agent in a fresh interpreter.
+
+    Meant to run in a child process: discovery, agent import, instantiation
+    and the first call are timed separately, and peak RSS is reported.
+
+    Returns:
+        dict: Phase timings in milliseconds and ``max_rss_kb``.
+    """
+    started = time.perf_counter()
+    from core.discovery import discover_agents
+    _setup_transport(stub_url)
+    core_ready = time.perf_counter()
+    agents = discover_agents([agent_name])
+    discovered = time.perf_counter()
+    agent_class = agents[agent_name]
+    imported = time.perf_counter()
+    agent_instance = agent_class()
+    instantiated = time.perf_counter()
+    with quiet():
+        result = _call(agent_name, agent_instance, params)
+    called = time.perf_counter()
+    return {
+        "core_import_ms": (core_ready - started) * 1000,
+        "discover_ms": (discovered - core_ready) * 1000,
+        "agent_import_ms": (imported - discovered) * 1000,
+        "instantiate_ms": (instantiated - imported) * 1000,
+        "first_call_ms": (called - instantiated) * 1000,
+        "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "error": result.get("error") if _is_error(result) else None,
+    }
+
+
+def measure_cold_start(agent_name, params, stub_url):
+    """
+    Run ``cold_run`` in a new interpreter.
+
+    Returns:
+        dict: The child's phase timings plus ``cold_start_ms``, the wall time
+        of the whole process including interpreter startup.
+    """
+    command = [sys.executable, "-m", "benchmarks.runner", "--cold", agent_name, "--params", json.dumps(params),
+               "--stub-url", stub_url]
+    started = time.perf_counter()
+    completed = subprocess.run(command, cwd=REPO_ROOT, capture_output=True, text=True, check=False)
+    elapsed = (time.perf_counter() - started) * 1000
+    if completed.returncode != 0:
+        raise RuntimeError(f"Cold run failed: {completed.stderr.strip().splitlines()[-1:]}")
+    measured = json.loads(completed.stdout.strip().splitlines()[-1])
+    error = measured.pop("error")
+    if error:
+        raise RuntimeError(f"Cold run failed: {error}")
+    return {"cold_start_ms": elapsed, **measured}
+
+
+def measure_warm(agent_name, agent_class, params, calls):
+    """
+    Time sequential calls on one warm instance, then track their peak Python memory.
+
+    Memory is traced in a separate pass so that ``tracemalloc`` overhead does
+    not inflate the latencies.
+
+    Returns:
+        dict: Latency statistics in milliseconds and ``peak_memory_kb``.
+    """
+    agent_instance = agent_class()
+    _call(agent_name, agent_instance, params)
+    latencies = []
+    for _ in range(calls):
+        started = time.perf_counter()
+        _call(agent_name, agent_instance, params)
+        latencies.append((time.perf_counter() - started) * 1000)
+    tracemalloc.start()
+    try:
+        for _ in range(min(calls, MEMORY_CALLS)):
+            _call(agent_name, agent_instance, params)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "warm_mean_ms": sum(latencies) / len(latencies),
+        "warm_p50_ms": _percentile(latencies, 0.5),
+        "warm_p95_ms": _percentile(latencies, 0.95),
+        "peak_memory_kb": peak / 1024,
+    }
+
+
+def measure_throughput(agent_name, agent_class, params, calls, concurrency):
+    """
+    Run ``calls`` executions on ``concurrency`` threads, one instance per thread.
+
+    Returns:
+        dict: ``throughput_per_s`` over the whole run.
+    """
+    local = threading.local()
+
+    def run(_):
+        if not hasattr(local, "agent_instance"):
+            local.agent_instance = agent_class()
+        return _call(agent_name, local.agent_instance, params)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(run, range(calls)))
+    return {"throughput_per_s": calls / (time.perf_counter() - started)}
+
+
+def bench_agent(agent_name, fixture, agents, stub_url, calls=DEFAULT_CALLS, concurrency=DEFAULT_CONCURRENCY,
+                cold=True):
+    """
+    Benchmark one agent against the stub server.
+
+    Returns:
+        dict: Measurements, ``{"skipped": reason}`` or ``{"error": message}``.
+    """
+    if fixture.extra.get("skip"):
+        return {"skipped": fixture.extra["skip"]}
+    params = fixture.extra.get("params", {})
+    try:
+        agent_class = agents[agent_name]
+        with quiet():
+            result = _call(agent_name, agent_class(), params)
+            if _is_error(result):
+                return {"error": f"Fixture does not satisfy the agent: {result.get('error')}"}
+            measured = {}
+            if cold:
+                measured.update(measure_cold_start(agent_name, params, stub_url))
+            measured.update(measure_warm(agent_name, agent_class, params, calls))
+            measured.update(measure_throughput(agent_name, agent_class, params, calls, concurrency))
+        return measured
+    except Exception as e:
+        return {"error": f"{type(e).__name__}: {e}"}
+
+
+def _commit():
+    try:
+        completed = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True,
+                                   text=True, check=True)
+        return completed.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(names=None, calls=DEFAULT_CALLS, concurrency=DEFAULT_CONCURRENCY, cold=True, progress=None):
+    """
+    Benchmark agents against their recorded fixtures.
+
+    Args:
+        names (iterable, optional): Agents to benchmark, all fixtures by default.
+        calls (int): Calls per warm and throughput measurement.
+        concurrency (int): Threads of the throughput measurement.
+        cold (bool): Also measure cold start in a fresh interpreter.
+        progress (callable, optional): Called with each agent name before it runs.
+
+    Returns:
+        dict: Results document, see the README's Benchmarks section.
+    """
+    from core import timeseries, transport
+    from core.discovery import discover_agents
+    from benchmarks.stub import StubServer
+
+    fixtures = load_fixtures(names)
+    server = StubServer(fixtures).start()
+    _setup_transport(server.url)
+    agents = discover_agents(fixtures.cassettes)
+    results = {}
+    try:
+        for agent_name, fixture in fixtures.cassettes.items():
+            if progress:
+                progress(agent_name)
+            results[agent_name] = bench_agent(agent_name, fixture, agents, server.url, calls=calls,
+                                              concurrency=concurrency, cold=cold)
+    finally:
+        transport.configure()  # Stop routing the shared transport to the stub
+        timeseries.configure()
+        server.stop()
+    return {
+        "version": RESULTS_VERSION,
+        "commit": _commit(),
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "settings": {"calls": calls, "concurrency": concurrency, "cold": cold},
+        "agents": results,
+    }
+
+
+def compare(baseline, results, threshold=DEFAULT_THRESHOLD):
+    """
+    List the measurements that got worse by more than ``threshold`` since ``baseline``.
+
+    Returns:
+        list: ``(agent, measurement, before, after)`` tuples.
+    """
+    regressions = []
+    for agent_name, current in results["agents"].items():
+        previous = baseline.get("agents", {}).get(agent_name, {})
+        for key in COMPARED:
+            before, after = previous.get(key), current.get(key)
+            if not before or after is None:
+                continue
+            change = (before - after) / before if key == "throughput_per_s" else (after - before) / before
+            if change > threshold:
+                regressions.append((agent_name, key, before, after))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Internal entry point of cold-start benchmark runs.")
+    parser.add_argument("--cold", required=True, help="Agent to run once in this fresh interpreter")
+    parser.add_argument("--params", default="{}")
+    parser.add_argument("--stub-url", default=None)
+    args = parser.parse_args(argv)
+    print(json.dumps(cold_run(args.cold, json.loads(args.params), args.stub_url)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+from requests.adapters import HTTPAdapter
+from core.cassette import recorded_body
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """
+    Serve the recorded response of a cassette library for ``/<host><path>`` requests.
+
+    Requests are matched like in cassette replay: on method, host and path,
+    plus the query parameters listed by the recorded request.
+    """
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    library = None
+
+    def _serve(self):
+        length = int(self.headers.get("Content-Length", 0))
+        if length:
+            self.rfile.read(length)
+        url = "http://" + self.path.lstrip("/")
+        response = self.library.match(None, self.command, url)
+        if response is None:
+            response = {"status": 404, "json": {"error": f"No recorded response for {self.command} {url}"}}
+        body = recorded_body(response)
+        self.send_response(response.get("status", 200))
+        content_type = "application/json" if "json" in response else "text/plain; charset=utf-8"
+        headers = {"Content-Type": content_type, **response.get("headers", {})}
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = do_PUT = do_DELETE = _serve
+
+    def log_message(self, *args):
+        pass
+
+
+class StubServer:
+    """Local HTTP server replaying the interactions of a cassette library."""
+
+    def __init__(self, library, host="127.0.0.1", port=0):
+        """
+        Initialize the server.
+
+        Args:
+            library (CassetteLibrary): Cassettes whose interactions are served.
+            host (str): Interface to bind.
+            port (int): Port to bind, 0 picks a free port.
+        """
+        handler = type("BoundStubHandler", (StubHandler,), {"library": library})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        """Base URL of the server."""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Serve in a background thread."""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and close the socket."""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class StubAdapter(HTTPAdapter):
+    """
+    ``requests`` adapter sending every request to a stub server instead of its host.
+
+    ``https://api.example.com/v1/x?y=1`` is sent as
+    ``<stub_url>/api.example.com/v1/x?y=1``, over the same keep-alive pool as
+    any other request, so agents exercise their real HTTP and parsing code.
+    """
+
+    def __init__(self, stub_url, **kwargs):
+        super().__init__(**kwargs)
+        self.stub_url = stub_url.rstrip("/")
+
+    def send(self, request, **kwargs):
+        url = urlsplit(request.url)
+        request.url = f"{self.stub_url}/{url.netloc}{url.path or '/'}" + (f"?{url.query}" if url.query else "")
+        return super().send(request, **kwargs)
+
+
+def route_to_stub(transport, stub_url):
+    """Send every request of ``transport`` to the stub server at ``stub_url``."""
+    adapter = StubAdapter(stub_url, pool_connections=transport.pool_connections, pool_maxsize=transport.pool_maxsize)
+    transport.session.mount("https://", adapter)
+    transport.session.mount("http://", adapter)
@@ -0,0 +1,79 @@
+import pytest
+from benchmarks import runner
+from benchmarks.stub import StubServer, route_to_stub
+from core.cassette import Cassette, CassetteLibrary
+from core.transport import Transport
+
+FIXTURES = [
+    Cassette("daily", [{
+        "request": {"method": "GET", "url": "https://api.example.com/query", "query": {"function": "DAILY"}},
+        "response": {"status": 200, "json": {"series": "daily"}},
+    }]),
+    Cassette("intraday", [{
+        "request": {"method": "GET", "url": "https://api.example.com/query", "query": {"function": "INTRADAY"}},
+        "response": {"status": 200, "json": {"series": "intraday"}},
+    }]),
+    Cassette("page", [{
+        "request": {"method": "POST", "url": "http://www.example.com/submit"},
+        "response": {"status": 201, "body": "<html></html>", "headers": {"Content-Type": "text/html"}},
+    }]),
+]
+
+
+@pytest.fixture
+def stub():
+    """Fixture routing a transport to a stub server replaying ``FIXTURES``."""
+    library = CassetteLibrary("unused")
+    library.cassettes = {fixture.agent: fixture for fixture in FIXTURES}
+    server = StubServer(library).start()
+    transport = Transport()
+    route_to_stub(transport, server.url)
+    yield transport
+    transport.close()
+    server.stop()
+
+
+def test_stub_matches_host_path_and_listed_query_parameters(stub):
+    daily = stub.get("https://api.example.com/query", params={"function": "DAILY", "apikey": "secret"})
+    intraday = stub.get("https://api.example.com/query", params={"function": "INTRADAY"})
+    assert daily.json() == {"series": "daily"}
+    assert intraday.json() == {"series": "intraday"}
+
+    page = stub.post("http://www.example.com/submit", data=b"form")
+    assert page.status_code == 201
+    assert page.headers["Content-Type"] == "text/html"
+    assert page.text == "<html></html>"
+
+
+def test_stub_answers_unknown_routes_with_404(stub):
+    response = stub.get("https://api.example.com/missing")
+    assert response.status_code == 404
+    assert "No recorded response" in response.json()["error"]
+
+
+def test_every_fixture_names_an_agent_and_either_params_or_a_skip_reason():
+    fixtures = runner.load_fixtures()
+    assert fixtures
+    for name, fixture in fixtures.cassettes.items():
+        assert fixture.extra.get("skip") or "params" in fixture.extra, name
+    with pytest.raises(ValueError):
+        runner.load_fixtures(["no-such-agent"])
+
+
+def test_run_suite_measures_agents_against_their_fixtures():
+    results = runner.run_suite(["lyricist", "ticker"], calls=3, concurrency=2, cold=False)
+    lyricist = results["agents"]["lyricist"]
+    assert "error" not in lyricist
+    assert lyricist["warm_p50_ms"] > 0 and lyricist["throughput_per_s"] > 0 and lyricist["peak_memory_kb"] > 0
+    assert "skipped" in results["agents"]["ticker"]
+    assert results["settings"] == {"calls": 3, "concurrency": 2, "cold": False}
+
+
+def test_compare_reports_slowdowns_and_throughput_drops():
+    baseline = {"agents": {"a": {"warm_p50_ms": 10.0, "throughput_per_s": 100.0, "peak_memory_kb": 50.0}}}
+    results = {"agents": {"a": {"warm_p50_ms": 13.0, "throughput_per_s": 70.0, "peak_memory_kb": 51.0},
+                          "new": {"warm_p50_ms": 1.0}}}
+    assert runner.compare(baseline, results, threshold=0.2) == [
+        ("a", "warm_p50_ms", 10.0, 13.0),
+        ("a", "throughput_per_s", 100.0, 70.0),
+    ]
@@ -4,10 +4,57 @@ class AgentBase:
         """Execute the agent logic"""
         raise NotImplementedError("Each agent must implement the 'execute' method")
 
-    
+
     def health_check(self):
         """
         Check the health of the agent.
         """
         raise NotImplementedError("Each agent must implement the 'health_check' method")
 
+    async def aexecute(self, **kwargs):
+        """
+        Execute the agent logic without blocking the event loop (optional).
+
+        Agents that override this are awaited by the async executor and
+        usually send their requests with ``core.transport.aget``; the others
+        have ``execute`` run on a worker thread.
+        """
+        raise NotImplementedError("This agent does not implement the 'aexecute' method")
+
+    def stream(self, **kwargs):
+        """
+        Yield the agent's records one at a time (optional).
+
+        Agents that override this have their records written by the executor
+        as they arrive when output is streamed, instead of building the whole
+        result first.
+        """
+        raise NotImplementedError("This agent does not implement the 'stream' method")
+
+
+def is_async_agent(agent):
+    """
+    Tell whether an agent class or instance provides a native ``aexecute``.
+
+    Args:
+        agent (type | AgentBase): Agent class or instance.
+
+    Returns:
+        bool: True if ``aexecute`` is overridden.
+    """
+    agent_class = agent if isinstance(agent, type) else type(agent)
+    return getattr(agent_class, "aexecute", AgentBase.aexecute) is not AgentBase.aexecute
+
+
+def is_streaming_agent(agent):
+    """
+    Tell whether an agent class or instance provides a ``stream`` method.
+
+    Args:
+        agent (type | AgentBase): Agent class or instance.
+
+    Returns:
+        bool: True if ``stream`` is overridden.
+    """
+    agent_class = agent if isinstance(agent, type) else type(agent)
+    return getattr(agent_class, "stream", AgentBase.stream) is not AgentBase.stream
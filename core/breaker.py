@@ -0,0 +1,252 @@
+import contextvars
+import inspect
+import logging
+import threading
+import time
+from collections import deque
+import requests
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WINDOW = 20             # Recent calls considered for the failure rate
+DEFAULT_MIN_CALLS = 5           # Calls needed in the window before the breaker can trip
+DEFAULT_FAILURE_RATE = 0.5      # Failure ratio that trips the breaker
+DEFAULT_COOLDOWN = 30.0         # Seconds a tripped breaker stays open before probing
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Host being probed in this context; its requests bypass the breaker.
+_probing = contextvars.ContextVar("plugflow_probing_host", default=None)
+
+
+class CircuitOpenError(requests.RequestException):
+    """Raised instead of calling a host whose circuit is open."""
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for one upstream host.
+
+    While closed, the outcome of every call is kept in a rolling window; once
+    the failure rate over the window reaches ``failure_rate`` the breaker opens
+    and calls fail immediately with ``CircuitOpenError``. After ``cooldown``
+    seconds a single caller probes the host, using the calling agent's
+    ``health_check()`` when available and otherwise its own request, and the
+    breaker closes or opens again depending on the result. Connection errors,
+    timeouts and 5xx responses count as failures.
+    """
+
+    def __init__(self, host, window=DEFAULT_WINDOW, min_calls=DEFAULT_MIN_CALLS,
+                 failure_rate=DEFAULT_FAILURE_RATE, cooldown=DEFAULT_COOLDOWN):
+        self.host = host
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.cooldown = cooldown
+        self.state = CLOSED
+        self.trips = 0
+        self.rejected = 0
+        self._outcomes = deque(maxlen=window)
+        self._opened_at = 0.0
+        self._probe_running = False
+        self._lock = threading.Lock()
+
+    def _admit(self):
+        """Return True if the caller must probe, raise if the call is rejected."""
+        with self._lock:
+            if self.state == CLOSED:
+                return False
+            if self.state == OPEN and time.monotonic() - self._opened_at >= self.cooldown:
+                self.state = HALF_OPEN
+                self._probe_running = False
+            if self.state == HALF_OPEN and not self._probe_running:
+                self._probe_running = True
+                return True
+            self.rejected += 1
+        raise CircuitOpenError(f"Circuit for {self.host} is open; failing fast")
+
+    def _trip(self):
+        self.state = OPEN
+        self._opened_at = time.monotonic()
+        self._outcomes.clear()
+        self._probe_running = False
+        self.trips += 1
+        logger.warning(f"Circuit for {self.host} opened for {self.cooldown}s")
+
+    def _close(self):
+        if self.state != CLOSED:
+            logger.info(f"Circuit for {self.host} closed")
+        self.state = CLOSED
+        self._outcomes.clear()
+        self._probe_running = False
+
+    def record(self, success):
+        """Record the outcome of a call and trip or close the breaker accordingly."""
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._close() if success else self._trip()
+                return
+            self._outcomes.append(success)
+            failures = self._outcomes.count(False)
+            if (self.state == CLOSED and len(self._outcomes) >= self.min_calls
+                    and failures / len(self._outcomes) >= self.failure_rate):
+                self._trip()
+
+    def _probe(self, health_check):
+        """Probe the host with a health check; return False if the agent has none."""
+        token = _probing.set(self.host)
+        try:
+            healthy = (health_check() or {}).get("status") == "healthy"
+        except NotImplementedError:
+            return False
+        except Exception as e:
+            logger.warning(f"Health check probing {self.host} failed: {e}")
+            healthy = False
+        finally:
+            _probing.reset(token)
+        with self._lock:
+            self._close() if healthy else self._trip()
+        if not healthy:
+            raise CircuitOpenError(f"Circuit for {self.host} is open; health check failed")
+        return True
+
+    def call(self, send, health_check=None):
+        """
+        Send a request through the breaker.
+
+        Args:
+            send (callable): Zero-argument function sending the request.
+            health_check (callable, optional): Probe used when the breaker is half-open.
+
+        Returns:
+            requests.Response: The response.
+
+        Raises:
+            CircuitOpenError: If the circuit is open.
+        """
+        if _probing.get() == self.host:
+            return send()
+
+        probe = self._admit()
+        if probe and health_check is not None and self._probe(health_check):
+            probe = False
+        try:
+            response = send()
+        except (requests.ConnectionError, requests.Timeout):
+            self.record(False)
+            raise
+        except Exception:
+            if probe:
+                self._release_probe()
+            raise
+        self.record(response.status_code < 500)
+        return response
+
+    async def acall(self, send):
+        """
+        Await a request through the breaker, see ``call``.
+
+        A half-open host is probed with the request itself, since a blocking
+        health check would stall the event loop.
+
+        Args:
+            send (callable): Zero-argument coroutine function sending the request.
+
+        Returns:
+            requests.Response: The response.
+        """
+        if _probing.get() == self.host:
+            return await send()
+
+        probe = self._admit()
+        try:
+            response = await send()
+        except (requests.ConnectionError, requests.Timeout):
+            self.record(False)
+            raise
+        except Exception:
+            if probe:
+                self._release_probe()
+            raise
+        self.record(response.status_code < 500)
+        return response
+
+    def _release_probe(self):
+        # The trial request never reached the host; let the next caller probe.
+        with self._lock:
+            self._probe_running = False
+
+    def snapshot(self):
+        """Return the breaker state, recent failure count and counters."""
+        with self._lock:
+            return {
+                "state": self.state,
+                "failures": self._outcomes.count(False),
+                "calls": len(self._outcomes),
+                "trips": self.trips,
+                "rejected": self.rejected,
+            }
+
+
+_breakers = {}
+_settings = {}
+_lock = threading.Lock()
+
+
+_probe_support = {}
+
+
+def health_probe(agent_instance):
+    """
+    Return the agent's ``health_check`` if it can probe without arguments.
+
+    Health checks that need arguments (usually an API key) cannot be called by
+    the breaker; their host is probed with the next real request instead.
+
+    Args:
+        agent_instance (AgentBase): The executing agent, or None.
+
+    Returns:
+        callable: The bound health check, or None.
+    """
+    health_check = getattr(agent_instance, "health_check", None)
+    if health_check is None:
+        return None
+    agent_class = type(agent_instance)
+    if agent_class not in _probe_support:
+        try:
+            parameters = inspect.signature(health_check).parameters.values()
+            _probe_support[agent_class] = all(
+                p.default is not p.empty or p.kind in (p.VAR_POSITIONAL, p.VAR_KEYWORD) for p in parameters)
+        except (TypeError, ValueError):
+            _probe_support[agent_class] = False
+    return health_check if _probe_support[agent_class] else None
+
+
+def configure(**settings):
+    """
+    Set the breaker settings used for hosts seen from now on.
+
+    Args:
+        **settings: Keyword arguments accepted by ``CircuitBreaker``.
+    """
+    with _lock:
+        _settings.clear()
+        _settings.update(settings)
+        _breakers.clear()
+
+
+def get_breaker(host):
+    """Return the process-wide breaker of a host."""
+    with _lock:
+        if host not in _breakers:
+            _breakers[host] = CircuitBreaker(host, **_settings)
+        return _breakers[host]
+
+
+def snapshot():
+    """Return the state of every breaker keyed by host."""
+    with _lock:
+        breakers = dict(_breakers)
+    return {host: breaker.snapshot() for host, breaker in breakers.items()}
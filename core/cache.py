@@ -0,0 +1,254 @@
+import json
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from core import metrics
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_SQLITE_PATH = ".plugflow_cache.sqlite"
+
+# Parameters that never take part in a cache key, so results are shared
+# across callers and credentials are never written to disk.
+SECRET_PARAMS = frozenset({"api_key", "apikey", "rapid_api_key", "access_key", "token", "password", "secret"})
+
+MISS = object()
+
+
+def make_key(agent_name, params, exclude=()):
+    """
+    Build a cache key from an agent name and its normalized parameters.
+
+    Parameters are serialized as sorted compact JSON, so the same call spelled
+    with a different keyword order maps to the same entry.
+
+    Args:
+        agent_name (str): Name of the agent.
+        params (dict): Keyword arguments of the call.
+        exclude (iterable): Extra parameter names left out of the key.
+
+    Returns:
+        str: The cache key.
+    """
+    skipped = SECRET_PARAMS.union(exclude)
+    normalized = {name: value for name, value in params.items() if name.lower() not in skipped}
+    payload = json.dumps(normalized, sort_keys=True, separators=(",", ":"), default=str)
+    return f"{agent_name}:{hashlib.sha256(payload.encode('utf-8')).hexdigest()}"
+
+
+def is_cacheable(result):
+    """Tell whether a result may be cached; error results never are."""
+    if isinstance(result, dict):
+        return "error" not in result and result.get("status") not in ("error", "failed")
+    return result is not None
+
+
+class MemoryCache:
+    """In-process LRU cache with per-entry expiry."""
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries (int): Entries kept before the least recently used is evicted.
+        """
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached value or ``MISS``."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return MISS
+            expires, value = entry
+            if expires <= time.time():
+                del self._entries[key]
+                return MISS
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        """Store a value for ``ttl`` seconds."""
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SQLiteCache:
+    """
+    On-disk cache shared by successive processes.
+
+    Values are stored as JSON; results that cannot be serialized are simply
+    not cached. Beyond ``max_entries`` the least recently used rows are evicted.
+    """
+
+    def __init__(self, path=DEFAULT_SQLITE_PATH, max_entries=DEFAULT_MAX_ENTRIES * 10):
+        """
+        Initialize the cache.
+
+        Args:
+            path (str): SQLite database file.
+            max_entries (int): Rows kept before the least recently used are evicted.
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed)")
+
+    def get(self, key):
+        """Return the cached value or ``MISS``."""
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT value, expires FROM cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return MISS
+            if row[1] <= now:
+                self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                return MISS
+            self._conn.execute("UPDATE cache SET accessed = ? WHERE key = ?", (now, key))
+        return json.loads(row[0])
+
+    def set(self, key, value, ttl):
+        """Store a value for ``ttl`` seconds."""
+        try:
+            payload = json.dumps(value)
+        except (TypeError, ValueError):
+            logger.debug(f"Not caching {key}: result is not JSON serializable")
+            return
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?)", (key, payload, now + ttl, now))
+            self._conn.execute(
+                "DELETE FROM cache WHERE key IN "
+                "(SELECT key FROM cache ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def clear(self):
+        """Drop every entry."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM cache")
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+
+BACKENDS = {"memory": MemoryCache, "sqlite": SQLiteCache}
+
+_cache = MemoryCache()
+
+
+def get_cache():
+    """Return the process-wide cache, or None when caching is disabled."""
+    return _cache
+
+
+def configure(backend="memory", **settings):
+    """
+    Replace the process-wide cache.
+
+    Args:
+        backend (str): ``"memory"``, ``"sqlite"`` or ``"off"``.
+        **settings: Keyword arguments accepted by the backend class.
+
+    Returns:
+        MemoryCache | SQLiteCache | None: The new cache.
+
+    Raises:
+        ValueError: If the backend is unknown.
+    """
+    global _cache
+    if backend == "off":
+        _cache = None
+    elif backend in BACKENDS:
+        _cache = BACKENDS[backend](**settings)
+    else:
+        raise ValueError(f"Unknown cache backend: {backend}")
+    logger.info(f"Configured response cache: {backend}")
+    return _cache
+
+
+def _cache_key(agent_name, params, policy):
+    """Return the cache and key of a call covered by ``policy``, or ``(None, None)``."""
+    cache = _cache
+    ttl = policy.get("ttl") if policy else None
+    if cache is None or not ttl:
+        return None, None
+    for name, values in policy.get("when", {}).items():
+        if params.get(name) not in values:
+            return None, None
+    return cache, make_key(agent_name, params, policy.get("exclude", ()))
+
+
+def _lookup(cache, agent_name, key):
+    value = cache.get(key)
+    metrics.record_cache(agent_name, value is not MISS)
+    if value is not MISS:
+        logger.debug(f"Cache hit for {agent_name}")
+    return value
+
+
+def _store(cache, key, value, ttl):
+    if is_cacheable(value):
+        cache.set(key, value, ttl)
+
+
+def cached_call(agent_name, params, policy, call):
+    """
+    Return a cached result for an agent call, running ``call`` on a miss.
+
+    Args:
+        agent_name (str): Name of the agent.
+        params (dict): Keyword arguments of the call.
+        policy (dict): The manifest ``cache`` section: ``ttl`` in seconds,
+            optional ``exclude`` parameter names and optional ``when``, mapping
+            a parameter to the values for which caching applies.
+        call (callable): Zero-argument function executing the agent.
+
+    Returns:
+        Any: The agent result.
+    """
+    cache, key = _cache_key(agent_name, params, policy)
+    if cache is None:
+        return call()
+    value = _lookup(cache, agent_name, key)
+    if value is MISS:
+        value = call()
+        _store(cache, key, value, policy["ttl"])
+    return value
+
+
+async def acached_call(agent_name, params, policy, call):
+    """Return a cached result for an agent call, awaiting ``call`` on a miss, see ``cached_call``."""
+    cache, key = _cache_key(agent_name, params, policy)
+    if cache is None:
+        return await call()
+    value = _lookup(cache, agent_name, key)
+    if value is MISS:
+        value = await call()
+        _store(cache, key, value, policy["ttl"])
+    return value
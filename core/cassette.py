@@ -0,0 +1,306 @@
+import base64
+import json
+import logging
+import os
+import random
+import threading
+import time
+from http import HTTPStatus
+from urllib.parse import parse_qsl, urlsplit, urlunsplit
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from core.context import current_agent
+
+logger = logging.getLogger(__name__)
+
+OFF = "off"
+RECORD = "record"
+REPLAY = "replay"
+
+SHARED = "_shared"              # Cassette of requests made outside any agent
+SECRET_PARAMS = ("key", "token", "secret", "password", "signature")  # Query names containing these are not recorded
+KEPT_HEADERS = ("Content-Type", "Retry-After")
+INJECTED_ERROR = {"status": 503, "json": {"error": "Injected failure"}, "headers": {"Retry-After": "0"}}
+
+_mode = OFF
+_library = None
+_settings = {}
+_lock = threading.Lock()
+
+
+class CassetteMiss(requests.ConnectionError):
+    """Raised in replay mode for a request that was never recorded."""
+
+
+def recorded_body(response):
+    """Return the body of a recorded response as bytes."""
+    if "json" in response:
+        return json.dumps(response["json"]).encode("utf-8")
+    if "body_base64" in response:
+        return base64.b64decode(response["body_base64"])
+    return response.get("body", "").encode("utf-8")
+
+
+def _record_response(response):
+    """Return the compact recorded form of a ``requests.Response``."""
+    recorded = {"status": response.status_code}
+    headers = {name: response.headers[name] for name in KEPT_HEADERS if name in response.headers}
+    content = response.content or b""
+    if "json" in headers.get("Content-Type", ""):
+        try:
+            recorded["json"] = json.loads(content)
+            del headers["Content-Type"]  # Implied by a ``json`` payload
+        except ValueError:
+            pass
+    if "json" not in recorded:
+        try:
+            recorded["body"] = content.decode("utf-8")
+        except UnicodeDecodeError:
+            recorded["body_base64"] = base64.b64encode(content).decode("ascii")
+    if headers:
+        recorded["headers"] = headers
+    return recorded
+
+
+def _is_secret(name):
+    return any(word in name.lower() for word in SECRET_PARAMS)
+
+
+class Cassette:
+    """
+    Recorded interactions of one agent.
+
+    An interaction pairs a request (``method``, ``url`` without query string
+    and the ``query`` parameters it must carry) with its response (``status``,
+    ``headers`` and a ``json``, ``body`` or ``body_base64`` payload). Other
+    top-level keys of the file, such as the ``params`` of a benchmark
+    fixture, are kept as they are.
+    """
+
+    def __init__(self, agent, interactions=None, extra=None):
+        self.agent = agent
+        self.interactions = list(interactions or [])
+        self.extra = dict(extra or {})
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path):
+        """Read a cassette file."""
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        agent = data.pop("agent", os.path.splitext(os.path.basename(path))[0])
+        return cls(agent, data.pop("interactions", []), data)
+
+    def save(self, path):
+        """Write the cassette with one interaction per line."""
+        header = json.dumps({"agent": self.agent, **self.extra}, ensure_ascii=False)
+        with self._lock:
+            lines = [json.dumps(interaction, ensure_ascii=False, separators=(",", ":"))
+                     for interaction in self.interactions]
+        interactions = "[\n" + ",\n".join(lines) + "\n]" if lines else "[]"
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f'{header[:-1]}, "interactions": {interactions}}}\n')
+
+    def match(self, method, url):
+        """
+        Return the recorded response for a request, or None.
+
+        Requests match on method, host and path; every ``query`` parameter of
+        the interaction must be present with the same value. When several
+        interactions match, the one listing the most parameters wins.
+        """
+        parts = urlsplit(url)
+        params = dict(parse_qsl(parts.query, keep_blank_values=True))
+        best, best_size = None, -1
+        for interaction in self.interactions:
+            request = interaction["request"]
+            recorded = urlsplit(request["url"])
+            if (request.get("method", "GET").upper() != method.upper() or recorded.netloc != parts.netloc
+                    or (recorded.path or "/") != (parts.path or "/")):
+                continue
+            query = request.get("query", {})
+            if len(query) > best_size and all(params.get(key) == str(value) for key, value in query.items()):
+                best, best_size = interaction["response"], len(query)
+        return best
+
+    def record(self, method, url, response):
+        """Record a response, replacing an earlier one for the same request."""
+        parts = urlsplit(url)
+        query = {key: value for key, value in parse_qsl(parts.query, keep_blank_values=True) if not _is_secret(key)}
+        request = {"method": method.upper(), "url": urlunsplit((parts.scheme, parts.netloc, parts.path, "", ""))}
+        if query:
+            request["query"] = query
+        interaction = {"request": request, "response": _record_response(response)}
+        with self._lock:
+            self.interactions = [existing for existing in self.interactions if existing["request"] != request]
+            self.interactions.append(interaction)
+
+
+class CassetteLibrary:
+    """Cassettes of a directory, one ``<agent>.json`` file per agent."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.cassettes = {}
+        self._lock = threading.Lock()
+        if os.path.isdir(directory):
+            for filename in sorted(os.listdir(directory)):
+                if filename.endswith(".json"):
+                    cassette = Cassette.load(os.path.join(directory, filename))
+                    self.cassettes[cassette.agent] = cassette
+
+    def get(self, agent):
+        """Return the cassette of an agent, creating an empty one if needed."""
+        agent = agent or SHARED
+        with self._lock:
+            if agent not in self.cassettes:
+                self.cassettes[agent] = Cassette(agent)
+            return self.cassettes[agent]
+
+    def match(self, agent, method, url):
+        """Return the recorded response for a request, searching the agent's cassette first."""
+        cassette = self.cassettes.get(agent or SHARED)
+        response = cassette.match(method, url) if cassette else None
+        if response is None:
+            for other in list(self.cassettes.values()):
+                if other is not cassette:
+                    response = other.match(method, url)
+                    if response is not None:
+                        break
+        return response
+
+    def save(self):
+        """Write every cassette holding interactions."""
+        os.makedirs(self.directory, exist_ok=True)
+        for agent, cassette in list(self.cassettes.items()):
+            if cassette.interactions:
+                cassette.save(os.path.join(self.directory, f"{agent}.json"))
+
+
+def build_response(request, recorded):
+    """Build a ``requests.Response`` for a prepared request from a recorded response."""
+    body = recorded_body(recorded)
+    status = recorded.get("status", 200)
+    content_type = "application/json" if "json" in recorded else "text/plain; charset=utf-8"
+    headers = CaseInsensitiveDict({"Content-Type": content_type, **recorded.get("headers", {})})
+    headers["Content-Length"] = str(len(body))
+    response = requests.Response()
+    response.status_code = status
+    try:
+        response.reason = HTTPStatus(status).phrase
+    except ValueError:
+        response.reason = ""
+    response.headers = headers
+    response.encoding = get_encoding_from_headers(headers)
+    response._content = body
+    response.url = request.url
+    response.request = request
+    return response
+
+
+class CassetteAdapter(HTTPAdapter):
+    """
+    ``requests`` adapter recording responses into, or replaying them from, a cassette library.
+
+    In replay mode no connection is opened: every response waits ``latency``
+    seconds plus up to ``jitter`` more, a read timeout shorter than that wait
+    raises ``requests.ReadTimeout``, and a share ``error_rate`` of responses
+    is replaced by a 503 so retries and circuit breakers can be soak-tested.
+    """
+
+    def __init__(self, library, mode, latency=0.0, jitter=0.0, error_rate=0.0, seed=None, **kwargs):
+        super().__init__(**kwargs)
+        self.library = library
+        self.mode = mode
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+
+    def send(self, request, stream=False, timeout=None, **kwargs):
+        if self.mode == RECORD:
+            response = super().send(request, stream=stream, timeout=timeout, **kwargs)
+            if not stream:
+                self.library.get(current_agent()).record(request.method, request.url, response)
+            return response
+        recorded = self.library.match(current_agent(), request.method, request.url)
+        if recorded is None:
+            raise CassetteMiss(f"No recorded response for {request.method} {request.url}", request=request)
+        wait = self.latency + self._random.uniform(0, self.jitter)
+        read_timeout = timeout[1] if isinstance(timeout, tuple) else timeout
+        if read_timeout is not None and wait > read_timeout:
+            time.sleep(read_timeout)
+            raise requests.ReadTimeout(f"Replayed response took longer than {read_timeout}s", request=request)
+        if wait:
+            time.sleep(wait)
+        if self.error_rate and self._random.random() < self.error_rate:
+            recorded = INJECTED_ERROR
+        return build_response(request, recorded)
+
+
+def adapter(**pool_settings):
+    """
+    Return the adapter the transport mounts: a ``CassetteAdapter`` while
+    recording or replaying, a plain ``HTTPAdapter`` otherwise.
+
+    Args:
+        **pool_settings: Keyword arguments accepted by ``HTTPAdapter``.
+    """
+    if _mode == OFF:
+        return HTTPAdapter(**pool_settings)
+    return CassetteAdapter(_library, _mode, **_settings, **pool_settings)
+
+
+def configure(mode, directory=None, latency=0.0, jitter=0.0, error_rate=0.0, seed=None):
+    """
+    Record or replay the HTTP traffic of the shared transport.
+
+    Args:
+        mode (str): ``"record"``, ``"replay"`` or ``"off"``.
+        directory (str, optional): Cassette directory, required unless off.
+        latency (float): Seconds every replayed response waits.
+        jitter (float): Up to this many extra seconds, drawn per response.
+        error_rate (float): Share of replayed responses turned into 503s.
+        seed (int, optional): Seed of the jitter and error draws.
+
+    Raises:
+        ValueError: If the mode is unknown or no directory is given.
+    """
+    global _mode, _library, _settings
+    if mode not in (OFF, RECORD, REPLAY):
+        raise ValueError(f"Unknown cassette mode: {mode}")
+    if mode != OFF and not directory:
+        raise ValueError(f"A cassette directory is required to {mode}")
+    if mode == REPLAY and not os.path.isdir(directory):
+        raise ValueError(f"Cassette directory not found: {directory}")
+    with _lock:
+        _mode = mode
+        _library = CassetteLibrary(directory) if mode != OFF else None
+        _settings = {}
+        if mode == REPLAY:
+            _settings = {"latency": latency, "jitter": jitter, "error_rate": error_rate, "seed": seed}
+    # Drop pooled sessions so the next request mounts the new adapter.
+    from core import transport
+    transport.get_transport().close()
+    if mode != OFF:
+        logger.info(f"Cassettes: {mode} in {directory} {_settings or ''}".rstrip())
+
+
+def mode():
+    """Return the current cassette mode."""
+    return _mode
+
+
+def save():
+    """Write the cassettes recorded so far."""
+    if _mode == RECORD and _library is not None:
+        _library.save()
+        logger.info(f"Saved cassettes to {_library.directory}")
+
+
+def shutdown():
+    """Save recorded cassettes and stop recording or replaying."""
+    save()
+    configure(OFF)
@@ -0,0 +1,33 @@
+import contextvars
+from contextlib import contextmanager
+
+_current_agent = contextvars.ContextVar("plugflow_current_agent", default=(None, None))
+
+
+def current_agent():
+    """Return the name of the agent executing in this context, or None."""
+    return _current_agent.get()[0]
+
+
+def current_agent_instance():
+    """Return the agent instance executing in this context, or None."""
+    return _current_agent.get()[1]
+
+
+@contextmanager
+def agent_scope(agent_name, agent_instance=None):
+    """
+    Mark the enclosed code as running on behalf of an agent.
+
+    Layers below the agent, such as the transport, use it to apply the
+    agent's manifest policies without every agent passing its name along.
+
+    Args:
+        agent_name (str): Name of the agent.
+        agent_instance (AgentBase, optional): The executing instance.
+    """
+    token = _current_agent.set((agent_name, agent_instance))
+    try:
+        yield
+    finally:
+        _current_agent.reset(token)
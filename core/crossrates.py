@@ -0,0 +1,147 @@
+import hashlib
+import logging
+import threading
+import numpy as np
+from core.cache import MISS, MemoryCache
+from core.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PIVOT = "USD"
+DEFAULT_TTL = 3600          # Seconds a fetched rate is reused
+DEFAULT_MAX_ENTRIES = 1024  # Currencies whose rate is kept
+
+
+class CrossRates:
+    """
+    Exchange rates between any two currencies, derived from their rates against one pivot currency.
+
+    Rates against the pivot are cached for ``ttl`` seconds, so converting
+    between N currencies costs one rate table download, or N pair lookups,
+    instead of a call per pair: one unit of X is worth ``rate[Y] / rate[X]``
+    units of Y. Concurrent callers missing the same rates share one download,
+    while callers whose rates are cached never wait for it.
+    """
+
+    def __init__(self, pivot=DEFAULT_PIVOT, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES):
+        """
+        Initialize the engine.
+
+        Args:
+            pivot (str): Currency every rate is fetched against.
+            ttl (float): Seconds a fetched rate is reused.
+            max_entries (int): Currencies whose rate is kept.
+        """
+        self.pivot = pivot.upper()
+        self.ttl = ttl
+        self._rates = MemoryCache(max_entries=max_entries)
+        self._flight = SingleFlight()
+
+    def pivot_rates(self, currencies, fetch):
+        """
+        Return the units of each currency one unit of the pivot buys.
+
+        Args:
+            currencies (Sequence[str]): Currency codes.
+            fetch (callable): Called with the pivot and the sorted codes whose rate
+                is not cached; returns ``{code: rate}``. Rates of other codes it
+                returns, such as a whole table, are cached as well.
+
+        Returns:
+            np.ndarray: The rates, in the order of ``currencies``.
+
+        Raises:
+            ValueError: If the rate of a currency cannot be found.
+        """
+        codes = [code.upper() for code in currencies]
+        rates = {code: 1.0 if code == self.pivot else self._rates.get(code) for code in set(codes)}
+        missing = sorted(code for code, rate in rates.items() if rate is MISS)
+        if missing:
+            fetched = self._flight.do(",".join(missing), lambda: self._fetch(missing, fetch))
+            rates.update((code, fetched[code]) for code in missing if code in fetched)
+        unknown = sorted(code for code, rate in rates.items() if rate is MISS)
+        if unknown:
+            raise ValueError(f"No exchange rate for: {', '.join(unknown)}")
+        return np.array([rates[code] for code in codes], dtype=np.float64)
+
+    def _fetch(self, missing, fetch):
+        """Download the rates of ``missing`` codes, cache them and return all the rates received."""
+        logger.info(f"Fetching {len(missing)} rates against {self.pivot}")
+        fetched = {code.upper(): float(rate) for code, rate in fetch(self.pivot, missing).items()}
+        for code, rate in fetched.items():
+            self._rates.set(code, rate, self.ttl)
+        return fetched
+
+    def rate(self, from_currency, to_currency, fetch):
+        """Return the units of ``to_currency`` one unit of ``from_currency`` buys."""
+        from_rate, to_rate = self.pivot_rates([from_currency, to_currency], fetch)
+        return float(to_rate / from_rate)
+
+    def matrix(self, currencies, fetch):
+        """
+        Return the rate between every pair of currencies.
+
+        Returns:
+            dict: ``{from_currency: {to_currency: rate}}``.
+        """
+        codes = [code.upper() for code in currencies]
+        rates = self.pivot_rates(codes, fetch)
+        table = rates[np.newaxis, :] / rates[:, np.newaxis]
+        return {source: dict(zip(codes, row.tolist())) for source, row in zip(codes, table)}
+
+    def convert(self, amounts, from_currency, to_currency, fetch):
+        """
+        Convert many amounts at once.
+
+        Args:
+            amounts (Sequence[float]): Amounts to convert.
+            from_currency (str | Sequence[str]): Currency of all amounts, or of each one.
+            to_currency (str | Sequence[str]): Currency to convert all amounts to, or each one.
+            fetch (callable): See ``pivot_rates``.
+
+        Returns:
+            np.ndarray: The converted amounts.
+
+        Raises:
+            ValueError: If a currency list does not match the amounts or a rate cannot be found.
+        """
+        amounts = np.asarray(amounts, dtype=np.float64)
+        sides = [[code] if isinstance(code, str) else list(code) for code in (from_currency, to_currency)]
+        for side in sides:
+            if len(side) not in (1, len(amounts)):
+                raise ValueError(f"Expected 1 or {len(amounts)} currencies, got {len(side)}")
+        codes = sorted({code.upper() for side in sides for code in side})
+        rates = self.pivot_rates(codes, fetch)
+        position = {code: index for index, code in enumerate(codes)}
+        from_rates, to_rates = (rates[[position[code.upper()] for code in side]] for side in sides)
+        return amounts * to_rates / from_rates
+
+
+class KeyedCrossRates:
+    """
+    One ``CrossRates`` engine per API key.
+
+    Rates fetched with one key are never served to callers using another, so
+    an invalid key fails on its own lookup instead of reading rates cached
+    with a valid one. Keys are held as hashes.
+    """
+
+    def __init__(self, **settings):
+        """
+        Initialize the engines.
+
+        Args:
+            **settings: Arguments of every ``CrossRates`` engine (``pivot``, ``ttl``, ``max_entries``).
+        """
+        self._settings = settings
+        self._engines = {}
+        self._lock = threading.Lock()
+
+    def for_key(self, api_key):
+        """Return the engine of ``api_key``, creating it on first use."""
+        key_id = hashlib.sha256(str(api_key).encode("utf-8")).hexdigest()
+        with self._lock:
+            engine = self._engines.get(key_id)
+            if engine is None:
+                engine = self._engines[key_id] = CrossRates(**self._settings)
+        return engine
@@ -0,0 +1,77 @@
+import contextvars
+import time
+from contextlib import contextmanager
+import requests
+
+# Absolute time.monotonic() value after which the current flow or step is out of time.
+_deadline = contextvars.ContextVar("plugflow_deadline", default=None)
+
+
+class DeadlineExceeded(requests.RequestException):
+    """Raised when the deadline of the current flow or step has passed."""
+
+
+@contextmanager
+def deadline_scope(seconds):
+    """
+    Run the enclosed code under a deadline ``seconds`` from now.
+
+    Scopes nest: an inner scope can shorten the deadline of the enclosing one
+    but never extend it. Threads started inside the scope only see it when
+    they run in a copy of the current context (``contextvars.copy_context``).
+
+    Args:
+        seconds (float): Time budget, or None to keep the enclosing deadline.
+    """
+    if seconds is None:
+        yield
+        return
+    expires_at = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(expires_at if current is None else min(current, expires_at))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining():
+    """Return the seconds left before the current deadline, or None without one."""
+    expires_at = _deadline.get()
+    if expires_at is None:
+        return None
+    return max(0.0, expires_at - time.monotonic())
+
+
+def expired():
+    """Return True if the current deadline has passed."""
+    return remaining() == 0.0
+
+
+def check():
+    """
+    Raise if the current deadline has passed.
+
+    Raises:
+        DeadlineExceeded: If no time is left.
+    """
+    if expired():
+        raise DeadlineExceeded("Deadline exceeded")
+
+
+def cap_timeout(timeout):
+    """
+    Shorten a ``requests`` timeout so that it ends before the current deadline.
+
+    Args:
+        timeout (float | tuple | None): Timeout or ``(connect, read)`` pair.
+
+    Returns:
+        float | tuple | None: The timeout with each part capped to the time left.
+    """
+    left = remaining()
+    if left is None:
+        return timeout
+    if isinstance(timeout, tuple):
+        return tuple(left if part is None else min(part, left) for part in timeout)
+    return left if timeout is None else min(timeout, left)
@@ -1,69 +1,339 @@
 import os
 import json
+import hashlib
+import sys
+import time
 import importlib
 import logging
+from collections.abc import Mapping
+from core import tracing
 from core.base import AgentBase
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-AGENTS_DIR = "agents"
+AGENTS_PACKAGE = "agents"
+# Resolved from this package, so agents load whatever the working directory is.
+AGENTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), AGENTS_PACKAGE)
+INDEX_FILENAME = ".agent_index.json"
+INDEX_VERSION = 1
 
 
-def discover_agents():
-    """Discover agents dynamically based on manifest files."""
-    agents = {}
-    for folder in os.listdir(AGENTS_DIR):
-        folder_path = os.path.join(AGENTS_DIR, folder)
-        manifest_path = os.path.join(folder_path, "manifest.json")
+def _manifest_hash(manifest_path):
+    """Return the SHA-1 hex digest of a manifest file."""
+    with open(manifest_path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
 
-        # Skip non-directories or directories without a manifest
-        if not os.path.isdir(folder_path):
-            logger.debug(f"Skipping non-directory: {folder_path}")
-            continue
 
-        if not os.path.exists(manifest_path):
-            logger.warning(f"Manifest file missing in: {folder_path}")
-            continue
+def _index_folder(agents_dir, folder):
+    """
+    Build the index record for a single agent folder.
 
-        # Read and validate manifest.json
-        try:
-            with open(manifest_path, "r") as f:
-                manifest = json.load(f)
-        except json.JSONDecodeError as e:
-            logger.error(f"Invalid JSON in {manifest_path}: {e}")
-            continue
+    Args:
+        agents_dir (str): Directory containing the agent folders.
+        folder (str): Name of the agent folder.
+
+    Returns:
+        dict: Index record, or None if the entry is not a directory.
+            The ``agent`` key is None when the folder has no usable manifest.
+    """
+    folder_path = os.path.join(agents_dir, folder)
+    manifest_path = os.path.join(folder_path, "manifest.json")
+
+    # Skip non-directories or directories without a manifest
+    if not os.path.isdir(folder_path):
+        logger.debug(f"Skipping non-directory: {folder_path}")
+        return None
+
+    record = {"folder_mtime": os.stat(folder_path).st_mtime_ns, "agent": None}
+
+    if not os.path.exists(manifest_path):
+        logger.warning(f"Manifest file missing in: {folder_path}")
+        return record
+
+    record["manifest_mtime"] = os.stat(manifest_path).st_mtime_ns
+    record["manifest_hash"] = _manifest_hash(manifest_path)
+
+    # Read and validate manifest.json
+    try:
+        with open(manifest_path, "r") as f:
+            manifest = json.load(f)
+    except json.JSONDecodeError as e:
+        logger.error(f"Invalid JSON in {manifest_path}: {e}")
+        return record
+
+    agent_name = manifest.get("name")
+    module_path = manifest.get("entry_point")  # Module path
+    class_name = manifest.get("class_name")   # Class name within the module
+
+    if not agent_name or not module_path or not class_name:
+        logger.warning(f"Invalid manifest fields in {manifest_path}")
+        return record
+
+    record["agent"] = {
+        "name": agent_name,
+        "folder": folder,
+        "entry_point": module_path,
+        "class_name": class_name,
+        "manifest": manifest,
+    }
+    return record
+
+
+def _refresh_folder(agents_dir, folder, cached):
+    """
+    Revalidate a cached folder record, re-reading the manifest only if it changed.
+
+    Args:
+        agents_dir (str): Directory containing the agent folders.
+        folder (str): Name of the agent folder.
+        cached (dict): Previously indexed record for the folder.
 
-        agent_name = manifest.get("name")
-        module_path = manifest.get("entry_point")  # Module path
-        class_name = manifest.get("class_name")   # Class name within the module
+    Returns:
+        tuple: ``(record, changed)`` where ``changed`` tells whether the index needs saving.
+    """
+    folder_path = os.path.join(agents_dir, folder)
+    manifest_path = os.path.join(folder_path, "manifest.json")
+    try:
+        folder_mtime = os.stat(folder_path).st_mtime_ns
+        manifest_mtime = os.stat(manifest_path).st_mtime_ns if "manifest_mtime" in cached else None
+    except OSError:
+        return _index_folder(agents_dir, folder), True
 
-        if not agent_name or not module_path or not class_name:
-            logger.warning(f"Invalid manifest fields in {manifest_path}")
+    if folder_mtime == cached["folder_mtime"] and manifest_mtime == cached.get("manifest_mtime"):
+        return cached, False
+
+    # The mtime moved; only re-parse when the content actually differs.
+    if manifest_mtime is not None and _manifest_hash(manifest_path) == cached.get("manifest_hash"):
+        record = dict(cached, folder_mtime=folder_mtime, manifest_mtime=manifest_mtime)
+        return record, True
+
+    return _index_folder(agents_dir, folder), True
+
+
+def _write_index(index_path, index):
+    """Persist the agent index atomically; failures are logged, not raised."""
+    tmp_path = f"{index_path}.tmp"
+    try:
+        with open(tmp_path, "w") as f:
+            json.dump(index, f)
+        os.replace(tmp_path, index_path)
+    except OSError as e:
+        logger.warning(f"Could not write agent index {index_path}: {e}")
+
+
+def load_agent_index(agents_dir=AGENTS_DIR, index_path=None):
+    """
+    Load the persisted agent index, rebuilding only entries whose manifest changed.
+
+    The index maps agent names to their folder, entry point, class name and
+    manifest, together with the manifest mtime and hash used for invalidation.
+    A fresh index costs one ``stat`` per agent folder instead of reading and
+    parsing every manifest.
+
+    Args:
+        agents_dir (str): Directory containing the agent folders.
+        index_path (str, optional): Location of the index file.
+            Defaults to ``<agents_dir>/.agent_index.json``.
+
+    Returns:
+        dict: Mapping of agent name to its index entry; empty when ``agents_dir`` does not exist.
+    """
+    try:
+        listing = sorted(os.listdir(agents_dir))
+    except FileNotFoundError:
+        logger.warning(f"Agents directory {agents_dir} not found; no agents are available")
+        return {}
+
+    index_path = index_path or os.path.join(agents_dir, INDEX_FILENAME)
+    cached = {}
+    try:
+        with open(index_path, "r") as f:
+            stored = json.load(f)
+        if stored.get("version") == INDEX_VERSION:
+            cached = stored.get("folders", {})
+    except (OSError, ValueError):
+        logger.debug(f"No usable agent index at {index_path}, rebuilding")
+
+    folders = {}
+    changed = False
+    for folder in listing:
+        if folder == INDEX_FILENAME or folder.startswith(f"{INDEX_FILENAME}."):
             continue
+        if folder in cached:
+            record, folder_changed = _refresh_folder(agents_dir, folder, cached[folder])
+        else:
+            record, folder_changed = _index_folder(agents_dir, folder), True
+        changed = changed or folder_changed
+        if record is not None:
+            folders[folder] = record
+
+    if changed or set(folders) != set(cached):
+        _write_index(index_path, {"version": INDEX_VERSION, "folders": folders})
+
+    entries = {}
+    for record in folders.values():
+        agent = record.get("agent")
+        if agent:
+            entries[agent["name"]] = agent
+    return entries
+
+
+def _load_agent_class(agent_name, entry):
+    """
+    Import an agent module and return its validated agent class.
+
+    Args:
+        agent_name (str): Name of the agent.
+        entry (dict): Index entry for the agent.
+
+    Returns:
+        type: The agent class, or None if it cannot be loaded.
+    """
+    # Construct the full module path
+    full_module_path = f"{AGENTS_PACKAGE}.{entry['folder']}.{entry['entry_point']}"
+    class_name = entry["class_name"]
+    try:
+        # Import the module
+        module = importlib.import_module(full_module_path)
+    except ImportError as e:
+        logger.error(f"Failed to import module {full_module_path}: {e}")
+        return None
+
+    # Get the class from the module
+    agent_class = getattr(module, class_name, None)
+
+    if not agent_class:
+        logger.warning(f"Class {class_name} not found in module {full_module_path}")
+        return None
+
+    # Validate that the class implements the AgentBase interface
+    if not isinstance(agent_class, type) or not issubclass(agent_class, AgentBase):
+        logger.warning(f"Agent {agent_name} does not implement the standard interface (AgentBase).")
+        return None
+
+    return agent_class
+
+
+class AgentRegistry(Mapping):
+    """
+    Mapping of agent names to agent classes that imports each agent on first access.
+
+    Membership tests and iteration only consult the index, so listing agents or
+    checking a flow never imports agent modules; an agent whose import failed
+    is dropped from both, as lookups report it missing. Import time of every loaded
+    agent is kept in ``import_times`` (seconds); shared dependencies are charged
+    to the first agent that imports them.
+    """
+
+    def __init__(self, index):
+        """
+        Initialize the registry.
+
+        Args:
+            index (dict): Mapping of agent name to index entry, as returned by ``load_agent_index``.
+        """
+        self._index = index
+        self._classes = {}
+        self._failed = set()
+        self.import_times = {}
+
+    def __getitem__(self, agent_name):
+        if agent_name in self._classes:
+            return self._classes[agent_name]
+        if agent_name not in self._index or agent_name in self._failed:
+            raise KeyError(agent_name)
+
+        started = time.perf_counter()
+        with tracing.span("agent.import", agent=agent_name):
+            agent_class = _load_agent_class(agent_name, self._index[agent_name])
+            if agent_class is not None:
+                tracing.instrument_models(sys.modules[agent_class.__module__])
+        self.import_times[agent_name] = time.perf_counter() - started
+
+        if agent_class is None:
+            self._failed.add(agent_name)
+            raise KeyError(agent_name)
+
+        self._classes[agent_name] = agent_class
+        logger.info(f"Successfully loaded agent: {agent_name} ({self.import_times[agent_name] * 1000:.1f} ms)")
+        return agent_class
+
+    def __contains__(self, agent_name):
+        return agent_name in self._index and agent_name not in self._failed
+
+    def __iter__(self):
+        return (agent_name for agent_name in self._index if agent_name not in self._failed)
+
+    def __len__(self):
+        return len(self._index) - len(self._failed)
+
+    def items(self):
+        """Yield ``(name, class)`` pairs, importing agents and skipping those that fail to load."""
+        for agent_name in list(self):
+            agent_class = self.get(agent_name)
+            if agent_class is not None:
+                yield agent_name, agent_class
+
+    def values(self):
+        """Yield agent classes, importing agents and skipping those that fail to load."""
+        for _, agent_class in self.items():
+            yield agent_class
+
+    def manifest(self, agent_name):
+        """Return the parsed manifest of an agent without importing it."""
+        return self._index[agent_name]["manifest"]
+
+
+@tracing.traced("discover_agents")
+def discover_agents(names=None):
+    """
+    Discover agents dynamically based on manifest files.
+
+    Agent modules are not imported here; the returned registry imports each
+    agent the first time it is looked up.
+
+    Args:
+        names (iterable, optional): Restrict the registry to these agent names.
+
+    Returns:
+        AgentRegistry: Lazy mapping of agent name to agent class.
+    """
+    index = load_agent_index()
+    if names is not None:
+        wanted = set(names)
+        index = {name: entry for name, entry in index.items() if name in wanted}
+    return AgentRegistry(index)
+
+
+_manifests = None
+
+
+def get_manifests():
+    """
+    Return every agent manifest from the persisted index.
 
-        # Construct the full module path
-        full_module_path = f"{AGENTS_DIR}.{folder}.{module_path}"
-        try:
-            # Import the module
-            module = importlib.import_module(full_module_path)
-            # Get the class from the module
-            agent_class = getattr(module, class_name, None)
+    The index is read once per process, so runtime policies declared in
+    manifests (cache TTL, rate limits, ...) can be looked up on every call.
 
-            if not agent_class:
-                logger.warning(f"Class {class_name} not found in module {full_module_path}")
-                continue
+    Returns:
+        dict: Parsed manifests keyed by agent name.
+    """
+    global _manifests
+    if _manifests is None:
+        _manifests = {name: entry["manifest"] for name, entry in load_agent_index().items()}
+    return _manifests
 
-            # Validate that the class implements the AgentBase interface
-            if not issubclass(agent_class, AgentBase):
-                logger.warning(f"Agent {agent_name} does not implement the standard interface (AgentBase).")
-                continue
 
-            agents[agent_name] = agent_class
-            logger.info(f"Successfully loaded agent: {agent_name}")
-        except ImportError as e:
-            logger.error(f"Failed to import module {full_module_path}: {e}")
+def get_manifest(agent_name):
+    """
+    Return the manifest of an agent, see ``get_manifests``.
 
-    return agents
+    Args:
+        agent_name (str): Name of the agent.
 
+    Returns:
+        dict: The parsed manifest, or an empty dict for unknown agents.
+    """
+    return get_manifests().get(agent_name, {})
@@ -1,26 +1,547 @@
 import json
+import asyncio
+import contextvars
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, as_completed, wait
+from core import cache, deadline, metrics, singleflight, tracing, transport
+from core.base import is_async_agent, is_streaming_agent
+from core.context import agent_scope
+from core.deadline import deadline_scope
+from core.discovery import get_manifest
 
-def execute_agent_flow(flow, agents, params):
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_MAX_CONCURRENCY = 100
+
+
+def invoke_agent(agent_name, agent_instance, kwargs):
+    """
+    Execute an already instantiated agent.
+
+    This is the single execution path shared by flows, the agent server and
+    batches. Agents declaring a ``cache`` section in their manifest are served
+    from the response cache while the entry is fresh. On a miss, identical
+    concurrent calls share one execution unless the manifest sets
+    ``"single_flight": false`` (agents with side effects).
+
+    Args:
+        agent_name (str): Name of the agent.
+        agent_instance (AgentBase): The agent to execute.
+        kwargs (dict): Keyword arguments passed to ``execute``.
+
+    Returns:
+        Any: The agent result.
+    """
+    manifest = get_manifest(agent_name)
+
+    def call():
+        return singleflight.shared_call(agent_name, kwargs, lambda: agent_instance.execute(**kwargs),
+                                        enabled=manifest.get("single_flight", True))
+
+    with agent_scope(agent_name, agent_instance), metrics.track_agent(agent_name) as observed, \
+            tracing.span("agent.execute", agent=agent_name):
+        observed["result"] = cache.cached_call(agent_name, kwargs, manifest.get("cache"), call)
+    return observed["result"]
+
+
+async def ainvoke_agent(agent_name, agent_instance, kwargs):
+    """
+    Await an agent's ``aexecute`` through the same response cache, single
+    flight, metrics and tracing as ``invoke_agent``.
+
+    Args:
+        agent_name (str): Name of the agent.
+        agent_instance (AgentBase): The agent to execute, see ``is_async_agent``.
+        kwargs (dict): Keyword arguments passed to ``aexecute``.
+
+    Returns:
+        Any: The agent result.
+    """
+    manifest = get_manifest(agent_name)
+
+    async def call():
+        return await singleflight.ashared_call(agent_name, kwargs, lambda: agent_instance.aexecute(**kwargs),
+                                               enabled=manifest.get("single_flight", True))
+
+    with agent_scope(agent_name, agent_instance), metrics.track_agent(agent_name) as observed, \
+            tracing.span("agent.execute", agent=agent_name):
+        observed["result"] = await cache.acached_call(agent_name, kwargs, manifest.get("cache"), call)
+    return observed["result"]
+
+
+def write_record(sink, record):
+    """Write a record to a sink as one NDJSON line and flush it."""
+    sink.write(json.dumps(record, default=str) + "\n")
+    sink.flush()
+
+
+def stream_agent(agent_name, agent_instance, kwargs, emit):
+    """
+    Execute a streaming agent, passing each record to ``emit`` as it is yielded.
+
+    Records are neither cached nor shared between identical calls, and the
+    deadline of the step is checked between records.
+
+    Args:
+        agent_name (str): Name of the agent.
+        agent_instance (AgentBase): The agent to execute, see ``is_streaming_agent``.
+        kwargs (dict): Keyword arguments passed to ``stream``.
+        emit (callable): Called with every record.
+
+    Returns:
+        int: Number of records emitted.
+
+    Raises:
+        DeadlineExceeded: If the deadline passes before the stream ends.
+    """
+    count = 0
+    with agent_scope(agent_name, agent_instance), metrics.track_agent(agent_name) as observed, \
+            tracing.span("agent.execute", agent=agent_name, streamed=True):
+        for record in agent_instance.stream(**kwargs):
+            deadline.check()
+            emit(record)
+            count += 1
+        observed["result"] = {"streamed": count}
+    return count
+
+
+def _report(message, sink=None):
+    """Print progress, to stderr when results are streamed so that the NDJSON stays clean."""
+    print(message, file=sys.stderr if sink is not None else sys.stdout)
+
+
+def _run_agent(agent_name, agent_class, kwargs, timeout=None, sink=None):
+    """
+    Instantiate an agent and execute it with the given parameters.
+
+    Args:
+        agent_name (str): Name of the agent, used for progress output.
+        agent_class (type): The agent class to instantiate.
+        kwargs (dict): Keyword arguments passed to ``execute``.
+        timeout (float, optional): Deadline of the step in seconds.
+        sink (file, optional): Stream output as NDJSON to this file instead of
+            printing the result, see ``execute_agent_flow``.
+
+    Returns:
+        Any: The agent result, or ``{"streamed": count}`` for a streamed agent.
+    """
+    with tracing.span("agent", agent=agent_name):
+        with tracing.span("agent.instantiate", agent=agent_name):
+            agent_instance = agent_class()
+        _report(f"Executing {agent_name}...", sink)
+        if sink is not None and is_streaming_agent(agent_instance):
+            with deadline_scope(timeout):
+                count = stream_agent(agent_name, agent_instance, kwargs,
+                                     lambda record: write_record(sink, {"agent": agent_name, "record": record}))
+            return {"streamed": count}
+        with deadline_scope(timeout):
+            result = invoke_agent(agent_name, agent_instance, kwargs)
+        with tracing.span("agent.output", agent=agent_name):
+            if sink is None:
+                print(f"Result from {agent_name}: {result}")
+            else:
+                write_record(sink, {"agent": agent_name, "result": result})
+    return result
+
+
+def _invoke_step(agent_name, agent_class, kwargs, timeout=None):
+    """Instantiate an agent and execute it within ``timeout`` seconds, leaving the output to the caller."""
+    with tracing.span("agent", agent=agent_name):
+        with tracing.span("agent.instantiate", agent=agent_name):
+            agent_instance = agent_class()
+        _report(f"Executing {agent_name}...")
+        with deadline_scope(timeout):
+            return invoke_agent(agent_name, agent_instance, kwargs)
+
+
+async def _arun_agent(agent_name, agent_class, kwargs, pool, semaphore, timeout=None):
+    """
+    Run an agent from the event loop.
+
+    Agents with a native ``aexecute`` are awaited on the loop through
+    ``ainvoke_agent``, bounded by ``semaphore``; synchronous agents run
+    ``execute`` on the thread pool through ``invoke_agent``. Results are
+    returned, not printed.
+
+    Args:
+        agent_name (str): Name of the agent, used for progress output.
+        agent_class (type): The agent class to instantiate.
+        kwargs (dict): Keyword arguments passed to the agent.
+        pool (ThreadPoolExecutor): Pool used for synchronous agents.
+        semaphore (asyncio.Semaphore): Bound on in-flight async agents.
+        timeout (float, optional): Deadline of the step in seconds.
+
+    Returns:
+        Any: The agent result.
+
+    Raises:
+        asyncio.TimeoutError: If an async agent outlives its deadline.
+    """
+    if not is_async_agent(agent_class):
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(pool, context.run, _invoke_step, agent_name, agent_class, kwargs, timeout)
+
+    async with semaphore:
+        with tracing.span("agent", agent=agent_name):
+            with tracing.span("agent.instantiate", agent=agent_name):
+                agent_instance = agent_class()
+            _report(f"Executing {agent_name}...")
+            with deadline_scope(timeout):
+                return await asyncio.wait_for(ainvoke_agent(agent_name, agent_instance, kwargs),
+                                              deadline.remaining())
+
+
+def execute_agent_flow(flow, agents, params, timeout=None, step_timeout=None, sink=None):
     """
     Execute agents in the specified order.
 
+    HTTP calls made through the shared transport end by the deadline of the
+    flow and of their step. Once the flow deadline has passed the remaining
+    agents are skipped and the results gathered so far are returned.
+
+    With a ``sink``, output is streamed as NDJSON instead of printed: agents
+    implementing ``stream`` write one ``{"agent", "record"}`` line per record
+    as it is yielded, without holding the whole result in memory; the others
+    write one ``{"agent", "result"}`` line, and failures an ``{"agent", "error"}``
+    line. Progress messages go to stderr.
+
     Args:
         flow (list): List of agent names in execution order.
         agents (dict): Dictionary of discovered agents.
         params (str): Parameters in JSON format to pass to agents.
+        timeout (float, optional): Deadline of the whole flow in seconds.
+        step_timeout (float, optional): Deadline of each agent in seconds.
+        sink (file, optional): File receiving the NDJSON output, e.g. ``sys.stdout``.
+
+    Returns:
+        dict: Results keyed by agent name for the agents that succeeded;
+        streamed agents report ``{"streamed": count}``.
     """
     param_dict = json.loads(params) if params else {}
-    for agent_name in flow:
-        agent_class = agents.get(agent_name)
+    results = {}
+    with deadline_scope(timeout), tracing.span("flow", mode="sequential", agents=",".join(flow)):
+        for agent_name in flow:
+            if deadline.expired():
+                _report(f"Deadline reached, skipping {agent_name}.", sink)
+                continue
+
+            agent_class = agents.get(agent_name)
+            if not agent_class:
+                _report(f"Agent {agent_name} not found.", sink)
+                continue
+
+            # Instantiate and execute the agent
+            try:
+                results[agent_name] = _run_agent(agent_name, agent_class, param_dict, step_timeout, sink)
+            except Exception as e:
+                _report(f"Error executing {agent_name}: {e}", sink)
+                if sink is not None:
+                    write_record(sink, {"agent": agent_name, "error": str(e)})
+    return results
+
+
+def build_flow_spec(spec):
+    """
+    Validate a flow specification and return its steps in declaration order.
+
+    A spec is a dict with a ``steps`` list (or the list itself). Each step has:
+
+    - ``id`` (str, optional): Unique step id, defaults to the agent name.
+    - ``agent`` (str): Name of the agent to run.
+    - ``params`` (dict, optional): Parameters merged over the flow parameters.
+    - ``timeout`` (float, optional): Deadline of the step in seconds.
+    - ``depends_on`` (list, optional): Ids of steps that must finish first.
+    - ``inputs`` (dict, optional): Maps an ``execute`` keyword to the id of the
+      step whose result it receives. Input steps are implicit dependencies.
+
+    Args:
+        spec (dict | list): The flow specification.
+
+    Returns:
+        dict: Normalized steps keyed by step id.
+
+    Raises:
+        ValueError: If a step is malformed, ids collide, a dependency is unknown
+            or the dependencies contain a cycle.
+    """
+    raw_steps = spec.get("steps", []) if isinstance(spec, dict) else spec
+    steps = {}
+    for raw in raw_steps:
+        if isinstance(raw, str):
+            raw = {"agent": raw}
+        agent_name = raw.get("agent")
+        if not agent_name:
+            raise ValueError(f"Flow step is missing an agent: {raw}")
+        step_id = raw.get("id", agent_name)
+        if step_id in steps:
+            raise ValueError(f"Duplicate flow step id: {step_id}")
+        inputs = dict(raw.get("inputs", {}))
+        steps[step_id] = {
+            "id": step_id,
+            "agent": agent_name,
+            "params": dict(raw.get("params", {})),
+            "timeout": raw.get("timeout"),
+            "inputs": inputs,
+            "depends_on": set(raw.get("depends_on", [])) | set(inputs.values()),
+        }
+
+    for step in steps.values():
+        unknown = step["depends_on"] - set(steps)
+        if unknown:
+            raise ValueError(f"Step {step['id']} depends on unknown steps: {', '.join(sorted(unknown))}")
+
+    # Kahn's algorithm; anything left unvisited is part of a cycle.
+    remaining = {step_id: set(step["depends_on"]) for step_id, step in steps.items()}
+    ready = [step_id for step_id, deps in remaining.items() if not deps]
+    while ready:
+        done = ready.pop()
+        del remaining[done]
+        for step_id, deps in remaining.items():
+            if done in deps:
+                deps.discard(done)
+                if not deps:
+                    ready.append(step_id)
+    if remaining:
+        raise ValueError(f"Flow has a dependency cycle between: {', '.join(sorted(remaining))}")
+
+    return steps
+
+
+def execute_agent_dag(spec, agents, params, max_workers=DEFAULT_MAX_WORKERS, timeout=None, step_timeout=None):
+    """
+    Execute a flow of dependent steps concurrently on a bounded thread pool.
+
+    A step is submitted as soon as every step it depends on has succeeded, so
+    independent network-bound agents overlap and the wall time approaches the
+    slowest dependency chain rather than the sum of all agents. Steps whose
+    dependencies failed are skipped. When the flow deadline passes, steps still
+    running are abandoned and the results gathered so far are returned.
+
+    Args:
+        spec (dict | list): Flow specification, see ``build_flow_spec``.
+        agents (dict): Dictionary of discovered agents.
+        params (str): Parameters in JSON format shared by every step.
+        max_workers (int): Maximum number of agents running at once.
+        timeout (float, optional): Deadline of the whole flow in seconds.
+        step_timeout (float, optional): Deadline of each step without its own ``timeout``.
+
+    Returns:
+        dict: Results keyed by step id for the steps that succeeded.
+    """
+    steps = build_flow_spec(spec)
+    param_dict = json.loads(params) if params else {}
+    results = {}
+    failed = set()
+    pending = dict(steps)
+    running = {}
+
+    def submit_ready(pool):
+        # Repeat until stable: a skipped step can make its dependents skippable.
+        progressed = True
+        while progressed:
+            progressed = False
+            for step_id, step in list(pending.items()):
+                if step["depends_on"] & failed:
+                    del pending[step_id]
+                    failed.add(step_id)
+                    progressed = True
+                    print(f"Skipping {step_id}: a dependency failed.")
+                    continue
+                if not step["depends_on"] <= set(results):
+                    continue
+
+                del pending[step_id]
+                progressed = True
+                agent_class = agents.get(step["agent"])
+                if not agent_class:
+                    print(f"Agent {step['agent']} not found.")
+                    failed.add(step_id)
+                    continue
+
+                kwargs = {**param_dict, **step["params"]}
+                kwargs.update({name: results[source] for name, source in step["inputs"].items()})
+                step_deadline = step["timeout"] if step["timeout"] is not None else step_timeout
+                # Each step runs in a copy of this context so it inherits the flow deadline.
+                future = pool.submit(contextvars.copy_context().run, _run_agent, step["agent"], agent_class, kwargs,
+                                     step_deadline)
+                running[future] = step_id
+
+    pool = ThreadPoolExecutor(max_workers=max_workers)
+    with deadline_scope(timeout), tracing.span("flow", mode="dag", steps=len(steps)):
+        try:
+            submit_ready(pool)
+            while running:
+                done, _ = wait(running, timeout=deadline.remaining(), return_when=FIRST_COMPLETED)
+                if not done:
+                    print(f"Deadline reached, abandoning: {', '.join(sorted(running.values()))}.")
+                    break
+                for future in done:
+                    step_id = running.pop(future)
+                    try:
+                        results[step_id] = future.result()
+                    except Exception as e:
+                        failed.add(step_id)
+                        print(f"Error executing {steps[step_id]['agent']}: {e}")
+                submit_ready(pool)
+        finally:
+            pool.shutdown(wait=not running, cancel_futures=True)
+
+    return results
+
+
+async def aexecute_agent_dag(spec, agents, params, max_workers=DEFAULT_MAX_WORKERS,
+                             max_concurrency=DEFAULT_MAX_CONCURRENCY, timeout=None, step_timeout=None):
+    """
+    Execute a flow of dependent steps on a single event loop.
+
+    Async-capable agents share the loop, so hundreds of their calls can be in
+    flight without a thread each; synchronous agents are wrapped in a bounded
+    thread pool. Scheduling, skipping and deadlines follow ``execute_agent_dag``.
+
+    Args:
+        spec (dict | list): Flow specification, see ``build_flow_spec``.
+        agents (dict): Dictionary of discovered agents.
+        params (str): Parameters in JSON format shared by every step.
+        max_workers (int): Threads available to synchronous agents.
+        max_concurrency (int): Maximum number of async agents in flight.
+        timeout (float, optional): Deadline of the whole flow in seconds.
+        step_timeout (float, optional): Deadline of each step without its own ``timeout``.
+
+    Returns:
+        dict: Results keyed by step id for the steps that succeeded.
+    """
+    steps = build_flow_spec(spec)
+    param_dict = json.loads(params) if params else {}
+    semaphore = asyncio.Semaphore(max_concurrency)
+    results = {}
+    tasks = {}
+
+    async def run_step(step):
+        # Every task is created before the loop runs any of them.
+        succeeded = [await tasks[dep] for dep in step["depends_on"]]
+        if not all(succeeded):
+            print(f"Skipping {step['id']}: a dependency failed.")
+            return False
+
+        agent_class = agents.get(step["agent"])
         if not agent_class:
-            print(f"Agent {agent_name} not found.")
-            continue
+            print(f"Agent {step['agent']} not found.")
+            return False
 
-        # Instantiate and execute the agent
+        kwargs = {**param_dict, **step["params"]}
+        kwargs.update({name: results[source] for name, source in step["inputs"].items()})
+        step_deadline = step["timeout"] if step["timeout"] is not None else step_timeout
         try:
-            agent_instance = agent_class()
-            print(f"Executing {agent_name}...")
-            result = agent_instance.execute(**param_dict)
-            print(f"Result from {agent_name}: {result}")
+            results[step["id"]] = await _arun_agent(step["agent"], agent_class, kwargs, pool, semaphore,
+                                                    step_deadline)
+            return True
         except Exception as e:
-            print(f"Error executing {agent_name}: {e}")
+            print(f"Error executing {step['agent']}: {e}")
+            return False
+
+    pool = ThreadPoolExecutor(max_workers=max_workers)
+    unfinished = set()
+    with deadline_scope(timeout), tracing.span("flow", mode="async", steps=len(steps)):
+        try:
+            # Tasks copy the current context, deadline included, when they are created.
+            for step_id, step in steps.items():
+                tasks[step_id] = asyncio.ensure_future(run_step(step))
+            if tasks:
+                _, unfinished = await asyncio.wait(tasks.values(), timeout=deadline.remaining())
+            if unfinished:
+                abandoned = [step_id for step_id, task in tasks.items() if task in unfinished]
+                print(f"Deadline reached, abandoning: {', '.join(sorted(abandoned))}.")
+                for task in unfinished:
+                    task.cancel()
+        finally:
+            pool.shutdown(wait=not unfinished, cancel_futures=True)
+            await transport.get_transport().aclose()
+
+    return results
+
+
+def _run_batch_record(agent_name, agent_class, local, index, line, base_params, timeout=None):
+    """
+    Execute one batch record on the calling thread's agent instance, within ``timeout`` seconds.
+
+    Returns:
+        dict: ``{"index", "status", "result"}`` or ``{"index", "status", "error"}``.
+    """
+    try:
+        kwargs = json.loads(line)
+        if not isinstance(kwargs, dict):
+            raise ValueError("record must be a JSON object")
+        if not hasattr(local, "agent_instance"):
+            local.agent_instance = agent_class()
+        with deadline_scope(timeout):
+            result = invoke_agent(agent_name, local.agent_instance, {**base_params, **kwargs})
+        return {"index": index, "status": "success", "result": result}
+    except Exception as e:
+        return {"index": index, "status": "failed", "error": str(e)}
+
+
+def execute_agent_batch(agent_name, agents, records, params="", max_workers=DEFAULT_MAX_WORKERS,
+                        ordered=True, timeout=None):
+    """
+    Execute one agent over many parameter sets in a single process.
+
+    Each worker thread keeps its own agent instance. Records are read lazily
+    and at most ``2 * max_workers`` are submitted ahead of completion, so large
+    inputs stream through without being loaded up front. A failing record yields an error
+    outcome instead of aborting the batch.
+
+    Args:
+        agent_name (str): Name of the agent to run.
+        agents (dict): Dictionary of discovered agents.
+        records (iterable): JSON objects, one per line, with the agent parameters.
+        params (str): Parameters in JSON format shared by every record; record
+            values take precedence.
+        max_workers (int): Maximum number of records executing at once.
+        ordered (bool): Yield outcomes in input order instead of completion order.
+        timeout (float, optional): Deadline of each record in seconds.
+
+    Yields:
+        dict: One outcome per non-blank record, with its zero-based ``index``.
+
+    Raises:
+        ValueError: If the agent does not exist.
+    """
+    agent_class = agents.get(agent_name)
+    if not agent_class:
+        raise ValueError(f"Agent {agent_name} not found.")
+
+    base_params = json.loads(params) if params else {}
+    local = threading.local()
+    lines = (line for line in records if line.strip())
+    running = set()
+    finished = {}
+    next_index = 0
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for index, line in enumerate(lines):
+            running.add(pool.submit(_run_batch_record, agent_name, agent_class, local, index, line,
+                                     base_params, timeout))
+            if len(running) < 2 * max_workers:
+                continue
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                outcome = future.result()
+                finished[outcome["index"]] = outcome
+            if not ordered:
+                yield from finished.values()
+                finished.clear()
+                continue
+            while next_index in finished:
+                yield finished.pop(next_index)
+                next_index += 1
+
+        for future in as_completed(running):
+            outcome = future.result()
+            if not ordered:
+                yield outcome
+                continue
+            finished[outcome["index"]] = outcome
+            while next_index in finished:
+                yield finished.pop(next_index)
+                next_index += 1
@@ -0,0 +1,283 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from core import breaker
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# Metric name -> (type, help text), in exposition order.
+METRICS = {
+    "plugflow_agent_duration_seconds": ("histogram", "Agent execution latency, cache hits included."),
+    "plugflow_agent_calls_total": ("counter", "Agent executions by outcome."),
+    "plugflow_agent_errors_total": ("counter", "Failed agent executions by error type."),
+    "plugflow_cache_requests_total": ("counter", "Response cache lookups by result."),
+    "plugflow_http_request_duration_seconds": ("histogram", "Latency of single HTTP attempts."),
+    "plugflow_http_requests_total": ("counter", "HTTP attempts by response status class."),
+    "plugflow_http_errors_total": ("counter", "HTTP attempts that raised, by error type."),
+    "plugflow_http_response_bytes": ("histogram", "Size of HTTP response bodies."),
+    "plugflow_http_retries_total": ("counter", "HTTP attempts made after the first one."),
+}
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus sense."""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+        self.max = max(self.max, value)
+
+    def quantile(self, q):
+        """Return the upper bound of the bucket holding quantile ``q``, or the maximum."""
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "mean": self.sum / self.count if self.count else 0.0,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "max": self.max,
+        }
+
+
+class Registry:
+    """
+    Thread-safe store of counters and histograms keyed by metric name and labels.
+
+    Labels are passed as keyword arguments and kept in sorted order, so the
+    same series is found whatever order the caller spells them in.
+    """
+
+    def __init__(self):
+        self._counters = {}
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _series(name, labels):
+        return name, tuple(sorted((key, "" if value is None else str(value)) for key, value in labels.items()))
+
+    def inc(self, name, amount=1, **labels):
+        """Add ``amount`` to a counter."""
+        series = self._series(name, labels)
+        with self._lock:
+            self._counters[series] = self._counters.get(series, 0) + amount
+
+    def observe(self, name, value, buckets=LATENCY_BUCKETS, **labels):
+        """Record a value in a histogram."""
+        series = self._series(name, labels)
+        with self._lock:
+            histogram = self._histograms.get(series)
+            if histogram is None:
+                histogram = self._histograms[series] = Histogram(buckets)
+            histogram.observe(value)
+
+    def clear(self):
+        """Drop every series."""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def render(self):
+        """
+        Return every series in the Prometheus text exposition format (version 0.0.4).
+
+        Circuit breaker state is appended as ``plugflow_circuit_open`` gauges.
+        """
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {series: (h.buckets, list(h.counts), h.sum, h.count)
+                          for series, h in self._histograms.items()}
+
+        lines = []
+        for name, (kind, help_text) in METRICS.items():
+            if kind == "counter":
+                series = sorted((labels, value) for (metric, labels), value in counters.items() if metric == name)
+            else:
+                series = sorted((labels, value) for (metric, labels), value in histograms.items() if metric == name)
+            if not series:
+                continue
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in series:
+                if kind == "counter":
+                    lines.append(f"{name}{_format_labels(labels)} {value}")
+                    continue
+                buckets, counts, total, count = value
+                cumulative = 0
+                for bound, bucket_count in zip(buckets + (float("inf"),), counts):
+                    cumulative += bucket_count
+                    le = "+Inf" if bound == float("inf") else repr(float(bound))
+                    lines.append(f"{name}_bucket{_format_labels(labels + (('le', le),))} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {total}")
+                lines.append(f"{name}_count{_format_labels(labels)} {count}")
+
+        circuits = breaker.snapshot()
+        if circuits:
+            lines.append("# HELP plugflow_circuit_open Whether the circuit of a host is open (1) or half-open (0.5).")
+            lines.append("# TYPE plugflow_circuit_open gauge")
+            for host, state in sorted(circuits.items()):
+                value = {breaker.OPEN: 1, breaker.HALF_OPEN: 0.5}.get(state["state"], 0)
+                lines.append(f"plugflow_circuit_open{_format_labels((('host', host),))} {value}")
+            lines.append("# HELP plugflow_circuit_rejected_total Calls failed fast by an open circuit.")
+            lines.append("# TYPE plugflow_circuit_rejected_total counter")
+            for host, state in sorted(circuits.items()):
+                lines.append(f"plugflow_circuit_rejected_total{_format_labels((('host', host),))} {state['rejected']}")
+        return "\n".join(lines) + "\n"
+
+    def summary(self):
+        """
+        Return a JSON-serializable digest of the recorded metrics.
+
+        Returns:
+            dict: ``{"agents": {...}, "hosts": {...}}`` with call counts, errors
+            by type, latency statistics, cache hit rate, response sizes and retries.
+        """
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {series: h.summary() for series, h in self._histograms.items()}
+
+        agents = {}
+        hosts = {}
+        for (name, labels), value in counters.items():
+            labels = dict(labels)
+            if name == "plugflow_agent_calls_total":
+                agent = agents.setdefault(labels["agent"], {})
+                agent[labels["outcome"]] = agent.get(labels["outcome"], 0) + value
+            elif name == "plugflow_agent_errors_total":
+                agents.setdefault(labels["agent"], {}).setdefault("errors", {})[labels["type"]] = value
+            elif name == "plugflow_cache_requests_total":
+                cache = agents.setdefault(labels["agent"], {}).setdefault("cache", {"hit": 0, "miss": 0})
+                cache[labels["result"]] += value
+            elif name == "plugflow_http_requests_total":
+                statuses = hosts.setdefault(labels["host"], {}).setdefault("statuses", {})
+                statuses[labels["status"]] = statuses.get(labels["status"], 0) + value
+            elif name == "plugflow_http_errors_total":
+                errors = hosts.setdefault(labels["host"], {}).setdefault("errors", {})
+                errors[labels["type"]] = errors.get(labels["type"], 0) + value
+            elif name == "plugflow_http_retries_total":
+                host = hosts.setdefault(labels["host"], {})
+                host["retries"] = host.get("retries", 0) + value
+        for (name, labels), value in histograms.items():
+            labels = dict(labels)
+            if name == "plugflow_agent_duration_seconds":
+                agents.setdefault(labels["agent"], {})["latency"] = value
+            elif name == "plugflow_http_request_duration_seconds":
+                hosts.setdefault(labels["host"], {}).setdefault("latency", {})[labels["agent"] or "-"] = value
+            elif name == "plugflow_http_response_bytes":
+                hosts.setdefault(labels["host"], {}).setdefault("response_bytes", {})[labels["agent"] or "-"] = value
+        for agent in agents.values():
+            cache = agent.get("cache")
+            if cache:
+                cache["hit_rate"] = cache["hit"] / (cache["hit"] + cache["miss"])
+        return {"agents": agents, "hosts": hosts}
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+def _is_error_result(result):
+    """Tell whether an agent reported a failure in its result instead of raising."""
+    return isinstance(result, dict) and ("error" in result or result.get("status") in ("error", "failed"))
+
+
+_registry = Registry()
+
+
+def get_registry():
+    """Return the process-wide metrics registry."""
+    return _registry
+
+
+@contextmanager
+def track_agent(agent_name):
+    """
+    Record the latency and outcome of an agent execution.
+
+    The enclosed code stores the agent result under ``"result"`` in the yielded
+    dict. Exceptions are counted by type and re-raised; results carrying an
+    ``error`` key are counted as ``ErrorResult``.
+
+    Args:
+        agent_name (str): Name of the agent.
+    """
+    observed = {}
+    started = time.perf_counter()
+    try:
+        yield observed
+    except Exception as e:
+        _record_agent(agent_name, started, type(e).__name__)
+        raise
+    _record_agent(agent_name, started, "ErrorResult" if _is_error_result(observed.get("result")) else None)
+
+
+def _record_agent(agent_name, started, error_type):
+    _registry.observe("plugflow_agent_duration_seconds", time.perf_counter() - started, agent=agent_name)
+    _registry.inc("plugflow_agent_calls_total", agent=agent_name, outcome="error" if error_type else "success")
+    if error_type:
+        _registry.inc("plugflow_agent_errors_total", agent=agent_name, type=error_type)
+
+
+def record_cache(agent_name, hit):
+    """Count a response cache lookup of an agent."""
+    _registry.inc("plugflow_cache_requests_total", agent=agent_name, result="hit" if hit else "miss")
+
+
+def record_http(host, agent_name, seconds, status=None, size=None, error=None):
+    """
+    Record one HTTP attempt.
+
+    Args:
+        host (str): Upstream host.
+        agent_name (str): Agent making the call, or None.
+        seconds (float): Time spent on the attempt.
+        status (int, optional): Response status code.
+        size (int, optional): Response body size in bytes, when known.
+        error (Exception, optional): The error raised instead of a response.
+    """
+    _registry.observe("plugflow_http_request_duration_seconds", seconds, host=host, agent=agent_name)
+    if error is not None:
+        _registry.inc("plugflow_http_errors_total", host=host, agent=agent_name, type=type(error).__name__)
+        return
+    _registry.inc("plugflow_http_requests_total", host=host, agent=agent_name, status=f"{status // 100}xx")
+    if size is not None:
+        _registry.observe("plugflow_http_response_bytes", size, buckets=SIZE_BUCKETS, host=host, agent=agent_name)
+
+
+def record_retry(host, agent_name):
+    """Count an HTTP attempt made after the first one."""
+    _registry.inc("plugflow_http_retries_total", host=host, agent=agent_name)
+
+
+def render():
+    """Return the process-wide metrics in the Prometheus text format."""
+    return _registry.render()
+
+
+def summary():
+    """Return a JSON summary of the process-wide metrics, see ``Registry.summary``."""
+    return _registry.summary()
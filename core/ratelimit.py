@@ -0,0 +1,269 @@
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+import requests
+from core import deadline
+from core.discovery import get_manifests
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WAIT = 60.0     # Longest a call queues for a token before failing, in seconds
+
+# Request headers and query parameters that carry the caller's API key.
+KEY_HEADERS = ("x-rapidapi-key", "x-apisports-key", "x-api-key", "authorization")
+KEY_PARAMS = ("apikey", "api_key", "access_key", "key")
+
+
+class RateLimitExceeded(requests.RequestException):
+    """Raised when a call cannot be scheduled within the configured limits."""
+
+
+class TokenBucket:
+    """
+    Token bucket refilled at ``rate`` tokens per second up to ``capacity``.
+
+    Callers reserve a token even when the bucket is empty and then sleep until
+    it would have been refilled, so waiting calls are served in arrival order
+    at exactly the allowed rate.
+    """
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    def reserve(self, max_wait):
+        """
+        Take a token and return how long the caller must wait before using it.
+
+        Must be called with the owning limiter's lock held.
+
+        Raises:
+            RateLimitExceeded: If the wait would exceed ``max_wait``.
+        """
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        wait = max(0.0, (1 - self.tokens) / self.rate)
+        if wait > max_wait:
+            raise RateLimitExceeded(f"rate limit would delay the call by {wait:.1f}s")
+        self.tokens -= 1
+        return wait
+
+
+class DailyQuota:
+    """Call counter reset at midnight UTC, as RapidAPI and API-Sports quotas are."""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.day = None
+        self.used = 0
+
+    def take(self):
+        """
+        Count one call. Must be called with the owning limiter's lock held.
+
+        Raises:
+            RateLimitExceeded: If the quota of the current day is used up.
+        """
+        today = datetime.now(timezone.utc).date()
+        if today != self.day:
+            self.day, self.used = today, 0
+        if self.used >= self.limit:
+            raise RateLimitExceeded(f"daily quota of {self.limit} calls is used up")
+        self.used += 1
+
+
+class RateLimiter:
+    """
+    Per-host, per-API-key rate limiter.
+
+    Limits are configured per host with any of ``per_second``, ``per_minute``
+    (token buckets, ``burst`` overrides their capacity) and ``per_day`` (a
+    quota). Calls over a rate wait for a token; calls over the daily quota, or
+    that would wait longer than ``max_wait`` or past the current deadline,
+    raise ``RateLimitExceeded``.
+    Each API key gets its own buckets, since providers meter per key.
+    """
+
+    def __init__(self, max_wait=DEFAULT_MAX_WAIT):
+        self.max_wait = max_wait
+        self._limits = {}
+        self._state = {}
+        self._lock = threading.Lock()
+
+    def configure(self, host, **limits):
+        """
+        Set the limits of a host, dropping its current state.
+
+        Args:
+            host (str): Host name, e.g. ``"v3.football.api-sports.io"``.
+            **limits: ``per_second``, ``per_minute``, ``per_day``, ``burst``.
+        """
+        with self._lock:
+            self._limits[host] = limits
+            self._state = {key: state for key, state in self._state.items() if key[0] != host}
+
+    def limits(self, host):
+        """Return the configured limits of a host, or None."""
+        return self._limits.get(host)
+
+    def _new_state(self, limits):
+        buckets = []
+        for name, period in (("per_second", 1), ("per_minute", 60)):
+            if limits.get(name):
+                rate = limits[name] / period
+                buckets.append(TokenBucket(rate, limits.get("burst", limits[name])))
+        quota = DailyQuota(limits["per_day"]) if limits.get("per_day") else None
+        return {"buckets": buckets, "quota": quota, "calls": 0, "waited": 0.0}
+
+    def reserve(self, host, api_key=None):
+        """
+        Take the tokens of a call to ``host`` with ``api_key`` without waiting.
+
+        Args:
+            host (str): Host being called.
+            api_key (str, optional): Key the call is metered against.
+
+        Returns:
+            float: Seconds the caller must wait before making the call.
+
+        Raises:
+            RateLimitExceeded: If the call cannot be made within the limits, or
+                before the current deadline.
+        """
+        limits = self._limits.get(host)
+        if not limits:
+            return 0.0
+
+        key = (host, _key_id(api_key))
+        left = deadline.remaining()
+        max_wait = self.max_wait if left is None else min(self.max_wait, left)
+        with self._lock:
+            state = self._state.get(key)
+            if state is None:
+                state = self._state[key] = self._new_state(limits)
+            if state["quota"] is not None:
+                state["quota"].take()
+            reserved = []
+            try:
+                for bucket in state["buckets"]:
+                    reserved.append(bucket.reserve(max_wait))
+            except RateLimitExceeded:
+                # Give back what this call took so a rejected call costs nothing.
+                for bucket in state["buckets"][:len(reserved)]:
+                    bucket.tokens += 1
+                if state["quota"] is not None:
+                    state["quota"].used -= 1
+                raise
+            wait = max(reserved, default=0.0)
+            state["calls"] += 1
+            state["waited"] += wait
+
+        if wait:
+            logger.debug(f"Rate limit for {host}: waiting {wait:.2f}s")
+        return wait
+
+    def acquire(self, host, api_key=None):
+        """
+        Block until a call to ``host`` with ``api_key`` is allowed, see ``reserve``.
+
+        Returns:
+            float: Seconds the call waited.
+        """
+        wait = self.reserve(host, api_key)
+        if wait:
+            time.sleep(wait)
+        return wait
+
+    async def aacquire(self, host, api_key=None):
+        """Wait without blocking the event loop until a call is allowed, see ``reserve``."""
+        wait = self.reserve(host, api_key)
+        if wait:
+            await asyncio.sleep(wait)
+        return wait
+
+    def snapshot(self):
+        """
+        Return the current consumption of every metered host and key.
+
+        Returns:
+            dict: ``{host: {key_id: {"calls", "waited", "used_today", "per_day", "tokens"}}}``;
+                key ids are short hashes, never the keys themselves.
+        """
+        report = {}
+        with self._lock:
+            for (host, key_id), state in self._state.items():
+                quota = state["quota"]
+                report.setdefault(host, {})[key_id] = {
+                    "calls": state["calls"],
+                    "waited": round(state["waited"], 3),
+                    "used_today": quota.used if quota else None,
+                    "per_day": quota.limit if quota else None,
+                    "tokens": [round(bucket.tokens, 2) for bucket in state["buckets"]],
+                }
+        return report
+
+
+def _key_id(api_key):
+    """Return a short, non-reversible id for an API key."""
+    if not api_key:
+        return "anonymous"
+    return hashlib.sha256(str(api_key).encode("utf-8")).hexdigest()[:8]
+
+
+def request_api_key(kwargs):
+    """
+    Find the API key of an outgoing request from its headers or query parameters.
+
+    Args:
+        kwargs (dict): Keyword arguments of a ``requests`` call.
+
+    Returns:
+        str: The key, or None.
+    """
+    headers = {name.lower(): value for name, value in (kwargs.get("headers") or {}).items()}
+    for name in KEY_HEADERS:
+        if headers.get(name):
+            return headers[name]
+    params = kwargs.get("params")
+    if isinstance(params, dict):
+        for name in KEY_PARAMS:
+            if params.get(name):
+                return params[name]
+    return None
+
+
+def _load_manifest_limits(limiter):
+    """Configure a limiter from the ``rate_limits`` section of every manifest."""
+    for agent_name, manifest in get_manifests().items():
+        for host, limits in manifest.get("rate_limits", {}).items():
+            known = limiter.limits(host)
+            if known is not None and known != limits:
+                logger.warning(f"Agent {agent_name} redefines the rate limits of {host}")
+            limiter.configure(host, **limits)
+
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+
+def get_limiter():
+    """Return the process-wide limiter, configured from the agent manifests."""
+    global _limiter
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                limiter = RateLimiter()
+                _load_manifest_limits(limiter)
+                _limiter = limiter
+    return _limiter
+
+
+def snapshot():
+    """Return the quota consumption of the shared limiter, see ``RateLimiter.snapshot``."""
+    return get_limiter().snapshot()
@@ -0,0 +1,194 @@
+import asyncio
+import logging
+import random
+import time
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+import requests
+from urllib3.exceptions import MaxRetryError, NewConnectionError
+from core import deadline
+from core.discovery import get_manifest
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_BACKOFF = 0.5           # Base delay in seconds, doubled on every attempt
+DEFAULT_MAX_BACKOFF = 30.0      # Longest single delay
+DEFAULT_DEADLINE = 60.0         # Total time budget across attempts
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS", "PUT", "DELETE")
+
+
+def parse_retry_after(value):
+    """
+    Parse a ``Retry-After`` header.
+
+    Args:
+        value (str): Delay in seconds or an HTTP date.
+
+    Returns:
+        float: Seconds to wait, or None if the header is missing or invalid.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def _not_sent(error):
+    """Return True if ``error`` is a connection that failed to open, so the request was never sent."""
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    if not isinstance(error, requests.ConnectionError) or not error.args:
+        return False
+    reason = error.args[0]
+    if isinstance(reason, MaxRetryError):
+        reason = reason.reason
+    return isinstance(reason, NewConnectionError)
+
+
+class RetryPolicy:
+    """
+    Retry transient HTTP failures with exponential backoff and full jitter.
+
+    A call is retried when the response status is in ``statuses`` or the
+    connection fails, within ``max_attempts``, the overall ``deadline`` and
+    the deadline of the flow or step being executed.
+    Only idempotent methods are retried after a failure that the server may
+    have acted on; 429 responses and connection errors raised before the
+    request was sent are safe to retry for every method. ``Retry-After`` is
+    honoured when present.
+    """
+
+    def __init__(self, max_attempts=DEFAULT_MAX_ATTEMPTS, backoff=DEFAULT_BACKOFF, max_backoff=DEFAULT_MAX_BACKOFF,
+                 deadline=DEFAULT_DEADLINE, statuses=RETRY_STATUSES, methods=IDEMPOTENT_METHODS):
+        """
+        Initialize the policy.
+
+        Args:
+            max_attempts (int): Attempts including the first one; 1 disables retries.
+            backoff (float): Base delay in seconds.
+            max_backoff (float): Upper bound of a single delay.
+            deadline (float): Seconds after which no further attempt starts.
+            statuses (iterable): Response statuses that are retried.
+            methods (iterable): HTTP methods considered idempotent.
+        """
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.deadline = deadline
+        self.statuses = frozenset(statuses)
+        self.methods = frozenset(method.upper() for method in methods)
+
+    @classmethod
+    def from_manifest(cls, settings):
+        """Build a policy from the ``retry`` section of a manifest."""
+        return cls(**settings) if settings else cls()
+
+    def delay(self, attempt, retry_after=None):
+        """Return the delay before retry number ``attempt`` (starting at 1)."""
+        if retry_after is not None:
+            return min(retry_after, self.max_backoff)
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** (attempt - 1)))
+
+    def _retryable(self, method, response=None, error=None):
+        if error is not None:
+            return _not_sent(error) or (
+                isinstance(error, (requests.ConnectionError, requests.Timeout)) and method in self.methods)
+        if response.status_code == 429:
+            return True
+        return response.status_code in self.statuses and method in self.methods
+
+    def _next_delay(self, method, attempt, started, response, error):
+        """Return the delay before the next attempt, or None when the call ends with this outcome."""
+        if attempt == self.max_attempts or not self._retryable(method, response, error):
+            return None
+
+        retry_after = parse_retry_after(response.headers.get("Retry-After")) if response is not None else None
+        delay = self.delay(attempt, retry_after)
+        left = deadline.remaining()
+        if time.monotonic() - started + delay > self.deadline or (left is not None and delay >= left):
+            logger.debug(f"Retry budget spent after {attempt} attempts")
+            return None
+
+        reason = error if error is not None else f"HTTP {response.status_code}"
+        logger.info(f"Retrying {method} in {delay:.2f}s (attempt {attempt + 1}/{self.max_attempts}): {reason}")
+        if response is not None:
+            response.close()
+        return delay
+
+    def call(self, method, send):
+        """
+        Run ``send`` until it succeeds, fails permanently or the budget is spent.
+
+        Args:
+            method (str): HTTP method of the request.
+            send (callable): Zero-argument function sending the request.
+
+        Returns:
+            requests.Response: The last response.
+
+        Raises:
+            requests.RequestException: The last connection error when retries are exhausted.
+        """
+        method = method.upper()
+        started = time.monotonic()
+        for attempt in range(1, self.max_attempts + 1):
+            response = error = None
+            try:
+                response = send()
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+
+            delay = self._next_delay(method, attempt, started, response, error)
+            if delay is None:
+                if error is not None:
+                    raise error
+                return response
+            time.sleep(delay)
+
+    async def acall(self, method, send):
+        """Await ``send`` until it succeeds, fails permanently or the budget is spent, see ``call``."""
+        method = method.upper()
+        started = time.monotonic()
+        for attempt in range(1, self.max_attempts + 1):
+            response = error = None
+            try:
+                response = await send()
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+
+            delay = self._next_delay(method, attempt, started, response, error)
+            if delay is None:
+                if error is not None:
+                    raise error
+                return response
+            await asyncio.sleep(delay)
+
+
+_policies = {}
+
+
+def policy_for(agent_name):
+    """
+    Return the retry policy of an agent, from the ``retry`` section of its manifest.
+
+    Args:
+        agent_name (str): Name of the agent, or None outside agent execution.
+
+    Returns:
+        RetryPolicy: The agent's policy, or the default one.
+    """
+    if agent_name not in _policies:
+        settings = get_manifest(agent_name).get("retry") if agent_name else None
+        _policies[agent_name] = RetryPolicy.from_manifest(settings)
+    return _policies[agent_name]
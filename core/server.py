@@ -0,0 +1,231 @@
+import json
+import logging
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from core import breaker, deadline, metrics, ratelimit
+from core.deadline import deadline_scope
+from core.executor import invoke_agent
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+
+class InstancePool:
+    """
+    Pool of warm agent instances.
+
+    Instances are created on demand and handed back after each request, so an
+    agent's expensive setup (clients, credentials) is paid once per instance
+    while concurrent requests never share an instance.
+    """
+
+    def __init__(self, agent_class):
+        self.agent_class = agent_class
+        self._idle = []
+        self._lock = threading.Lock()
+        self.created = 0
+
+    @contextmanager
+    def instance(self):
+        """Check out an instance for the duration of a request."""
+        with self._lock:
+            agent_instance = self._idle.pop() if self._idle else None
+        if agent_instance is None:
+            agent_instance = self.agent_class()
+            with self._lock:
+                self.created += 1
+        try:
+            yield agent_instance
+        finally:
+            with self._lock:
+                self._idle.append(agent_instance)
+
+    def warm(self):
+        """Create one idle instance ahead of the first request."""
+        with self.instance():
+            pass
+
+
+class AgentServer:
+    """Long-lived agent runner keeping agent classes imported and instances warm."""
+
+    def __init__(self, agents):
+        """
+        Initialize the server.
+
+        Args:
+            agents (dict): Dictionary of discovered agents.
+        """
+        self.agents = agents
+        self._pools = {}
+        self._lock = threading.Lock()
+
+    def pool(self, agent_name):
+        """
+        Return the instance pool of an agent, importing it on first use.
+
+        Raises:
+            KeyError: If the agent does not exist or cannot be loaded.
+        """
+        with self._lock:
+            agent_pool = self._pools.get(agent_name)
+        if agent_pool is not None:
+            return agent_pool
+        # Imported outside the lock, so a cold import never holds up requests for other agents.
+        agent_class = self.agents.get(agent_name)
+        if not agent_class:
+            raise KeyError(agent_name)
+        with self._lock:
+            return self._pools.setdefault(agent_name, InstancePool(agent_class))
+
+    def preload(self, agent_names):
+        """Import and instantiate agents before serving, logging the ones that fail."""
+        for agent_name in agent_names:
+            try:
+                self.pool(agent_name).warm()
+                logger.info(f"Warmed agent: {agent_name}")
+            except Exception as e:
+                logger.error(f"Failed to warm agent {agent_name}: {e}")
+
+    def execute(self, agent_name, params):
+        """
+        Execute one agent on a warm instance.
+
+        Returns:
+            dict: ``{"agent", "status", "result"}`` or ``{"agent", "status", "error"}``.
+        """
+        try:
+            agent_pool = self.pool(agent_name)
+        except KeyError:
+            return {"agent": agent_name, "status": "failed", "error": f"Agent {agent_name} not found."}
+        try:
+            with agent_pool.instance() as agent_instance:
+                result = invoke_agent(agent_name, agent_instance, params)
+            return {"agent": agent_name, "status": "success", "result": result}
+        except Exception as e:
+            logger.error(f"Error executing {agent_name}: {e}")
+            return {"agent": agent_name, "status": "failed", "error": str(e)}
+
+    def status(self):
+        """Return the loaded agents and their instance counts."""
+        with self._lock:
+            pools = dict(self._pools)
+        return {"status": "ok", "agents": {name: pool.created for name, pool in pools.items()}}
+
+
+class AgentRequestHandler(BaseHTTPRequestHandler):
+    """
+    HTTP front end of the agent server.
+
+    - ``GET /health``: server status and warm agents.
+    - ``GET /agents``: names of every discovered agent.
+    - ``GET /quota``: rate-limit consumption per host and API key.
+    - ``GET /circuits``: circuit-breaker state and trip counters per host.
+    - ``GET /metrics``: per-agent and per-host metrics in the Prometheus text format.
+    - ``POST /execute``: body ``{"agent": name, "params": {...}}`` or
+      ``{"flow": [names], "params": {...}}``, with an optional ``"timeout"`` in
+      seconds for the whole request. One NDJSON line is streamed per agent as
+      soon as it finishes; agents left when the deadline passes are reported
+      as failed without running.
+    """
+    protocol_version = "HTTP/1.1"
+    agent_server = None
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_text(self, status, text, content_type="text/plain; charset=utf-8"):
+        body = text.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _write_chunk(self, data):
+        self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send_json(200, self.agent_server.status())
+        elif self.path == "/agents":
+            self._send_json(200, {"agents": sorted(self.agent_server.agents)})
+        elif self.path == "/quota":
+            self._send_json(200, ratelimit.snapshot())
+        elif self.path == "/circuits":
+            self._send_json(200, breaker.snapshot())
+        elif self.path == "/metrics":
+            self._send_text(200, metrics.render(), "text/plain; version=0.0.4; charset=utf-8")
+        else:
+            self._send_json(404, {"error": f"Unknown path: {self.path}"})
+
+    def do_POST(self):
+        if self.path != "/execute":
+            self._send_json(404, {"error": f"Unknown path: {self.path}"})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(request, dict):
+                raise ValueError("the body must be a JSON object")
+            flow = request["flow"] if "flow" in request else [request["agent"]]
+            if isinstance(flow, str):
+                flow = [flow]
+            if not isinstance(flow, list) or not all(isinstance(agent_name, str) for agent_name in flow):
+                raise ValueError("flow must be a list of agent names")
+            params = request.get("params", {})
+            if not isinstance(params, dict):
+                raise ValueError("params must be a JSON object")
+            timeout = request.get("timeout")
+            if timeout is not None and not isinstance(timeout, (int, float)):
+                raise ValueError("timeout must be a number of seconds")
+        except (KeyError, ValueError) as e:
+            self._send_json(400, {"error": f"Invalid request: {e}"})
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        with deadline_scope(timeout):
+            for agent_name in flow:
+                if deadline.expired():
+                    outcome = {"agent": agent_name, "status": "failed", "error": "Deadline exceeded"}
+                else:
+                    outcome = self.agent_server.execute(agent_name, params)
+                self._write_chunk(json.dumps(outcome, default=str).encode("utf-8") + b"\n")
+        self._write_chunk(b"")
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} - {format % args}")
+
+
+def make_server(agents, host=DEFAULT_HOST, port=DEFAULT_PORT, preload=()):
+    """
+    Build a threaded HTTP server around an ``AgentServer``.
+
+    Args:
+        agents (dict): Dictionary of discovered agents.
+        host (str): Interface to bind; defaults to localhost only.
+        port (int): Port to bind, 0 picks a free port.
+        preload (iterable): Agent names to import and instantiate up front.
+
+    Returns:
+        ThreadingHTTPServer: The server, not yet serving.
+    """
+    agent_server = AgentServer(agents)
+    agent_server.preload(preload)
+    handler = type("BoundAgentRequestHandler", (AgentRequestHandler,), {"agent_server": agent_server})
+    httpd = ThreadingHTTPServer((host, port), handler)
+    httpd.agent_server = agent_server
+    return httpd
@@ -0,0 +1,175 @@
+import asyncio
+import json
+import logging
+import threading
+from core import deadline
+from core.deadline import DeadlineExceeded
+
+logger = logging.getLogger(__name__)
+
+
+class _Call:
+    """An in-flight call and the outcome its waiters receive."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesce identical concurrent calls into one.
+
+    The first caller for a key runs the function; callers arriving while it is
+    in flight wait and receive the same result, or the same exception. Once
+    the call returns the key is forgotten, so later calls run again (caching
+    is the response cache's job). Waiters share the result object itself.
+
+    Waiters stop waiting at their own deadline. When the leader fails because
+    its deadline passed, waiters with time left run the call again rather than
+    inherit that failure.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._async_calls = {}
+        self._lock = threading.Lock()
+        self.coalesced = 0
+
+    def do(self, key, func):
+        """
+        Run ``func`` once for all concurrent callers using ``key``.
+
+        Args:
+            key (str): Identity of the call.
+            func (callable): Zero-argument function performing the call.
+
+        Returns:
+            Any: The result of the shared call.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                call.waiters += 1
+                self.coalesced += 1
+
+        if not leader:
+            if not call.done.wait(deadline.remaining()):
+                raise DeadlineExceeded("Deadline exceeded waiting for an identical call")
+            if isinstance(call.error, DeadlineExceeded):
+                deadline.check()
+                return self.do(key, func)
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            if call.waiters:
+                logger.debug(f"Shared one call with {call.waiters} waiting callers")
+            call.done.set()
+
+    async def ado(self, key, func):
+        """
+        Await ``func`` once for all concurrent callers on this event loop using ``key``, see ``do``.
+
+        Args:
+            key (str): Identity of the call.
+            func (callable): Zero-argument coroutine function performing the call.
+
+        Returns:
+            Any: The result of the shared call.
+        """
+        loop = asyncio.get_running_loop()
+        loop_key = (id(loop), key)
+        with self._lock:
+            call = self._async_calls.get(loop_key)
+            leader = call is None
+            if leader:
+                call = self._async_calls[loop_key] = loop.create_future()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            try:
+                return await asyncio.wait_for(asyncio.shield(call), deadline.remaining())
+            except asyncio.TimeoutError:
+                raise DeadlineExceeded("Deadline exceeded waiting for an identical call") from None
+            except asyncio.CancelledError:
+                if not call.cancelled():
+                    raise
+            except DeadlineExceeded:
+                pass
+            # The leader was cancelled or ran out of time, not this caller: run the call anew.
+            deadline.check()
+            return await self.ado(key, func)
+
+        try:
+            result = await func()
+            call.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            call.cancel()
+            raise
+        except BaseException as e:
+            call.set_exception(e)
+            call.exception()  # Retrieved, so that an unawaited failure is not logged by asyncio.
+            raise
+        finally:
+            with self._lock:
+                del self._async_calls[loop_key]
+
+
+def make_key(agent_name, params):
+    """
+    Build the identity of an agent call from its name and every parameter.
+
+    Unlike cache keys, credentials are part of the identity: callers using
+    different API keys never share an upstream request.
+    """
+    return f"{agent_name}:{json.dumps(params, sort_keys=True, separators=(',', ':'), default=str)}"
+
+
+_group = SingleFlight()
+
+
+def get_group():
+    """Return the process-wide single-flight group."""
+    return _group
+
+
+def shared_call(agent_name, params, call, enabled=True):
+    """
+    Run an agent call, joining an identical call already in flight.
+
+    Args:
+        agent_name (str): Name of the agent.
+        params (dict): Keyword arguments of the call.
+        call (callable): Zero-argument function executing the agent.
+        enabled (bool): False for agents with side effects, which always run.
+
+    Returns:
+        Any: The agent result.
+    """
+    if not enabled:
+        return call()
+    return _group.do(make_key(agent_name, params), call)
+
+
+async def ashared_call(agent_name, params, call, enabled=True):
+    """Await an agent call, joining an identical call in flight on this event loop, see ``shared_call``."""
+    if not enabled:
+        return await call()
+    return await _group.ado(make_key(agent_name, params), call)
@@ -0,0 +1,114 @@
+import pytest
+import requests
+from core import breaker
+from core.breaker import CircuitBreaker, CircuitOpenError
+from core.context import agent_scope
+from core.retry import RetryPolicy
+from core.transport import Transport
+
+
+class FakeResponse:
+    """Minimal response with a status code."""
+
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.headers = {}
+
+    def close(self):
+        pass
+
+
+def _fail():
+    raise requests.ConnectionError("refused")
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Fixture replacing the breaker clock with a settable one."""
+    now = [1000.0]
+    monkeypatch.setattr(breaker.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_breaker_trips_on_failure_rate_and_fails_fast(clock):
+    cb = CircuitBreaker("down.example.com", window=4, min_calls=4, failure_rate=0.5, cooldown=10)
+    cb.call(lambda: FakeResponse(200))
+    cb.call(lambda: FakeResponse(200))
+    cb.call(lambda: FakeResponse(503))
+    assert cb.state == breaker.CLOSED
+    with pytest.raises(requests.ConnectionError):
+        cb.call(_fail)
+    assert cb.state == breaker.OPEN
+
+    calls = []
+    with pytest.raises(CircuitOpenError):
+        cb.call(lambda: calls.append(1))
+    assert calls == []
+    assert cb.snapshot()["rejected"] == 1
+    assert cb.snapshot()["trips"] == 1
+
+
+def test_half_open_probe_uses_the_health_check(clock):
+    cb = CircuitBreaker("flaky.example.com", min_calls=1, cooldown=10)
+    with pytest.raises(requests.ConnectionError):
+        cb.call(_fail)
+    clock[0] += 10
+
+    with pytest.raises(CircuitOpenError):
+        cb.call(lambda: FakeResponse(200), health_check=lambda: {"status": "unhealthy"})
+    assert cb.state == breaker.OPEN
+    assert cb.snapshot()["trips"] == 2
+
+    clock[0] += 10
+    response = cb.call(lambda: FakeResponse(200), health_check=lambda: {"status": "healthy"})
+    assert response.status_code == 200
+    assert cb.state == breaker.CLOSED
+
+
+def test_half_open_without_health_check_probes_with_the_request(clock):
+    cb = CircuitBreaker("flaky.example.com", min_calls=1, cooldown=10)
+    with pytest.raises(requests.ConnectionError):
+        cb.call(_fail)
+    clock[0] += 10
+
+    def not_implemented():
+        raise NotImplementedError
+
+    assert cb.call(lambda: FakeResponse(200), health_check=not_implemented).status_code == 200
+    assert cb.state == breaker.CLOSED
+
+
+def test_transport_fails_fast_once_the_host_is_open(monkeypatch):
+    """Retries stop at the breaker instead of waiting on a dead host."""
+    monkeypatch.setattr(breaker, "_breakers", {})
+    monkeypatch.setattr(breaker, "_settings", {"min_calls": 2, "cooldown": 60})
+    transport = Transport(retry_policy=RetryPolicy(max_attempts=1))
+    calls = []
+
+    def refuse(method, url, **kwargs):
+        calls.append(url)
+        raise requests.ConnectionError("refused")
+
+    monkeypatch.setattr(transport.session, "request", refuse)
+    for _ in range(2):
+        with pytest.raises(requests.ConnectionError):
+            transport.get("http://down.example.com/")
+    with agent_scope("down"):
+        with pytest.raises(CircuitOpenError):
+            transport.get("http://down.example.com/")
+    assert len(calls) == 2
+    assert breaker.snapshot()["down.example.com"]["state"] == breaker.OPEN
+
+
+def test_health_checks_needing_arguments_are_not_used_as_probes():
+    class KeyedAgent:
+        def health_check(self, api_key):
+            return {"status": "healthy"}
+
+    class PlainAgent:
+        def health_check(self):
+            return {"status": "healthy"}
+
+    assert breaker.health_probe(KeyedAgent()) is None
+    assert breaker.health_probe(PlainAgent())() == {"status": "healthy"}
+    assert breaker.health_probe(None) is None
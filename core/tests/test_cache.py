@@ -0,0 +1,85 @@
+import time
+import pytest
+from core import cache
+from core.cache import MISS, MemoryCache, SQLiteCache, cached_call, make_key
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    """Fixture providing each cache backend with room for three entries."""
+    if request.param == "memory":
+        return MemoryCache(max_entries=3)
+    return SQLiteCache(path=str(tmp_path / "cache.sqlite"), max_entries=3)
+
+
+@pytest.fixture
+def memory_cache():
+    """Fixture installing a fresh process-wide memory cache."""
+    yield cache.configure("memory")
+    cache.configure("memory")
+
+
+def test_key_ignores_order_and_secrets():
+    """Keyword order and credentials do not change the key."""
+    assert make_key("a", {"x": 1, "y": 2, "api_key": "k1"}) == make_key("a", {"y": 2, "x": 1, "apikey": "k2"})
+    assert make_key("a", {"x": 1}) != make_key("a", {"x": 2})
+    assert make_key("a", {"x": 1}) != make_key("b", {"x": 1})
+
+
+def test_backend_expires_entries(backend):
+    backend.set("k", {"v": 1}, ttl=0.05)
+    assert backend.get("k") == {"v": 1}
+    time.sleep(0.1)
+    assert backend.get("k") is MISS
+
+
+def test_backend_evicts_least_recently_used(backend):
+    """Beyond max_entries the entry unused for longest goes first."""
+    for key in "abc":
+        backend.set(key, key, ttl=60)
+        time.sleep(0.01)
+    backend.get("a")
+    backend.set("d", "d", ttl=60)
+    assert len(backend) == 3
+    assert backend.get("b") is MISS
+    assert backend.get("a") == "a"
+
+
+def test_sqlite_cache_survives_reopen(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    SQLiteCache(path=path).set("k", [1, 2], ttl=60)
+    assert SQLiteCache(path=path).get("k") == [1, 2]
+
+
+def test_cached_call_skips_errors_and_honors_when(memory_cache):
+    """Only successful results are cached, and only for matching parameters."""
+    calls = []
+
+    def call(result):
+        calls.append(result)
+        return result
+
+    policy = {"ttl": 60, "when": {"category": ["airports"]}}
+    for _ in range(2):
+        cached_call("avi", {"category": "airports"}, policy, lambda: call({"data": []}))
+        cached_call("avi", {"category": "flights"}, policy, lambda: call({"data": []}))
+        cached_call("avi", {"category": "airlines"}, {"ttl": 60}, lambda: call({"error": "x"}))
+    assert len(calls) == 5
+
+
+def test_invoke_agent_uses_manifest_ttl(memory_cache, monkeypatch):
+    """invoke_agent serves repeated calls from the cache when the manifest has a TTL."""
+    from core import executor
+
+    class CountingAgent:
+        calls = 0
+
+        def execute(self, **kwargs):
+            CountingAgent.calls += 1
+            return {"echo": kwargs}
+
+    monkeypatch.setattr(executor, "get_manifest", lambda name: {"cache": {"ttl": 60}} if name == "cached" else {})
+    for _ in range(3):
+        assert executor.invoke_agent("cached", CountingAgent(), {"q": 1, "api_key": "k"}) == {"echo": {"q": 1, "api_key": "k"}}
+        executor.invoke_agent("uncached", CountingAgent(), {"q": 1})
+    assert CountingAgent.calls == 4
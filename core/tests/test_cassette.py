@@ -0,0 +1,116 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+import requests
+from core import breaker, cassette
+from core.context import agent_scope
+from core.retry import RetryPolicy
+from core.transport import PooledConnection, Transport
+
+
+class UpstreamHandler(BaseHTTPRequestHandler):
+    """Upstream stand-in answering every request with its path."""
+
+    def _answer(self):
+        length = int(self.headers.get("Content-Length", 0))
+        if length:
+            self.rfile.read(length)
+        body = json.dumps({"path": self.path.split("?")[0]}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = _answer
+
+    def log_message(self, *args):
+        pass
+
+
+class HTTPConnection(PooledConnection):
+    """Pooled connection speaking plain HTTP to the local upstream."""
+    scheme = "http"
+
+
+@pytest.fixture
+def upstream():
+    """Fixture running a local upstream server for the duration of a test."""
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), UpstreamHandler)
+    thread = threading.Thread(target=httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield f"127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture(autouse=True)
+def isolated(monkeypatch):
+    """Fixture turning cassettes off and resetting circuit breakers after each test."""
+    monkeypatch.setattr(breaker, "_breakers", {})
+    yield
+    cassette.configure(cassette.OFF)
+
+
+def _transport():
+    return Transport(retry_policy=RetryPolicy(max_attempts=1))
+
+
+def test_record_then_replay_without_the_upstream(tmp_path, upstream):
+    cassette.configure(cassette.RECORD, str(tmp_path))
+    transport = _transport()
+    with agent_scope("quotes"):
+        recorded = transport.get(f"http://{upstream}/quote", params={"symbol": "IBM", "apikey": "secret"}).json()
+        connection = HTTPConnection(upstream, transport=transport)
+        connection.request("POST", "/orders", body=b"{}")
+        assert connection.getresponse().status == 200
+    transport.close()
+    cassette.shutdown()
+
+    saved = (tmp_path / "quotes.json").read_text()
+    assert "secret" not in saved
+    interactions = json.loads(saved)["interactions"]
+    assert [i["request"]["method"] for i in interactions] == ["GET", "POST"]
+    assert interactions[0]["request"]["query"] == {"symbol": "IBM"}
+
+    cassette.configure(cassette.REPLAY, str(tmp_path))
+    transport = _transport()
+    with agent_scope("quotes"):
+        replayed = transport.get(f"http://{upstream}/quote", params={"symbol": "IBM", "apikey": "other"})
+        assert replayed.json() == recorded
+        with pytest.raises(cassette.CassetteMiss):
+            transport.get(f"http://{upstream}/quote", params={"symbol": "META"})
+
+
+def test_replay_prefers_the_most_specific_interaction(tmp_path):
+    (tmp_path / "stocks.json").write_text(json.dumps({"agent": "stocks", "interactions": [
+        {"request": {"url": "https://api.example.com/query"}, "response": {"json": {"series": "any"}}},
+        {"request": {"url": "https://api.example.com/query", "query": {"function": "DAILY"}},
+         "response": {"json": {"series": "daily"}}},
+    ]}))
+    cassette.configure(cassette.REPLAY, str(tmp_path))
+    transport = _transport()
+    assert transport.get("https://api.example.com/query?function=DAILY").json() == {"series": "daily"}
+    assert transport.get("https://api.example.com/query?function=WEEKLY").json() == {"series": "any"}
+
+
+def test_replay_injects_latency_timeouts_and_errors(tmp_path):
+    (tmp_path / "slow.json").write_text(json.dumps({"agent": "slow", "interactions": [
+        {"request": {"url": "https://slow.example.com/"}, "response": {"status": 200, "body": "ok"}},
+    ]}))
+    cassette.configure(cassette.REPLAY, str(tmp_path), latency=0.2)
+    with pytest.raises(requests.ReadTimeout):
+        _transport().get("https://slow.example.com/", timeout=(1, 0.05))
+
+    cassette.configure(cassette.REPLAY, str(tmp_path), error_rate=1.0, seed=1)
+    response = _transport().get("https://slow.example.com/")
+    assert response.status_code == 503
+    assert response.json() == {"error": "Injected failure"}
+
+
+def test_configure_rejects_a_missing_replay_directory(tmp_path):
+    with pytest.raises(ValueError):
+        cassette.configure(cassette.REPLAY, str(tmp_path / "missing"))
+    with pytest.raises(ValueError):
+        cassette.configure("rewind", str(tmp_path))
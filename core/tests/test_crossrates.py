@@ -0,0 +1,75 @@
+import threading
+import time
+import pytest
+from core.crossrates import CrossRates, KeyedCrossRates
+
+TABLE = {"USD": 1.0, "EUR": 0.5, "GBP": 0.25, "JPY": 100.0}
+
+
+def _fetcher(calls):
+    def fetch(base, currencies):
+        calls.append((base, currencies))
+        return TABLE
+    return fetch
+
+
+def test_pairs_derive_from_one_cached_table():
+    calls = []
+    rates = CrossRates()
+    assert rates.rate("EUR", "GBP", _fetcher(calls)) == 0.5
+    assert rates.matrix(["usd", "JPY", "EUR"], _fetcher(calls)) == {
+        "USD": {"USD": 1.0, "JPY": 100.0, "EUR": 0.5},
+        "JPY": {"USD": 0.01, "JPY": 1.0, "EUR": 0.005},
+        "EUR": {"USD": 2.0, "JPY": 200.0, "EUR": 1.0},
+    }
+    assert calls == [("USD", ["EUR", "GBP"])]
+
+
+def test_convert_many_amounts_between_mixed_currencies():
+    rates = CrossRates()
+    fetch = _fetcher([])
+    assert rates.convert([1, 2, 4], "EUR", "GBP", fetch).tolist() == [0.5, 1.0, 2.0]
+    assert rates.convert([1, 2], ["EUR", "JPY"], ["USD", "EUR"], fetch).tolist() == [2.0, 0.01]
+    with pytest.raises(ValueError, match="Expected 1 or 3"):
+        rates.convert([1, 2, 3], ["EUR", "JPY"], "USD", fetch)
+
+
+def test_expired_and_unknown_rates_are_fetched_again():
+    calls = []
+    rates = CrossRates(ttl=0)
+    rates.rate("USD", "EUR", _fetcher(calls))
+    with pytest.raises(ValueError, match="No exchange rate for: XYZ"):
+        rates.rate("EUR", "XYZ", _fetcher(calls))
+    assert calls == [("USD", ["EUR"]), ("USD", ["EUR", "XYZ"])]
+
+
+def test_concurrent_lookups_share_a_download_without_blocking_cached_rates():
+    """Callers missing the same rates wait for one download; cached rates are served meanwhile."""
+    calls = []
+    rates = CrossRates()
+    rates.rate("USD", "GBP", lambda base, currencies: {"GBP": TABLE["GBP"]})
+
+    def slow_fetch(base, currencies):
+        calls.append((base, currencies))
+        time.sleep(0.3)
+        return TABLE
+
+    threads = [threading.Thread(target=rates.rate, args=("USD", "EUR", slow_fetch)) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+    started = time.monotonic()
+    assert rates.rate("USD", "GBP", _fetcher(calls)) == 0.25
+    assert time.monotonic() - started < 0.1
+    for thread in threads:
+        thread.join()
+    assert calls == [("USD", ["EUR"])]
+
+
+def test_each_api_key_gets_its_own_rates():
+    engines = KeyedCrossRates(ttl=60)
+    engines.for_key("good").rate("USD", "EUR", _fetcher([]))
+    assert engines.for_key("good") is engines.for_key("good")
+    assert engines.for_key("bad").ttl == 60
+    with pytest.raises(ValueError, match="No exchange rate for: EUR"):
+        engines.for_key("bad").rate("USD", "EUR", lambda base, currencies: {})
@@ -0,0 +1,95 @@
+import time
+import pytest
+import requests
+from core import breaker, deadline
+from core.base import AgentBase
+from core.deadline import DeadlineExceeded, deadline_scope
+from core.executor import execute_agent_dag, execute_agent_flow
+from core.retry import RetryPolicy
+from core.transport import Transport
+
+
+class SleepyAgent(AgentBase):
+    """Agent that sleeps for ``delay`` seconds and returns it."""
+    def execute(self, delay=0.0, **kwargs):
+        time.sleep(delay)
+        return delay
+
+    def health_check(self):
+        return {"status": "healthy"}
+
+
+class RemainingAgent(AgentBase):
+    """Agent returning the time left before its deadline."""
+    def execute(self, **kwargs):
+        return deadline.remaining()
+
+    def health_check(self):
+        return {"status": "healthy"}
+
+
+def test_scopes_nest_and_only_shorten():
+    assert deadline.remaining() is None
+    with deadline_scope(10):
+        with deadline_scope(60):
+            assert deadline.remaining() <= 10
+        with deadline_scope(None):
+            assert deadline.remaining() <= 10
+        with deadline_scope(0):
+            assert deadline.expired()
+            with pytest.raises(DeadlineExceeded):
+                deadline.check()
+    assert deadline.remaining() is None
+
+
+def test_cap_timeout():
+    assert deadline.cap_timeout((5, 30)) == (5, 30)
+    with deadline_scope(2):
+        connect, read = deadline.cap_timeout((5, 30))
+        assert connect <= 2 and read <= 2
+        assert deadline.cap_timeout(1) == 1
+        assert deadline.cap_timeout(None) <= 2
+
+
+def test_transport_caps_timeouts_and_spares_the_breaker(monkeypatch):
+    """A timeout caused by the deadline raises DeadlineExceeded and does not count against the host."""
+    monkeypatch.setattr(breaker, "_breakers", {})
+    transport = Transport(timeout=(5, 30), retry_policy=RetryPolicy(max_attempts=3))
+    seen = []
+
+    def stall(method, url, timeout=None, **kwargs):
+        seen.append(timeout)
+        time.sleep(timeout[1])
+        raise requests.ReadTimeout("stalled")
+
+    monkeypatch.setattr(transport.session, "request", stall)
+    with deadline_scope(0.1):
+        with pytest.raises(DeadlineExceeded):
+            transport.get("http://slow.example.com/")
+    assert len(seen) == 1
+    assert seen[0][0] <= 0.1 and seen[0][1] <= 0.1
+    assert breaker.snapshot()["slow.example.com"]["calls"] == 0
+
+
+def test_flow_deadline_returns_partial_results():
+    agents = {"sleepy": SleepyAgent, "remaining": RemainingAgent}
+    results = execute_agent_flow(["sleepy", "remaining"], agents, '{"delay": 0.2}', timeout=0.1)
+    assert results == {"sleepy": 0.2}
+
+    results = execute_agent_flow(["remaining"], agents, "", timeout=10, step_timeout=1)
+    assert 0 < results["remaining"] <= 1
+
+
+def test_dag_deadline_abandons_running_steps():
+    agents = {"sleepy": SleepyAgent, "remaining": RemainingAgent}
+    spec = {"steps": [
+        {"id": "fast", "agent": "sleepy", "params": {"delay": 0}},
+        {"id": "slow", "agent": "sleepy", "params": {"delay": 1}},
+        {"id": "left", "agent": "remaining", "timeout": 0.5},
+    ]}
+    started = time.perf_counter()
+    results = execute_agent_dag(spec, agents, "", timeout=0.3)
+    assert time.perf_counter() - started < 0.9
+    assert results["fast"] == 0
+    assert 0 < results["left"] <= 0.3
+    assert "slow" not in results
@@ -0,0 +1,135 @@
+import json
+import os
+import pytest
+from core import discovery
+from core.discovery import discover_agents, load_agent_index
+
+
+def write_manifest(agents_dir, folder, manifest):
+    """Create an agent folder with the given manifest."""
+    folder_path = agents_dir / folder
+    folder_path.mkdir(exist_ok=True)
+    (folder_path / "manifest.json").write_text(json.dumps(manifest))
+
+
+@pytest.fixture
+def agents_dir(tmp_path):
+    """Fixture providing a temporary agents tree with one valid agent."""
+    write_manifest(tmp_path, "sample", {"name": "sample", "entry_point": "__init__", "class_name": "SampleAgent"})
+    return tmp_path
+
+
+def test_index_contains_valid_agents(agents_dir):
+    """Valid manifests are indexed with folder, entry point and class name."""
+    index = load_agent_index(str(agents_dir))
+    assert index["sample"]["folder"] == "sample"
+    assert index["sample"]["entry_point"] == "__init__"
+    assert index["sample"]["class_name"] == "SampleAgent"
+    assert (agents_dir / discovery.INDEX_FILENAME).exists()
+
+
+def test_index_skips_invalid_manifests(agents_dir):
+    """Folders with missing, malformed or incomplete manifests are skipped."""
+    (agents_dir / "empty").mkdir()
+    (agents_dir / "broken").mkdir()
+    (agents_dir / "broken" / "manifest.json").write_text("{not json")
+    write_manifest(agents_dir, "partial", {"name": "partial"})
+    index = load_agent_index(str(agents_dir))
+    assert set(index) == {"sample"}
+
+
+def test_fresh_index_does_not_reparse_manifests(agents_dir, monkeypatch):
+    """An up-to-date index is served without re-reading any manifest."""
+    load_agent_index(str(agents_dir))
+
+    def fail(*args, **kwargs):
+        raise AssertionError("manifest should not be re-indexed")
+
+    monkeypatch.setattr(discovery, "_index_folder", fail)
+    monkeypatch.setattr(discovery, "_manifest_hash", fail)
+    assert "sample" in load_agent_index(str(agents_dir))
+
+
+def test_changed_manifest_is_reindexed(agents_dir):
+    """Editing a manifest is picked up on the next load."""
+    load_agent_index(str(agents_dir))
+    manifest_path = agents_dir / "sample" / "manifest.json"
+    manifest_path.write_text(json.dumps({"name": "renamed", "entry_point": "__init__", "class_name": "SampleAgent"}))
+    stat = os.stat(manifest_path)
+    os.utime(manifest_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    index = load_agent_index(str(agents_dir))
+    assert set(index) == {"renamed"}
+
+
+def test_new_agent_folder_is_indexed(agents_dir):
+    """Agents added after the index was built are discovered."""
+    load_agent_index(str(agents_dir))
+    write_manifest(agents_dir, "other", {"name": "other", "entry_point": "__init__", "class_name": "OtherAgent"})
+    assert set(load_agent_index(str(agents_dir))) == {"sample", "other"}
+
+
+def test_discover_agents_only_loads_requested_names():
+    """Restricting discovery to a flow only returns the named agents."""
+    agents = discover_agents(["lyricist"])
+    assert list(agents) == ["lyricist"]
+    assert callable(agents["lyricist"])
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    """Fixture providing a registry over the real index with imports counted."""
+    imported = []
+    real_import = discovery.importlib.import_module
+
+    def counting_import(name):
+        imported.append(name)
+        return real_import(name)
+
+    monkeypatch.setattr(discovery.importlib, "import_module", counting_import)
+    agents = discover_agents()
+    agents.imported = imported
+    return agents
+
+
+def test_registry_does_not_import_on_discovery(registry):
+    """Discovery, membership and iteration never import agent modules."""
+    assert "weather" in registry
+    assert "lyricist" in list(registry)
+    assert len(registry) > 1
+    assert registry.imported == []
+
+
+def test_registry_imports_on_first_access(registry):
+    """Looking up an agent imports only that agent, once, and records the time."""
+    agent_class = registry["weather"]
+    assert registry["weather"] is agent_class
+    assert registry.imported == ["agents.weather.__init__"]
+    assert registry.import_times["weather"] >= 0
+
+
+def test_registry_unknown_agent(registry):
+    """Unknown agents raise KeyError and return None from get()."""
+    with pytest.raises(KeyError):
+        registry["does-not-exist"]
+    assert registry.get("does-not-exist") is None
+
+
+def test_registry_skips_agents_that_fail_to_import(monkeypatch):
+    """An agent whose module fails to import is reported missing, not raised."""
+    def failing_import(name):
+        raise ImportError("missing dependency")
+
+    monkeypatch.setattr(discovery.importlib, "import_module", failing_import)
+    agents = discover_agents(["weather"])
+    assert "weather" in agents
+    assert agents.get("weather") is None
+    assert "weather" not in agents
+    assert list(agents) == [] and len(agents) == 0
+    assert list(agents.items()) == []
+
+
+def test_index_resolves_agents_outside_the_working_directory(tmp_path, monkeypatch):
+    """The agents directory does not depend on the working directory; a missing one has no agents."""
+    monkeypatch.chdir(tmp_path)
+    assert "weather" in load_agent_index()
+    assert load_agent_index(str(tmp_path / "missing")) == {}
@@ -0,0 +1,254 @@
+import asyncio
+import io
+import json
+import time
+import pytest
+from core.base import AgentBase, is_async_agent, is_streaming_agent
+from core.executor import (
+    aexecute_agent_dag, build_flow_spec, execute_agent_batch, execute_agent_dag, execute_agent_flow,
+)
+
+
+class EchoAgent(AgentBase):
+    """Agent returning its keyword arguments."""
+    def execute(self, **kwargs):
+        return kwargs
+
+    def health_check(self):
+        return {"status": "healthy"}
+
+
+class SlowAgent(AgentBase):
+    """Agent that sleeps before answering, recording when it ran."""
+    calls = []
+
+    def execute(self, delay=0.2, **kwargs):
+        started = time.perf_counter()
+        time.sleep(delay)
+        SlowAgent.calls.append((started, time.perf_counter()))
+        return "slow"
+
+    def health_check(self):
+        return {"status": "healthy"}
+
+
+class FailingAgent(AgentBase):
+    """Agent that always fails."""
+    def execute(self, **kwargs):
+        raise ValueError("boom")
+
+    def health_check(self):
+        return {"status": "unhealthy"}
+
+
+class CountingAgent(AgentBase):
+    """Agent streaming numbers, noting how many output lines existed as it yielded each one."""
+    sink = None
+    seen = []
+
+    def execute(self, n=3, **kwargs):
+        return list(range(n))
+
+    def stream(self, n=3, **kwargs):
+        for i in range(n):
+            CountingAgent.seen.append(CountingAgent.sink.getvalue().count("\n"))
+            yield i
+
+    def health_check(self):
+        return {"status": "healthy"}
+
+
+@pytest.fixture
+def agents():
+    """Fixture providing an agents mapping for the flow tests."""
+    SlowAgent.calls = []
+    return {"echo": EchoAgent, "slow": SlowAgent, "fail": FailingAgent, "count": CountingAgent}
+
+
+def test_execute_agent_flow_returns_results(agents):
+    """Sequential flows return results and keep going after errors."""
+    results = execute_agent_flow(["fail", "echo", "missing"], agents, '{"x": 1}')
+    assert results == {"echo": {"x": 1}}
+
+
+def test_execute_agent_flow_streams_ndjson_records_as_they_arrive(agents, capsys):
+    sink = io.StringIO()
+    CountingAgent.sink, CountingAgent.seen = sink, []
+    results = execute_agent_flow(["count", "echo", "fail"], agents, '{"n": 3}', sink=sink)
+
+    assert CountingAgent.seen == [0, 1, 2]
+    assert [json.loads(line) for line in sink.getvalue().splitlines()] == [
+        {"agent": "count", "record": 0},
+        {"agent": "count", "record": 1},
+        {"agent": "count", "record": 2},
+        {"agent": "echo", "result": {"n": 3}},
+        {"agent": "fail", "error": "boom"},
+    ]
+    assert results == {"count": {"streamed": 3}, "echo": {"n": 3}}
+    output = capsys.readouterr()
+    assert output.out == "" and "Executing count..." in output.err
+
+
+def test_streaming_agents_return_their_full_result_without_a_sink(agents):
+    assert is_streaming_agent(CountingAgent) and not is_streaming_agent(EchoAgent)
+    assert execute_agent_flow(["count"], agents, '{"n": 2}') == {"count": [0, 1]}
+
+
+def test_build_flow_spec_rejects_cycles():
+    """Cyclic dependencies are reported before anything runs."""
+    with pytest.raises(ValueError, match="cycle"):
+        build_flow_spec({"steps": [
+            {"id": "a", "agent": "echo", "depends_on": ["b"]},
+            {"id": "b", "agent": "echo", "depends_on": ["a"]},
+        ]})
+
+
+def test_build_flow_spec_rejects_unknown_dependencies():
+    """Dependencies must reference declared steps."""
+    with pytest.raises(ValueError, match="unknown"):
+        build_flow_spec([{"agent": "echo", "depends_on": ["ghost"]}])
+
+
+def test_independent_steps_run_concurrently(agents):
+    """Independent steps overlap, so wall time is close to the slowest step."""
+    spec = [{"id": f"s{i}", "agent": "slow", "params": {"n": i}} for i in range(4)]
+    started = time.perf_counter()
+    results = execute_agent_dag(spec, agents, '{"delay": 0.2}', max_workers=4)
+    elapsed = time.perf_counter() - started
+    assert set(results) == {"s0", "s1", "s2", "s3"}
+    assert elapsed < 0.6
+
+
+def test_dependent_step_receives_inputs(agents):
+    """Declared inputs pass upstream results and order the steps."""
+    spec = {"steps": [
+        {"id": "first", "agent": "slow", "params": {"delay": 0.05}},
+        {"id": "second", "agent": "echo", "params": {"y": 2}, "inputs": {"upstream": "first"}},
+    ]}
+    results = execute_agent_dag(spec, agents, "")
+    assert results["second"] == {"y": 2, "upstream": "slow"}
+
+
+def test_failed_dependency_skips_dependents(agents):
+    """Steps downstream of a failure are skipped, other branches still run."""
+    spec = [
+        {"id": "bad", "agent": "fail"},
+        {"id": "after_bad", "agent": "echo", "depends_on": ["bad"]},
+        {"id": "after_after", "agent": "echo", "depends_on": ["after_bad"]},
+        {"id": "ok", "agent": "echo"},
+    ]
+    results = execute_agent_dag(spec, agents, "")
+    assert set(results) == {"ok"}
+
+
+def test_max_workers_bounds_concurrency(agents):
+    """No more than max_workers steps run at the same time."""
+    spec = [{"id": f"s{i}", "agent": "slow", "params": {"n": i}} for i in range(4)]
+    execute_agent_dag(spec, agents, '{"delay": 0.1}', max_workers=2)
+    events = sorted([(start, 1) for start, _ in SlowAgent.calls] + [(end, -1) for _, end in SlowAgent.calls])
+    running = peak = 0
+    for _, delta in events:
+        running += delta
+        peak = max(peak, running)
+    assert peak <= 2
+
+
+class AsyncSleepAgent(AgentBase):
+    """Agent with a native aexecute that tracks how many calls overlap."""
+    in_flight = 0
+    peak = 0
+
+    def execute(self, **kwargs):
+        raise AssertionError("the async executor should await aexecute")
+
+    async def aexecute(self, delay=0.1, **kwargs):
+        AsyncSleepAgent.in_flight += 1
+        AsyncSleepAgent.peak = max(AsyncSleepAgent.peak, AsyncSleepAgent.in_flight)
+        await asyncio.sleep(delay)
+        AsyncSleepAgent.in_flight -= 1
+        return "async"
+
+    def health_check(self):
+        return {"status": "healthy"}
+
+
+def test_is_async_agent():
+    """Only agents overriding aexecute are treated as async-capable."""
+    assert is_async_agent(AsyncSleepAgent)
+    assert is_async_agent(AsyncSleepAgent())
+    assert not is_async_agent(EchoAgent)
+
+
+def test_async_dag_runs_async_agents_on_the_loop(agents):
+    """Many async steps overlap on one loop alongside sync agents on threads."""
+    AsyncSleepAgent.peak = 0
+    agents["async"] = AsyncSleepAgent
+    spec = [{"id": f"a{i}", "agent": "async", "params": {"n": i}} for i in range(50)]
+    spec.append({"id": "sync", "agent": "echo", "inputs": {"upstream": "a0"}})
+    started = time.perf_counter()
+    results = asyncio.run(aexecute_agent_dag(spec, agents, '{"delay": 0.1}', max_workers=1))
+    assert time.perf_counter() - started < 1
+    assert AsyncSleepAgent.peak == 50
+    assert results["sync"] == {"delay": 0.1, "upstream": "async"}
+
+
+def test_async_dag_bounds_concurrency_and_skips_failures(agents):
+    """max_concurrency caps in-flight async agents and failures skip dependents."""
+    AsyncSleepAgent.peak = 0
+    agents["async"] = AsyncSleepAgent
+    spec = [{"id": f"a{i}", "agent": "async", "params": {"n": i}} for i in range(6)]
+    spec += [{"id": "bad", "agent": "fail"}, {"id": "after", "agent": "echo", "depends_on": ["bad"]}]
+    results = asyncio.run(aexecute_agent_dag(spec, agents, '{"delay": 0.05}', max_concurrency=2))
+    assert AsyncSleepAgent.peak == 2
+    assert "after" not in results and len(results) == 6
+
+
+def test_async_dag_goes_through_the_invoke_path(agents, monkeypatch):
+    """Async agents share identical in-flight calls and are recorded like sync ones."""
+    from core import metrics
+    AsyncSleepAgent.peak = 0
+    agents["async"] = AsyncSleepAgent
+    observed = []
+    monkeypatch.setattr(metrics, "_record_agent", lambda name, started, error: observed.append(name))
+    results = asyncio.run(aexecute_agent_dag([{"id": f"a{i}", "agent": "async"} for i in range(5)], agents, ""))
+    assert results == {f"a{i}": "async" for i in range(5)}
+    assert AsyncSleepAgent.peak == 1
+    assert observed == ["async"] * 5
+
+
+def test_batch_captures_errors_per_record(agents):
+    """Bad records yield an error outcome without stopping the batch."""
+    records = ['{"x": 1}', "not json", "", '[1, 2]', '{"x": 2}']
+    outcomes = list(execute_agent_batch("echo", agents, records, params='{"k": "v"}'))
+    assert [outcome["index"] for outcome in outcomes] == [0, 1, 2, 3]
+    assert outcomes[0] == {"index": 0, "status": "success", "result": {"k": "v", "x": 1}}
+    assert [outcome["status"] for outcome in outcomes[1:]] == ["failed", "failed", "success"]
+
+
+def test_batch_keeps_input_order_unless_unordered(agents):
+    """Ordered batches follow the input even when later records finish first."""
+    records = ['{"delay": 0.3}'] + [f'{{"delay": 0.01, "n": {i}}}' for i in range(5)]
+    ordered = list(execute_agent_batch("slow", agents, records, max_workers=3))
+    assert [outcome["index"] for outcome in ordered] == list(range(6))
+
+    unordered = list(execute_agent_batch("slow", agents, records, max_workers=3, ordered=False))
+    assert sorted(outcome["index"] for outcome in unordered) == list(range(6))
+    assert unordered[-1]["index"] == 0
+
+
+def test_batch_reuses_one_instance_per_worker():
+    """Each worker thread instantiates the agent once."""
+    created = []
+
+    class CountingAgent(EchoAgent):
+        def __init__(self):
+            created.append(self)
+
+    outcomes = list(execute_agent_batch("count", {"count": CountingAgent}, ['{}'] * 20, max_workers=2))
+    assert len(outcomes) == 20
+    assert len(created) <= 2
+
+
+def test_batch_unknown_agent(agents):
+    with pytest.raises(ValueError, match="not found"):
+        list(execute_agent_batch("missing", agents, ['{}']))
@@ -0,0 +1,90 @@
+import pytest
+import requests
+from core import breaker, metrics
+from core.base import AgentBase
+from core.context import agent_scope
+from core.executor import invoke_agent
+from core.metrics import Registry
+from core.retry import RetryPolicy
+from core.transport import Transport
+
+
+class EchoAgent(AgentBase):
+    """Agent returning its keyword arguments, or an error result when asked."""
+    def execute(self, fail=False, **kwargs):
+        if fail == "raise":
+            raise ValueError("boom")
+        return {"error": "bad input"} if fail else kwargs
+
+    def health_check(self):
+        return {"status": "healthy"}
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    """Fixture giving each test an empty process-wide registry."""
+    fresh = Registry()
+    monkeypatch.setattr(metrics, "_registry", fresh)
+    monkeypatch.setattr(breaker, "_breakers", {})
+    return fresh
+
+
+def test_agent_outcomes_are_counted_by_type(registry):
+    agent = EchoAgent()
+    invoke_agent("echo", agent, {"x": 1})
+    invoke_agent("echo", agent, {"fail": True})
+    with pytest.raises(ValueError):
+        invoke_agent("echo", agent, {"fail": "raise"})
+
+    summary = registry.summary()["agents"]["echo"]
+    assert summary["success"] == 1
+    assert summary["error"] == 2
+    assert summary["errors"] == {"ErrorResult": 1, "ValueError": 1}
+    assert summary["latency"]["count"] == 3
+
+
+def test_cache_lookups_are_counted(registry):
+    metrics.record_cache("weather", hit=False)
+    metrics.record_cache("weather", hit=True)
+    metrics.record_cache("weather", hit=True)
+    metrics.record_cache("weather", hit=True)
+    assert registry.summary()["agents"]["weather"]["cache"] == {"hit": 3, "miss": 1, "hit_rate": 0.75}
+
+
+def test_transport_records_http_attempts(registry, monkeypatch):
+    transport = Transport(retry_policy=RetryPolicy(max_attempts=2, backoff=0))
+    outcomes = [requests.ConnectionError("reset")]
+
+    def respond(method, url, **kwargs):
+        if outcomes:
+            raise outcomes.pop()
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b"x" * 2000
+        return response
+
+    monkeypatch.setattr(transport.session, "request", respond)
+    with agent_scope("weather"):
+        transport.get("https://api.example.com/forecast")
+
+    host = registry.summary()["hosts"]["api.example.com"]
+    assert host["statuses"] == {"2xx": 1}
+    assert host["errors"] == {"ConnectionError": 1}
+    assert host["retries"] == 1
+    assert host["latency"]["weather"]["count"] == 2
+    assert host["response_bytes"]["weather"]["max"] == 2000
+
+
+def test_prometheus_exposition(registry):
+    metrics.record_http("api.example.com", "weather", 0.2, status=503, size=100)
+    metrics.record_cache("we\"ather", hit=True)
+    breaker.get_breaker("api.example.com")
+    text = registry.render()
+
+    assert "# TYPE plugflow_http_request_duration_seconds histogram" in text
+    assert 'plugflow_http_request_duration_seconds_bucket{agent="weather",host="api.example.com",le="0.25"} 1' in text
+    assert 'plugflow_http_request_duration_seconds_bucket{agent="weather",host="api.example.com",le="0.1"} 0' in text
+    assert 'plugflow_http_request_duration_seconds_count{agent="weather",host="api.example.com"} 1' in text
+    assert 'plugflow_http_requests_total{agent="weather",host="api.example.com",status="5xx"} 1' in text
+    assert 'plugflow_cache_requests_total{agent="we\\"ather",result="hit"} 1' in text
+    assert 'plugflow_circuit_open{host="api.example.com"} 0' in text
@@ -0,0 +1,94 @@
+import threading
+import time
+import pytest
+import requests
+from core import ratelimit
+from core.deadline import deadline_scope
+from core.ratelimit import RateLimiter, RateLimitExceeded, request_api_key
+from core.transport import Transport
+
+
+def test_calls_over_the_rate_wait_instead_of_failing():
+    """A burst beyond capacity is spread out at the configured rate."""
+    limiter = RateLimiter()
+    limiter.configure("api.example.com", per_second=20, burst=2)
+    started = time.monotonic()
+    waits = [limiter.acquire("api.example.com", "key") for _ in range(6)]
+    elapsed = time.monotonic() - started
+    assert waits[:2] == [0.0, 0.0]
+    assert 0.15 < elapsed < 0.4
+
+
+def test_concurrent_callers_share_the_rate():
+    limiter = RateLimiter()
+    limiter.configure("api.example.com", per_second=50, burst=1)
+    started = time.monotonic()
+    threads = [threading.Thread(target=limiter.acquire, args=("api.example.com", "key")) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert time.monotonic() - started >= 0.17
+
+
+def test_keys_and_unknown_hosts_are_metered_separately():
+    limiter = RateLimiter()
+    limiter.configure("api.example.com", per_second=1)
+    assert limiter.acquire("api.example.com", "key-a") == 0.0
+    assert limiter.acquire("api.example.com", "key-b") == 0.0
+    assert limiter.acquire("other.example.com", "key-a") == 0.0
+    assert set(limiter.snapshot()["api.example.com"]) == {ratelimit._key_id("key-a"), ratelimit._key_id("key-b")}
+
+
+def test_daily_quota_and_max_wait_raise():
+    """Calls that cannot be scheduled fail fast and are not counted."""
+    limiter = RateLimiter(max_wait=0.5)
+    limiter.configure("quota.example.com", per_day=2)
+    limiter.acquire("quota.example.com", "key")
+    limiter.acquire("quota.example.com", "key")
+    with pytest.raises(RateLimitExceeded, match="daily quota"):
+        limiter.acquire("quota.example.com", "key")
+
+    limiter.configure("slow.example.com", per_minute=1)
+    limiter.acquire("slow.example.com", "key")
+    with pytest.raises(RateLimitExceeded):
+        limiter.acquire("slow.example.com", "key")
+    usage = limiter.snapshot()["slow.example.com"][ratelimit._key_id("key")]
+    assert usage["calls"] == 1
+
+
+def test_wait_is_capped_to_the_deadline():
+    """A call that would only get a token after its deadline fails at once."""
+    limiter = RateLimiter()
+    limiter.configure("api.example.com", per_second=1, burst=1)
+    limiter.acquire("api.example.com", "key")
+    started = time.monotonic()
+    with deadline_scope(0.2), pytest.raises(RateLimitExceeded):
+        limiter.acquire("api.example.com", "key")
+    assert time.monotonic() - started < 0.1
+    assert isinstance(RateLimitExceeded("x"), requests.RequestException)
+    with deadline_scope(5):
+        assert limiter.acquire("api.example.com", "key") > 0.5
+
+
+def test_request_api_key_reads_headers_and_params():
+    assert request_api_key({"headers": {"X-RapidAPI-Key": "abc"}}) == "abc"
+    assert request_api_key({"params": {"apikey": "def"}}) == "def"
+    assert request_api_key({}) is None
+
+
+def test_transport_applies_the_limiter(monkeypatch):
+    """The transport asks the limiter before every request."""
+    limiter = RateLimiter()
+    seen = []
+    monkeypatch.setattr(limiter, "acquire", lambda host, api_key=None: seen.append((host, api_key)))
+    transport = Transport(limiter=limiter)
+    response = requests.Response()
+    response.status_code = 200
+    monkeypatch.setattr(transport.session, "request", lambda method, url, **kwargs: response)
+    transport.get("https://v3.football.api-sports.io/fixtures", headers={"x-apisports-key": "k"})
+    assert seen == [("v3.football.api-sports.io", "k")]
+
+
+def test_shared_limiter_reads_manifests():
+    assert ratelimit.get_limiter().limits("v3.football.api-sports.io") == {"per_minute": 10, "per_day": 100}
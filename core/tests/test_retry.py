@@ -0,0 +1,113 @@
+import pytest
+import requests
+from urllib3.exceptions import MaxRetryError, NewConnectionError
+from core import retry
+from core.context import agent_scope
+from core.retry import RetryPolicy, parse_retry_after
+from core.transport import Transport
+
+
+class FakeResponse:
+    """Minimal response with a status and headers."""
+
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.content = b""
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def _sender(outcomes):
+    """Return a send function replaying responses or raising exceptions in order."""
+    calls = []
+
+    def send():
+        outcome = outcomes[len(calls)]
+        calls.append(outcome)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    return send, calls
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Fixture recording backoff delays instead of sleeping."""
+    recorded = []
+    monkeypatch.setattr(retry.time, "sleep", recorded.append)
+    return recorded
+
+
+def test_transient_errors_are_retried(sleeps):
+    send, calls = _sender([FakeResponse(503), requests.ConnectionError("reset"), FakeResponse(200)])
+    response = RetryPolicy(max_attempts=3).call("GET", send)
+    assert response.status_code == 200
+    assert len(calls) == 3
+    assert calls[0].closed
+    assert all(0 <= delay <= 1.0 for delay in sleeps)
+
+
+def test_exhausted_attempts_return_last_response(sleeps):
+    send, calls = _sender([FakeResponse(500)] * 3)
+    assert RetryPolicy(max_attempts=3).call("GET", send).status_code == 500
+    assert len(calls) == 3
+
+
+def test_non_idempotent_methods_only_retry_429(sleeps):
+    send, calls = _sender([FakeResponse(503)])
+    assert RetryPolicy().call("POST", send).status_code == 503
+    send, calls = _sender([FakeResponse(429), FakeResponse(201)])
+    assert RetryPolicy().call("POST", send).status_code == 201
+    send, calls = _sender([requests.ReadTimeout("slow")])
+    with pytest.raises(requests.ReadTimeout):
+        RetryPolicy().call("POST", send)
+    send, calls = _sender([requests.ConnectionError("reset")])
+    with pytest.raises(requests.ConnectionError):
+        RetryPolicy().call("POST", send)
+
+
+def test_connections_that_never_opened_are_retried_for_every_method(sleeps):
+    refused = NewConnectionError("api.example.com", "Failed to establish a new connection: refused")
+    send, calls = _sender([requests.ConnectionError(MaxRetryError(None, "/", refused)),
+                           requests.ConnectionError(refused), requests.ConnectTimeout("slow"), FakeResponse(201)])
+    assert RetryPolicy(max_attempts=4).call("POST", send).status_code == 201
+    assert len(calls) == 4
+
+
+def test_client_errors_are_not_retried(sleeps):
+    send, calls = _sender([FakeResponse(404)])
+    assert RetryPolicy().call("GET", send).status_code == 404
+    assert sleeps == []
+
+
+def test_retry_after_is_honoured_within_the_deadline(sleeps):
+    send, _ = _sender([FakeResponse(429, {"Retry-After": "2"}), FakeResponse(200)])
+    assert RetryPolicy().call("GET", send).status_code == 200
+    assert sleeps == [2.0]
+
+    send, calls = _sender([FakeResponse(429, {"Retry-After": "20"}), FakeResponse(200)])
+    assert RetryPolicy(deadline=5).call("GET", send).status_code == 429
+    assert len(calls) == 1
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+def test_transport_uses_the_current_agent_policy(monkeypatch, sleeps):
+    """Policies come from the manifest of the agent executing the request."""
+    monkeypatch.setattr(retry, "_policies", {})
+    monkeypatch.setattr(retry, "get_manifest", lambda name: {"retry": {"max_attempts": 2}} if name == "flaky" else {})
+    transport = Transport()
+    send, calls = _sender([FakeResponse(502)] * 5)
+    monkeypatch.setattr(transport.session, "request", lambda method, url, **kwargs: send())
+    with agent_scope("flaky"):
+        transport.get("http://127.0.0.1/")
+    assert len(calls) == 2
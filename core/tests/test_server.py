@@ -0,0 +1,98 @@
+import json
+import threading
+import pytest
+import requests
+from core.base import AgentBase
+from core.server import make_server
+
+
+class CountingAgent(AgentBase):
+    """Agent counting how many times it was instantiated."""
+    instances = 0
+
+    def __init__(self):
+        CountingAgent.instances += 1
+
+    def execute(self, **kwargs):
+        return {"echo": kwargs}
+
+    def health_check(self):
+        return {"status": "healthy"}
+
+
+class LookupFailingAgent(AgentBase):
+    def execute(self, **kwargs):
+        return {}["missing field"]
+
+    def health_check(self):
+        return {"status": "unhealthy"}
+
+
+class BrokenAgent(AgentBase):
+    def execute(self, **kwargs):
+        raise ValueError("boom")
+
+    def health_check(self):
+        return {"status": "unhealthy"}
+
+
+@pytest.fixture
+def server():
+    """Fixture serving two fake agents on a free local port."""
+    CountingAgent.instances = 0
+    httpd = make_server({"counting": CountingAgent, "broken": BrokenAgent, "lookup": LookupFailingAgent}, port=0, preload=["counting"])
+    thread = threading.Thread(target=httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _execute(server, payload):
+    response = requests.post(f"{server}/execute", json=payload, stream=True)
+    return response, [json.loads(line) for line in response.iter_lines() if line]
+
+
+def test_execute_reuses_warm_instance(server):
+    """Repeated requests run on the instance created by --preload."""
+    for i in range(3):
+        _, lines = _execute(server, {"agent": "counting", "params": {"n": i}})
+        assert lines == [{"agent": "counting", "status": "success", "result": {"echo": {"n": i}}}]
+    assert CountingAgent.instances == 1
+
+
+def test_flow_streams_one_line_per_agent(server):
+    """A flow yields one NDJSON record per agent, failures included."""
+    response, lines = _execute(server, {"flow": ["counting", "broken", "missing"], "params": {}})
+    assert response.headers["Content-Type"] == "application/x-ndjson"
+    assert [line["status"] for line in lines] == ["success", "failed", "failed"]
+    assert lines[1]["error"] == "boom"
+    assert lines[2]["error"] == "Agent missing not found."
+
+
+def test_key_error_inside_an_agent_is_not_reported_as_missing(server):
+    _, lines = _execute(server, {"agent": "lookup", "params": {}})
+    assert lines == [{"agent": "lookup", "status": "failed", "error": "'missing field'"}]
+
+
+def test_invalid_request_is_rejected(server):
+    for payload in ({"params": {}}, ["counting"], {"flow": [1]}, {"flow": {"agent": "counting"}}):
+        response = requests.post(f"{server}/execute", json=payload)
+        assert response.status_code == 400
+
+
+def test_flow_given_as_one_name(server):
+    _, lines = _execute(server, {"flow": "counting", "params": {}})
+    assert [line["agent"] for line in lines] == ["counting"]
+
+
+def test_health_and_agents(server):
+    assert requests.get(f"{server}/health").json() == {"status": "ok", "agents": {"counting": 1}}
+    assert requests.get(f"{server}/agents").json() == {"agents": ["broken", "counting", "lookup"]}
+
+
+def test_metrics_endpoint(server):
+    _execute(server, {"agent": "counting", "params": {}})
+    response = requests.get(f"{server}/metrics")
+    assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+    assert 'plugflow_agent_calls_total{agent="counting",outcome="success"}' in response.text
@@ -0,0 +1,130 @@
+import asyncio
+import threading
+import time
+from core import executor
+from core.deadline import DeadlineExceeded, deadline_scope
+from core.singleflight import SingleFlight
+
+
+def _run_concurrently(count, target):
+    """Start ``count`` threads on ``target`` at once and return their results."""
+    results = [None] * count
+    barrier = threading.Barrier(count)
+
+    def worker(i):
+        barrier.wait()
+        try:
+            results[i] = target()
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_concurrent_identical_calls_share_one_execution():
+    group = SingleFlight()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.2)
+        return {"temp": 12}
+
+    results = _run_concurrently(10, lambda: group.do("weather:London", slow))
+    assert results == [{"temp": 12}] * 10
+    assert len(calls) == 1
+    assert group.coalesced == 9
+
+
+def test_errors_reach_every_waiter_and_are_not_remembered():
+    group = SingleFlight()
+
+    def failing():
+        time.sleep(0.1)
+        raise ValueError("429 Too Many Requests")
+
+    results = _run_concurrently(5, lambda: group.do("k", failing))
+    assert all(isinstance(result, ValueError) for result in results)
+    assert group.do("k", lambda: "recovered") == "recovered"
+
+
+def test_invoke_agent_coalesces_unless_disabled(monkeypatch):
+    """Only identical params are shared, and agents can opt out in their manifest."""
+    calls = []
+
+    class SlowAgent:
+        def execute(self, **kwargs):
+            calls.append(kwargs)
+            time.sleep(0.2)
+            return kwargs
+
+    manifests = {"mailer": {"single_flight": False}}
+    monkeypatch.setattr(executor, "get_manifest", lambda name: manifests.get(name, {}))
+    cities = iter(["London", "Paris"] * 3)
+    results = _run_concurrently(6, lambda: executor.invoke_agent("weather", SlowAgent(), {"city": next(cities)}))
+    assert sorted(call["city"] for call in calls) == ["London", "Paris"]
+    assert sorted(result["city"] for result in results) == ["London"] * 3 + ["Paris"] * 3
+
+    calls.clear()
+    _run_concurrently(3, lambda: executor.invoke_agent("mailer", SlowAgent(), {"to": "a@b.c"}))
+    assert len(calls) == 3
+
+
+def test_waiters_keep_their_own_deadline():
+    """A waiter gives up at its deadline, and reruns a call whose leader ran out of time."""
+    group = SingleFlight()
+    calls = []
+    outcomes = {}
+
+    def call():
+        calls.append(1)
+        if len(calls) == 1:
+            time.sleep(0.3)
+            raise DeadlineExceeded("leader out of time")
+        return "fresh"
+
+    def caller(name, delay, seconds):
+        time.sleep(delay)
+        started = time.monotonic()
+        with deadline_scope(seconds):
+            try:
+                outcomes[name] = group.do("k", call)
+            except DeadlineExceeded as e:
+                outcomes[name] = e
+        outcomes[f"{name}_elapsed"] = time.monotonic() - started
+
+    threads = [threading.Thread(target=caller, args=args)
+               for args in (("leader", 0, None), ("short", 0.05, 0.1), ("long", 0.05, 5))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert isinstance(outcomes["leader"], DeadlineExceeded)
+    assert isinstance(outcomes["short"], DeadlineExceeded) and outcomes["short_elapsed"] < 0.2
+    assert outcomes["long"] == "fresh"
+    assert len(calls) == 2
+
+
+def test_async_waiters_keep_their_own_deadline():
+    group = SingleFlight()
+
+    async def slow():
+        await asyncio.sleep(0.3)
+        return "done"
+
+    async def waiter():
+        await asyncio.sleep(0.05)
+        with deadline_scope(0.1):
+            return await group.ado("k", slow)
+
+    async def main():
+        return await asyncio.gather(group.ado("k", slow), waiter(), return_exceptions=True)
+
+    leader, waiting = asyncio.run(main())
+    assert leader == "done"
+    assert isinstance(waiting, DeadlineExceeded)
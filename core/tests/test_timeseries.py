@@ -0,0 +1,89 @@
+import os
+from core import timeseries
+from core.timeseries import SeriesStore, from_records, parse_time
+
+KEY = ("TIME_SERIES_DAILY", "IBM")
+
+
+def _records(*days):
+    return {f"2024-01-{day:02d}": {"1. open": f"{day}.5000", "5. volume": str(day * 100)} for day in days}
+
+
+def _write(store, *days, **meta):
+    timestamps, columns, decimals = from_records(_records(*days))
+    return store.write(KEY, timestamps, columns, {"decimals": decimals, **meta})
+
+
+def test_appends_merges_and_reads_back_exact_records(tmp_path):
+    _write(SeriesStore(str(tmp_path)), 2, 3)
+    _write(SeriesStore(str(tmp_path)), 5, 4)   # Appended
+    _write(SeriesStore(str(tmp_path)), 1, 3)   # Merged
+
+    series = SeriesStore(str(tmp_path)).load(KEY)
+    assert list(series.timestamps) == [parse_time(f"2024-01-0{day}") for day in range(1, 6)]
+    assert series.to_records("%Y-%m-%d") == _records(5, 4, 3, 2, 1)
+    assert list(series.to_records("%Y-%m-%d")) == [f"2024-01-0{day}" for day in (5, 4, 3, 2, 1)]
+    assert list(series.between(parse_time("2024-01-02"), parse_time("2024-01-03", end=True)).columns["1. open"]) == \
+        [2.5, 3.5]
+    assert list(series.tail(2).columns["5. volume"]) == [400.0, 500.0]
+
+
+def test_interrupted_append_is_ignored(tmp_path):
+    store = SeriesStore(str(tmp_path))
+    _write(store, 1, 2)
+    path = os.path.join(str(tmp_path), *KEY)
+    with open(os.path.join(path, "0.f64"), "ab") as f:
+        f.write(b"\0" * 8)   # A column written before the row count was
+
+    assert len(SeriesStore(str(tmp_path)).load(KEY)) == 2
+    series = _write(SeriesStore(str(tmp_path)), 3)
+    assert len(series) == 3
+    assert SeriesStore(str(tmp_path)).load(KEY).to_records("%Y-%m-%d") == _records(3, 2, 1)
+
+
+def test_overlapping_tail_is_appended_unless_a_stored_row_changed(tmp_path, monkeypatch):
+    """Only a refetched row whose values changed makes the series be rewritten."""
+    store = SeriesStore(str(tmp_path))
+    _write(store, 1, 2, 3)
+    written = []
+    write_file = timeseries._write_file
+    monkeypatch.setattr(timeseries, "_write_file", lambda path, data: (written.append(os.path.basename(path)),
+                                                                        write_file(path, data)))
+
+    _write(store, 2, 3, 4)
+    assert written == ["meta.json"]
+    assert SeriesStore(str(tmp_path)).load(KEY).to_records("%Y-%m-%d") == _records(4, 3, 2, 1)
+
+    written.clear()
+    timestamps, columns, decimals = from_records({**_records(4, 5), "2024-01-04": {"1. open": "9.0", "5. volume": "1"}})
+    store.write(KEY, timestamps, columns, {"decimals": decimals})
+    assert "timestamp.i64" in written
+    series = SeriesStore(str(tmp_path)).load(KEY)
+    assert len(series) == 5 and list(series.columns["1. open"])[3:] == [9.0, 5.5]
+
+
+def test_sync_fetches_the_tail_and_full_history_only_when_needed(tmp_path):
+    store = SeriesStore(str(tmp_path))
+    calls = []
+
+    def fetch(full):
+        calls.append(full)
+        return (_records(1, 2, 3, 4) if full else _records(3, 4, 5)), {"source": {"2. Symbol": "IBM"}}
+
+    assert len(store.sync(KEY, fetch, max_age=60)) == 3
+    assert len(store.sync(KEY, fetch, max_age=60)) == 3         # Fresh: answered from disk
+    assert len(store.sync(KEY, fetch, max_age=60, full=True)) == 5
+    assert store.sync(KEY, fetch, max_age=60, full=True).meta["complete"]
+    assert len(store.sync(KEY, fetch, max_age=0, full=True)) == 5  # Stale but complete: tail only
+    assert calls == [False, True, False]
+
+    # Without an upstream answer the stored rows are served.
+    assert len(store.sync(KEY, lambda full: None, max_age=0)) == 5
+    assert store.sync(("TIME_SERIES_DAILY", "NONE"), lambda full: None, max_age=0) is None
+
+
+def test_sync_marks_a_series_with_a_gap_incomplete(tmp_path):
+    store = SeriesStore(str(tmp_path))
+    store.sync(KEY, lambda full: (_records(1, 2), {}), max_age=0, full=True)
+    series = store.sync(KEY, lambda full: (_records(8, 9), {}), max_age=0, full=True)
+    assert not series.meta["complete"]
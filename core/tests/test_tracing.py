@@ -0,0 +1,175 @@
+import json
+import threading
+import types
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from pydantic import BaseModel
+from core import tracing
+from core.discovery import discover_agents
+from core.base import AgentBase
+from core.executor import execute_agent_dag, execute_agent_flow
+from core.transport import Transport
+
+
+class ListExporter:
+    """Exporter keeping finished spans in memory."""
+
+    def __init__(self):
+        self.spans = []
+
+    def export(self, span):
+        self.spans.append(span)
+
+    def shutdown(self):
+        pass
+
+    def named(self, name):
+        return [span for span in self.spans if span.name == name]
+
+
+class EchoAgent(AgentBase):
+    """Agent returning its keyword arguments."""
+    def execute(self, **kwargs):
+        return kwargs
+
+    def health_check(self):
+        return {"status": "healthy"}
+
+
+@pytest.fixture
+def exporter(monkeypatch):
+    """Fixture collecting the spans of a test."""
+    collected = ListExporter()
+    monkeypatch.setattr(tracing, "_exporters", [collected])
+    return collected
+
+
+class CollectorHandler(BaseHTTPRequestHandler):
+    """Collector stand-in recording OTLP request bodies."""
+    received = []
+
+    def do_POST(self):
+        CollectorHandler.received.append(json.loads(self.rfile.read(int(self.headers["Content-Length"]))))
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_GET(self):
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def collector():
+    """Fixture running a local HTTP server for the duration of a test."""
+    CollectorHandler.received = []
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), CollectorHandler)
+    thread = threading.Thread(target=httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_spans_are_noops_without_exporters(monkeypatch):
+    monkeypatch.setattr(tracing, "_exporters", [])
+    with tracing.span("ignored") as span:
+        assert span is None
+    assert tracing.current_span() is None
+
+
+def test_spans_nest_and_record_errors(exporter):
+    with tracing.span("outer") as outer:
+        with tracing.span("inner", key="value"):
+            pass
+        with pytest.raises(ValueError):
+            with tracing.span("failing"):
+                raise ValueError("boom")
+
+    inner, failing, root = exporter.spans
+    assert root is outer and root.parent_id is None
+    assert inner.parent_id == root.span_id and inner.trace_id == root.trace_id
+    assert inner.attributes == {"key": "value"}
+    assert failing.error == "ValueError: boom"
+    assert failing.to_dict()["status"] == "error"
+
+
+def test_flow_spans_cover_each_agent(exporter):
+    execute_agent_flow(["echo"], {"echo": EchoAgent}, '{"x": 1}')
+    flow = exporter.named("flow")[0]
+    agent = exporter.named("agent")[0]
+    assert agent.parent_id == flow.span_id
+    children = {span.name for span in exporter.spans if span.parent_id == agent.span_id}
+    assert children == {"agent.instantiate", "agent.execute", "agent.output"}
+
+
+def test_dag_steps_inherit_the_flow_span(exporter):
+    execute_agent_dag(["echo", {"id": "again", "agent": "echo"}], {"echo": EchoAgent}, "")
+    flow = exporter.named("flow")[0]
+    assert [span.parent_id for span in exporter.named("agent")] == [flow.span_id, flow.span_id]
+
+
+def test_only_agent_models_are_traced(exporter):
+    """Models of an agent module are wrapped once; pydantic itself is left untouched."""
+    module = types.ModuleType("agents.fake")
+    module.Params = type("Params", (BaseModel,), {"__module__": module.__name__, "__annotations__": {"x": int}})
+    module.Other = type("Other", (BaseModel,), {"__module__": "elsewhere", "__annotations__": {"x": int}})
+    tracing.instrument_models(module)
+    tracing.instrument_models(module)
+
+    assert module.Params(x=1).x == 1
+    module.Other(x=1)
+    assert [span.attributes for span in exporter.named("pydantic.validate")] == [{"model": "Params"}]
+    assert not getattr(BaseModel.__init__, "_plugflow_traced", False)
+
+
+def test_discovery_is_traced(exporter):
+    discover_agents(["weather"])
+    assert len(exporter.named("discover_agents")) == 1
+
+
+def test_http_requests_and_json_decode_are_traced(exporter, collector):
+    transport = Transport()
+    with tracing.span("caller") as caller:
+        assert transport.get(f"{collector}/data").json() == {"ok": True}
+    transport.close()
+
+    request = exporter.named("http.request")[0]
+    assert request.parent_id == caller.span_id
+    assert request.attributes["status_code"] == 200
+    assert exporter.named("http.attempt")[0].parent_id == request.span_id
+    assert exporter.named("json.decode")[0].parent_id == caller.span_id
+
+
+def test_otlp_exporter_posts_batches(collector):
+    exporter = tracing.OTLPExporter(f"{collector}/v1/traces", batch_size=2)
+    parent = tracing.Span("parent", {})
+    child = tracing.Span("child", {"count": 3}, parent)
+    for span in (child, parent):
+        span.end_ns = span.start_ns + 1000
+        exporter.export(span)
+    exporter.shutdown()
+
+    assert len(CollectorHandler.received) == 1
+    spans = CollectorHandler.received[0]["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    assert [span["name"] for span in spans] == ["child", "parent"]
+    assert spans[0]["parentSpanId"] == spans[1]["spanId"]
+    assert spans[0]["attributes"] == [{"key": "count", "value": {"intValue": "3"}}]
+
+
+def test_json_file_exporter(tmp_path):
+    path = tmp_path / "trace.jsonl"
+    tracing.configure(path=str(path))
+    try:
+        with tracing.span("work"):
+            pass
+    finally:
+        tracing.shutdown()
+    record = json.loads(path.read_text())
+    assert record["name"] == "work" and record["status"] == "ok"
@@ -0,0 +1,117 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+import requests
+from core.retry import RetryPolicy
+from core.transport import PooledConnection, Transport
+
+
+class EchoHandler(BaseHTTPRequestHandler):
+    """Keep-alive handler answering with the request path and connection id."""
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if self.path.startswith("/slow"):
+            time.sleep(0.2)
+        body = json.dumps({"path": self.path, "connection": id(self.connection)}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Set-Cookie", "session=abc")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    """Fixture running a local HTTP server for the duration of a test."""
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), EchoHandler)
+    thread = threading.Thread(target=httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield f"127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_requests_to_same_host_reuse_the_connection(server):
+    """Sequential calls to one host share a single keep-alive connection."""
+    transport = Transport()
+    connections = {transport.get(f"http://{server}/item/{i}").json()["connection"] for i in range(5)}
+    transport.close()
+    assert len(connections) == 1
+
+
+def test_default_timeout_is_applied(server, monkeypatch):
+    """Requests without a timeout get the transport default."""
+    transport = Transport(timeout=(1, 2))
+    seen = {}
+    real_request = transport.session.request
+
+    def spy(method, url, **kwargs):
+        seen.update(kwargs)
+        return real_request(method, url, **kwargs)
+
+    monkeypatch.setattr(transport.session, "request", spy)
+    transport.get(f"http://{server}/")
+    assert seen["timeout"] == (1, 2)
+
+
+def test_cookies_are_not_persisted(server):
+    """The shared session never replays cookies between agents."""
+    transport = Transport()
+    transport.get(f"http://{server}/")
+    assert len(transport.session.cookies) == 0
+
+
+def test_pooled_connection_mimics_http_client(server):
+    """PooledConnection exposes the http.client request/getresponse/read API."""
+    class PlainConnection(PooledConnection):
+        scheme = "http"
+
+    host, port = server.split(":")
+    conn = PlainConnection(host, port=int(port), transport=Transport())
+    conn.request("GET", "/path?q=1", headers={"x-key": "1"})
+    response = conn.getresponse()
+    conn.close()
+    assert response.status == 200
+    assert json.loads(response.read().decode("utf-8"))["path"] == "/path?q=1"
+    assert response.getheader("Content-Type") == "application/json"
+
+
+def test_async_requests_are_in_flight_together(server):
+    """Async requests overlap on one event loop and come back as requests responses."""
+    transport = Transport()
+
+    async def fetch_all():
+        try:
+            return await asyncio.gather(*(transport.aget(f"http://{server}/slow", params={"i": i, "skip": None})
+                                          for i in range(10)))
+        finally:
+            await transport.aclose()
+
+    started = time.perf_counter()
+    responses = asyncio.run(fetch_all())
+    assert time.perf_counter() - started < 1
+    assert isinstance(responses[0], requests.Response)
+    assert [response.json()["path"] for response in responses] == [f"/slow?i={i}" for i in range(10)]
+    assert responses[0].headers["content-type"] == "application/json"
+
+
+def test_async_connection_errors_are_requests_errors():
+    """A refused async connection raises the requests exception agents already handle."""
+    transport = Transport(retry_policy=RetryPolicy(max_attempts=1))
+
+    async def fetch():
+        try:
+            return await transport.aget("http://127.0.0.1:9/")
+        finally:
+            await transport.aclose()
+
+    with pytest.raises(requests.ConnectionError):
+        asyncio.run(fetch())
@@ -0,0 +1,329 @@
+import json
+import logging
+import os
+import re
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timezone
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DIRECTORY = ".plugflow_series"
+META_FILE = "meta.json"
+TIMESTAMP_FILE = "timestamp.i64"
+TIMESTAMP_TYPE = "q"    # Seconds since the epoch, naive timestamps read as UTC
+VALUE_TYPE = "d"
+
+_UNSAFE = re.compile(r"[^A-Za-z0-9_.-]|^\.+")
+
+
+def parse_time(text, end=False):
+    """
+    Convert an ISO date or date-time into a stored timestamp.
+
+    Args:
+        text (str): Date (``2024-01-31``) or date-time (``2024-01-31 16:00:00``).
+        end (bool): Whether a bare date stands for the end of that day, as the
+            inclusive end of a range does.
+
+    Returns:
+        int: Seconds since the epoch.
+    """
+    timestamp = int(datetime.fromisoformat(text).replace(tzinfo=timezone.utc).timestamp())
+    if end and len(text.strip()) == 10:
+        timestamp += 86399
+    return timestamp
+
+
+def format_time(timestamp, time_format):
+    """Format a stored timestamp with ``time_format``."""
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime(time_format)
+
+
+def _decimals(text):
+    return len(text) - text.index(".") - 1 if "." in text else 0
+
+
+def from_records(records):
+    """
+    Convert a mapping of ISO timestamps to fields of numeric strings, the
+    layout of an Alpha Vantage time series, into columns sorted by time.
+
+    Args:
+        records (dict): ``{timestamp: {field: value}}``.
+
+    Returns:
+        tuple: The ``array`` of timestamps, a dict of value ``array`` per field
+        and the number of decimals each field is written with.
+    """
+    rows = sorted(((parse_time(text), fields) for text, fields in records.items()), key=lambda row: row[0])
+    names = list(rows[0][1]) if rows else []
+    timestamps = array(TIMESTAMP_TYPE, (timestamp for timestamp, _ in rows))
+    columns = {name: array(VALUE_TYPE, (float(fields[name]) for _, fields in rows)) for name in names}
+    decimals = {name: max((_decimals(str(fields[name])) for _, fields in rows), default=0) for name in names}
+    return timestamps, columns, decimals
+
+
+class Series:
+    """Rows of a stored series as columns sorted by timestamp, with the metadata saved alongside."""
+
+    def __init__(self, timestamps, columns, meta):
+        self.timestamps = timestamps
+        self.columns = columns
+        self.meta = meta
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def _slice(self, start, stop):
+        columns = {name: values[start:stop] for name, values in self.columns.items()}
+        return Series(self.timestamps[start:stop], columns, self.meta)
+
+    def between(self, start=None, end=None):
+        """Return the rows whose timestamp lies between ``start`` and ``end``, both included."""
+        low = 0 if start is None else bisect_left(self.timestamps, start)
+        high = len(self) if end is None else bisect_right(self.timestamps, end)
+        return self._slice(low, high)
+
+    def tail(self, count):
+        """Return the latest ``count`` rows."""
+        return self._slice(max(0, len(self) - count), len(self))
+
+    def to_records(self, time_format, newest_first=True):
+        """
+        Return the rows in the layout ``from_records`` reads.
+
+        Args:
+            time_format (str): ``strftime`` format of the timestamps.
+            newest_first (bool): Whether the latest row comes first.
+
+        Returns:
+            dict: ``{timestamp: {field: value}}`` with values written with the
+            decimals they were recorded with.
+        """
+        decimals = self.meta.get("decimals", {})
+        formats = {name: f"{{:.{decimals.get(name, 0)}f}}" for name in self.columns}
+        positions = range(len(self) - 1, -1, -1) if newest_first else range(len(self))
+        return {
+            format_time(self.timestamps[i], time_format): {
+                name: formats[name].format(values[i]) for name, values in self.columns.items()
+            }
+            for i in positions
+        }
+
+
+def _read_column(path, typecode, count):
+    values = array(typecode)
+    with open(path, "rb") as f:
+        values.fromfile(f, count)
+    return values
+
+
+def _write_file(path, data):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+class SeriesStore:
+    """
+    On-disk columnar store of time series.
+
+    Every series has a directory of its own, named after a key such as
+    ``("TIME_SERIES_DAILY", "IBM")``, holding one binary file of timestamps,
+    one per column of values and a ``meta.json`` with the row count and the
+    metadata of the caller. Rows later than the stored ones are appended to
+    the column files, others make the series be rewritten. The row count is
+    written last, so an interrupted append is ignored on the next load.
+    """
+
+    def __init__(self, directory=DEFAULT_DIRECTORY):
+        """
+        Initialize the store.
+
+        Args:
+            directory (str): Root directory of the series, created on the first write.
+        """
+        self.directory = directory
+        self._loaded = {}
+        self._lock = threading.Lock()
+
+    def _path(self, key):
+        return os.path.join(self.directory, *(_UNSAFE.sub("_", str(part)) or "_" for part in key))
+
+    def _read(self, path):
+        try:
+            with open(os.path.join(path, META_FILE), encoding="utf-8") as f:
+                meta = json.load(f)
+            rows = meta["rows"]
+            timestamps = _read_column(os.path.join(path, TIMESTAMP_FILE), TIMESTAMP_TYPE, rows)
+            columns = {name: _read_column(os.path.join(path, f"{index}.f64"), VALUE_TYPE, rows)
+                       for index, name in enumerate(meta["columns"])}
+        except FileNotFoundError:
+            return None
+        except (ValueError, KeyError, EOFError) as e:
+            logger.warning(f"Ignoring damaged series in {path}: {e}")
+            return None
+        return Series(timestamps, columns, meta)
+
+    def _load(self, key):
+        path = self._path(key)
+        try:
+            version = os.stat(os.path.join(path, META_FILE)).st_mtime_ns
+        except FileNotFoundError:
+            self._loaded.pop(key, None)
+            return None
+        loaded = self._loaded.get(key)
+        if loaded is None or loaded[0] != version:
+            series = self._read(path)
+            if series is None:
+                return None
+            loaded = self._loaded[key] = (version, series)
+        return loaded[1]
+
+    def load(self, key):
+        """Return a stored series, or None."""
+        with self._lock:
+            return self._load(key)
+
+    def write(self, key, timestamps, columns, meta):
+        """
+        Merge rows into a series and save it.
+
+        Rows replace stored ones with the same timestamp. When the columns
+        differ from the stored ones, the stored rows are dropped.
+
+        Args:
+            key (tuple): Key of the series.
+            timestamps (array): Sorted timestamps of the rows.
+            columns (dict): ``array`` of values per column.
+            meta (dict): Metadata replacing the stored one.
+
+        Returns:
+            Series: The merged series.
+        """
+        names = list(columns)
+        path = self._path(key)
+        with self._lock:
+            current = self._load(key)
+            os.makedirs(path, exist_ok=True)
+            if current is not None and list(current.columns) == names and len(current) and len(timestamps):
+                # A tail fetch overlaps the stored rows; drop them when unchanged so the rest is appended.
+                overlap = bisect_right(timestamps, current.timestamps[-1])
+                if overlap and self._unchanged(current, timestamps, columns, overlap):
+                    timestamps = timestamps[overlap:]
+                    columns = {name: values[overlap:] for name, values in columns.items()}
+            if current is not None and list(current.columns) == names and (
+                    not len(timestamps) or not len(current) or timestamps[0] > current.timestamps[-1]):
+                # Append, cutting off what an interrupted append may have left.
+                for index, (filename, values) in enumerate(
+                        [(TIMESTAMP_FILE, timestamps)] + [(f"{i}.f64", columns[n]) for i, n in enumerate(names)]):
+                    existing = current.timestamps if index == 0 else current.columns[names[index - 1]]
+                    with open(os.path.join(path, filename), "r+b") as f:
+                        f.truncate(len(existing) * existing.itemsize)
+                        f.seek(0, os.SEEK_END)
+                        values.tofile(f)
+                merged = Series(current.timestamps + timestamps,
+                                {name: current.columns[name] + columns[name] for name in names}, meta)
+            else:
+                if current is not None and list(current.columns) == names:
+                    merged = self._merge(current, Series(timestamps, columns, meta))
+                else:
+                    merged = Series(timestamps, columns, meta)
+                _write_file(os.path.join(path, TIMESTAMP_FILE), merged.timestamps.tobytes())
+                for index, name in enumerate(names):
+                    _write_file(os.path.join(path, f"{index}.f64"), merged.columns[name].tobytes())
+            merged.meta = {**meta, "rows": len(merged), "columns": names}
+            _write_file(os.path.join(path, META_FILE), json.dumps(merged.meta).encode("utf-8"))
+            self._loaded[key] = (os.stat(os.path.join(path, META_FILE)).st_mtime_ns, merged)
+        return merged
+
+    @staticmethod
+    def _unchanged(current, timestamps, columns, count):
+        """Return True if the first ``count`` rows are all stored with the same values."""
+        for i in range(count):
+            position = bisect_left(current.timestamps, timestamps[i])
+            if position == len(current) or current.timestamps[position] != timestamps[i]:
+                return False
+            if any(current.columns[name][position] != values[i] for name, values in columns.items()):
+                return False
+        return True
+
+    @staticmethod
+    def _merge(current, new):
+        rows = {timestamp: (current, i) for i, timestamp in enumerate(current.timestamps)}
+        rows.update({timestamp: (new, i) for i, timestamp in enumerate(new.timestamps)})
+        order = sorted(rows)
+        columns = {name: array(VALUE_TYPE, (series.columns[name][i] for series, i in map(rows.get, order)))
+                   for name in new.columns}
+        return Series(array(TIMESTAMP_TYPE, order), columns, new.meta)
+
+    def sync(self, key, fetch, max_age, full=False):
+        """
+        Return a stored series, first fetching the rows it is missing.
+
+        ``fetch(full)`` returns the records (see ``from_records``) of the
+        latest rows, or of the whole history when ``full`` is true, with the
+        metadata to keep; or None when the upstream has no data to give, in
+        which case the stored rows are returned as they are. Nothing is
+        fetched while the series is younger than ``max_age`` seconds and, if
+        ``full`` is asked for, complete. A series only becomes complete from a
+        full fetch, and stops being so when a fetched tail leaves a gap.
+
+        Args:
+            key (tuple): Key of the series.
+            fetch (callable): Called with ``full``, see above.
+            max_age (float): Seconds after which the latest rows are fetched again.
+            full (bool): Whether the whole history is needed.
+
+        Returns:
+            Series: The series, or None when nothing is stored or fetched.
+        """
+        series = self.load(key)
+        complete = series is not None and series.meta.get("complete", False)
+        if series is not None and time.time() - series.meta.get("fetched_at", 0) < max_age and (complete or not full):
+            return series
+
+        fetch_full = full and not complete
+        fetched = fetch(fetch_full)
+        if fetched is None:
+            if series is not None:
+                logger.warning(f"Serving stored series {'/'.join(key)}: the upstream returned no data")
+            return series
+        records, meta = fetched
+        timestamps, columns, decimals = from_records(records)
+        if not fetch_full and series is not None and len(series) and len(timestamps):
+            complete = complete and timestamps[0] <= series.timestamps[-1]
+        if series is not None:
+            stored = series.meta.get("decimals", {})
+            decimals = {name: max(places, stored.get(name, 0)) for name, places in decimals.items()}
+        meta = {**meta, "decimals": decimals, "fetched_at": time.time(), "complete": fetch_full or complete}
+        logger.info(f"Fetched {len(timestamps)} rows of series {'/'.join(key)}")
+        return self.write(key, timestamps, columns, meta)
+
+
+_store = SeriesStore()
+
+
+def get_store():
+    """Return the process-wide series store, or None when it is disabled."""
+    return _store
+
+
+def configure(directory=DEFAULT_DIRECTORY):
+    """
+    Replace the process-wide series store.
+
+    Args:
+        directory (str, optional): Root directory of the store; None disables it.
+
+    Returns:
+        SeriesStore | None: The new store.
+    """
+    global _store
+    _store = SeriesStore(directory) if directory else None
+    logger.info(f"Configured series store: {directory or 'off'}")
+    return _store
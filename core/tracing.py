@@ -0,0 +1,274 @@
+import contextvars
+import functools
+import json
+import logging
+import random
+import threading
+import time
+import urllib.request
+from contextlib import nullcontext
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = "plugflow"
+DEFAULT_BATCH_SIZE = 512        # Spans buffered before the OTLP exporter posts them
+
+_current_span = contextvars.ContextVar("plugflow_current_span", default=None)
+_exporters = []
+_NOOP = nullcontext()
+
+
+class Span:
+    """A timed operation with attributes, nested under the span active when it started."""
+
+    def __init__(self, name, attributes, parent=None):
+        self.name = name
+        self.attributes = dict(attributes)
+        self.trace_id = parent.trace_id if parent else f"{random.getrandbits(128):032x}"
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent.span_id if parent else None
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.error = None
+
+    def set_attribute(self, key, value):
+        """Attach an attribute to the span."""
+        self.attributes[key] = value
+
+    def to_dict(self):
+        """Return the span as a JSON-serializable dict."""
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": (self.end_ns - self.start_ns) / 1e6,
+            "attributes": self.attributes,
+            "status": "error" if self.error else "ok",
+            "error": self.error,
+        }
+
+
+class _SpanScope:
+    """Context manager making a span current for the enclosed code."""
+
+    def __init__(self, name, attributes):
+        self.span = Span(name, attributes, _current_span.get())
+
+    def __enter__(self):
+        self._token = _current_span.set(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb):
+        _current_span.reset(self._token)
+        self.span.end_ns = time.time_ns()
+        if exc is not None:
+            self.span.error = f"{exc_type.__name__}: {exc}"
+        for exporter in _exporters:
+            try:
+                exporter.export(self.span)
+            except Exception as e:
+                logger.warning(f"Span exporter {type(exporter).__name__} failed: {e}")
+        return False
+
+
+def span(name, **attributes):
+    """
+    Trace the enclosed code as a span nested under the current one.
+
+    Without a configured exporter this returns a shared no-op context, so
+    instrumented code costs next to nothing when tracing is off.
+
+    Args:
+        name (str): Name of the operation.
+        **attributes: Attributes attached to the span.
+
+    Returns:
+        A context manager yielding the ``Span``, or None when tracing is off.
+    """
+    if not _exporters:
+        return _NOOP
+    return _SpanScope(name, attributes)
+
+
+def traced(name=None):
+    """Decorator tracing every call of a function as a span, named after the function by default."""
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def enabled():
+    """Return True if spans are being exported."""
+    return bool(_exporters)
+
+
+def current_span():
+    """Return the span active in this context, or None."""
+    return _current_span.get()
+
+
+class JSONFileExporter:
+    """Append every finished span to a file as one JSON object per line."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def export(self, span):
+        line = json.dumps(span.to_dict(), default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+
+    def shutdown(self):
+        with self._lock:
+            self._file.close()
+
+
+def _otlp_value(value):
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def to_otlp(spans):
+    """
+    Encode spans as an OTLP/HTTP JSON ``ExportTraceServiceRequest``.
+
+    Args:
+        spans (list): Finished ``Span`` objects.
+
+    Returns:
+        dict: The request body.
+    """
+    encoded = []
+    for s in spans:
+        record = {
+            "traceId": s.trace_id,
+            "spanId": s.span_id,
+            "name": s.name,
+            "kind": 1,
+            "startTimeUnixNano": str(s.start_ns),
+            "endTimeUnixNano": str(s.end_ns),
+            "attributes": [{"key": key, "value": _otlp_value(value)} for key, value in s.attributes.items()],
+            "status": {"code": 2, "message": s.error} if s.error else {"code": 1},
+        }
+        if s.parent_id:
+            record["parentSpanId"] = s.parent_id
+        encoded.append(record)
+    return {"resourceSpans": [{
+        "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]},
+        "scopeSpans": [{"scope": {"name": "plugflow.core.tracing"}, "spans": encoded}],
+    }]}
+
+
+class OTLPExporter:
+    """
+    Post spans in OTLP/HTTP JSON to a collector, e.g. ``http://localhost:4318/v1/traces``.
+
+    Spans are buffered and sent in batches of ``batch_size`` and on shutdown.
+    Exports use ``urllib`` directly so they are never traced, rate-limited or
+    retried themselves; a failing collector only costs a warning.
+    """
+
+    def __init__(self, endpoint, batch_size=DEFAULT_BATCH_SIZE, timeout=5):
+        self.endpoint = endpoint
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self._buffer = []
+        self._lock = threading.Lock()
+
+    def export(self, span):
+        with self._lock:
+            self._buffer.append(span)
+            if len(self._buffer) < self.batch_size:
+                return
+            batch, self._buffer = self._buffer, []
+        self._post(batch)
+
+    def _post(self, batch):
+        body = json.dumps(to_otlp(batch)).encode("utf-8")
+        request = urllib.request.Request(self.endpoint, data=body, headers={"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout):
+                pass
+        except OSError as e:
+            logger.warning(f"Could not export {len(batch)} spans to {self.endpoint}: {e}")
+
+    def shutdown(self):
+        with self._lock:
+            batch, self._buffer = self._buffer, []
+        if batch:
+            self._post(batch)
+
+
+def instrument_models(module):
+    """
+    Trace validation of the pydantic models defined in ``module`` as ``pydantic.validate`` spans.
+
+    Wraps the ``__init__`` of each model class once, so the models of an agent
+    are timed without editing the agent, while other pydantic models are left
+    untouched. Does nothing when pydantic is not installed.
+
+    Args:
+        module (module): Module whose models are instrumented, e.g. an agent module.
+    """
+    try:
+        from pydantic import BaseModel
+    except ImportError:
+        return
+    for model in list(vars(module).values()):
+        if not isinstance(model, type) or not issubclass(model, BaseModel) or model.__module__ != module.__name__:
+            continue
+        if not getattr(model.__init__, "_plugflow_traced", False):
+            model.__init__ = _traced_init(model.__init__)
+
+
+def _traced_init(original):
+    @functools.wraps(original)
+    def __init__(self, *args, **kwargs):
+        with span("pydantic.validate", model=type(self).__name__):
+            original(self, *args, **kwargs)
+
+    __init__._plugflow_traced = True
+    return __init__
+
+
+def configure(path=None, endpoint=None):
+    """
+    Start exporting spans.
+
+    Args:
+        path (str, optional): File receiving one JSON span per line.
+        endpoint (str, optional): OTLP/HTTP JSON traces endpoint of a collector.
+    """
+    shutdown()
+    if path:
+        _exporters.append(JSONFileExporter(path))
+    if endpoint:
+        _exporters.append(OTLPExporter(endpoint))
+    if _exporters:
+        logger.info(f"Tracing enabled: {', '.join(type(exporter).__name__ for exporter in _exporters)}")
+
+
+def shutdown():
+    """Flush and remove every exporter."""
+    while _exporters:
+        exporter = _exporters.pop()
+        try:
+            exporter.shutdown()
+        except Exception as e:
+            logger.warning(f"Span exporter {type(exporter).__name__} failed to shut down: {e}")
@@ -0,0 +1,450 @@
+import asyncio
+import logging
+import threading
+import time
+from http.cookiejar import DefaultCookiePolicy
+from urllib.parse import urlsplit
+import httpx
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from urllib3.exceptions import NewConnectionError
+from core import breaker, cassette, deadline, metrics, ratelimit, retry, tracing
+from core.context import current_agent, current_agent_instance
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_CONNECTIONS = 20   # Number of per-host pools kept alive
+DEFAULT_POOL_MAXSIZE = 10       # Keep-alive connections per host
+DEFAULT_TIMEOUT = (5, 30)       # (connect, read) seconds
+ASYNC_ARGUMENTS = frozenset({"params", "headers", "data", "json", "timeout"})
+
+
+class Transport:
+    """
+    Shared HTTP transport with per-host keep-alive connection pools.
+
+    All agents that go through the same transport reuse open TCP/TLS
+    connections to a host instead of paying the handshake on every call.
+    Cookies are never stored, so calls stay as stateless as bare ``requests.get``.
+    Every request first waits for the rate limiter of its host and passes its
+    circuit breaker; transient failures are retried according to the calling
+    agent's retry policy. Connect and read timeouts are shortened to end
+    before the deadline of the flow or step being executed. Latency, status,
+    response size and retries of every attempt are recorded in ``core.metrics``,
+    and each request is traced as an ``http.request`` span with one
+    ``http.attempt`` child per attempt. When cassettes are configured
+    (``core.cassette``), responses are recorded or replayed underneath all of this.
+
+    ``arequest`` goes through the same layers from an event loop, sending
+    requests with an ``httpx.AsyncClient`` so that many calls are in flight
+    without a thread each.
+    """
+
+    def __init__(self, pool_connections=DEFAULT_POOL_CONNECTIONS, pool_maxsize=DEFAULT_POOL_MAXSIZE,
+                 timeout=DEFAULT_TIMEOUT, limiter=None, retry_policy=None):
+        """
+        Initialize the transport.
+
+        Args:
+            pool_connections (int): Number of host pools to keep.
+            pool_maxsize (int): Maximum keep-alive connections per host.
+            timeout (float | tuple): Default ``(connect, read)`` timeout in seconds.
+            limiter (RateLimiter, optional): Limiter to apply, defaults to the
+                shared one configured from the agent manifests.
+            retry_policy (RetryPolicy, optional): Policy to apply, defaults to
+                the one of the agent currently executing.
+        """
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.timeout = timeout
+        self.limiter = limiter
+        self.retry_policy = retry_policy
+        self._session = None
+        self._lock = threading.Lock()
+        self._async_client = None
+        self._async_loop = None
+
+    @property
+    def session(self):
+        """The underlying ``requests.Session``, created on first use."""
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    session = requests.Session()
+                    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+                    adapter = cassette.adapter(pool_connections=self.pool_connections,
+                                               pool_maxsize=self.pool_maxsize)
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    self._session = session
+        return self._session
+
+    def set_pool_size(self, host, pool_maxsize):
+        """
+        Give a host its own pool size, e.g. for a heavily used RapidAPI host.
+
+        Args:
+            host (str): Host name, optionally with a port.
+            pool_maxsize (int): Maximum keep-alive connections to the host.
+        """
+        adapter = cassette.adapter(pool_connections=1, pool_maxsize=pool_maxsize)
+        self.session.mount(f"https://{host}/", adapter)
+        self.session.mount(f"http://{host}/", adapter)
+
+    def request(self, method, url, **kwargs):
+        """
+        Send a request through the pooled session.
+
+        Accepts the same keyword arguments as ``requests.request``; a default
+        timeout is applied when none is given, capped to the current deadline.
+
+        Returns:
+            requests.Response: The response.
+
+        Raises:
+            RateLimitExceeded: If the host's limits do not allow the call.
+            CircuitOpenError: If the host's circuit is open.
+            DeadlineExceeded: If the current deadline passes before a response.
+            requests.RequestException: If the request fails after its retries.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        host = urlsplit(url).hostname
+        limiter = self.limiter or ratelimit.get_limiter()
+        agent_name = current_agent()
+        policy = self.retry_policy or retry.policy_for(agent_name)
+        health_check = breaker.health_probe(current_agent_instance())
+        attempts = 0
+
+        def attempt():
+            limiter.acquire(host, ratelimit.request_api_key(kwargs))
+            deadline.check()
+            timeout = deadline.cap_timeout(kwargs["timeout"])
+            started = time.perf_counter()
+            try:
+                with tracing.span("http.attempt", attempt=attempts):
+                    response = self.session.request(method, url, **{**kwargs, "timeout": timeout})
+            except requests.RequestException as e:
+                raise _failed_attempt(host, agent_name, started, e)
+            _finished_attempt(host, agent_name, started, response, kwargs.get("stream"))
+            return response
+
+        def send():
+            nonlocal attempts
+            attempts += 1
+            if attempts > 1:
+                metrics.record_retry(host, agent_name)
+            deadline.check()
+            return breaker.get_breaker(host).call(attempt, health_check=health_check)
+
+        with tracing.span("http.request", method=method.upper(), host=host) as request_span:
+            response = policy.call(method, send)
+            _trace_response(request_span, response, attempts)
+        return response
+
+    async def arequest(self, method, url, **kwargs):
+        """
+        Send a request without blocking the event loop, see ``request``.
+
+        Only the ``params``, ``headers``, ``data``, ``json`` and ``timeout``
+        arguments are supported. While cassettes record or replay, the pooled
+        session sends the request on a worker thread instead.
+
+        Returns:
+            requests.Response: The response, so that agents handle it as on the blocking path.
+        """
+        unsupported = set(kwargs) - ASYNC_ARGUMENTS
+        if unsupported:
+            raise TypeError(f"Unsupported arguments for an async request: {', '.join(sorted(unsupported))}")
+        kwargs.setdefault("timeout", self.timeout)
+        host = urlsplit(url).hostname
+        limiter = self.limiter or ratelimit.get_limiter()
+        agent_name = current_agent()
+        policy = self.retry_policy or retry.policy_for(agent_name)
+        attempts = 0
+
+        async def attempt():
+            await limiter.aacquire(host, ratelimit.request_api_key(kwargs))
+            deadline.check()
+            timeout = deadline.cap_timeout(kwargs["timeout"])
+            started = time.perf_counter()
+            try:
+                with tracing.span("http.attempt", attempt=attempts):
+                    response = await self._asend(method, url, {**kwargs, "timeout": timeout})
+            except requests.RequestException as e:
+                raise _failed_attempt(host, agent_name, started, e)
+            _finished_attempt(host, agent_name, started, response)
+            return response
+
+        async def send():
+            nonlocal attempts
+            attempts += 1
+            if attempts > 1:
+                metrics.record_retry(host, agent_name)
+            deadline.check()
+            return await breaker.get_breaker(host).acall(attempt)
+
+        with tracing.span("http.request", method=method.upper(), host=host) as request_span:
+            response = await policy.acall(method, send)
+            _trace_response(request_span, response, attempts)
+        return response
+
+    def _client(self):
+        """Return the ``httpx.AsyncClient`` of the running event loop, created on first use."""
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_loop is not loop:
+            limits = httpx.Limits(max_keepalive_connections=self.pool_connections * self.pool_maxsize)
+            client = httpx.AsyncClient(limits=limits, follow_redirects=True)
+            client.cookies.jar.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+            self._async_client, self._async_loop = client, loop
+        return self._async_client
+
+    async def _asend(self, method, url, kwargs):
+        """Send one attempt, translating ``httpx`` errors into their ``requests`` equivalents."""
+        if cassette.mode() != cassette.OFF:
+            return await asyncio.to_thread(self.session.request, method, url, **kwargs)
+        data = kwargs.get("data")
+        content = data if isinstance(data, (bytes, str)) else None
+        params = kwargs.get("params")
+        if isinstance(params, dict):
+            params = {name: value for name, value in params.items() if value is not None}
+        try:
+            response = await self._client().request(
+                method, url, params=params, headers=kwargs.get("headers"), content=content,
+                data=None if content is not None else data, json=kwargs.get("json"),
+                timeout=_httpx_timeout(kwargs["timeout"]))
+        except httpx.ConnectTimeout as e:
+            raise requests.ConnectTimeout(str(e)) from e
+        except httpx.TimeoutException as e:
+            raise requests.ReadTimeout(str(e)) from e
+        except httpx.ConnectError as e:
+            # Like requests, report a connection that never opened through urllib3's error.
+            message = f"Failed to establish a new connection: {e}"
+            raise requests.ConnectionError(NewConnectionError(urlsplit(url).hostname, message)) from e
+        except httpx.TransportError as e:
+            raise requests.ConnectionError(str(e)) from e
+        except httpx.HTTPError as e:
+            raise requests.RequestException(str(e)) from e
+        return _to_requests_response(response)
+
+    def get(self, url, **kwargs):
+        """Send a GET request, see ``request``."""
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, data=None, json=None, **kwargs):
+        """Send a POST request, see ``request``."""
+        return self.request("POST", url, data=data, json=json, **kwargs)
+
+    async def aget(self, url, **kwargs):
+        """Send a GET request without blocking the event loop, see ``arequest``."""
+        return await self.arequest("GET", url, **kwargs)
+
+    async def apost(self, url, data=None, json=None, **kwargs):
+        """Send a POST request without blocking the event loop, see ``arequest``."""
+        return await self.arequest("POST", url, data=data, json=json, **kwargs)
+
+    def close(self):
+        """Close every pooled connection."""
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+            self._async_client = self._async_loop = None
+
+    async def aclose(self):
+        """Close the connections of the event loop's async client."""
+        client, self._async_client, self._async_loop = self._async_client, None, None
+        if client is not None:
+            await client.aclose()
+
+
+def _failed_attempt(host, agent_name, started, error):
+    """Record a failed attempt and return the exception to raise for it."""
+    metrics.record_http(host, agent_name, time.perf_counter() - started, error=error)
+    # A timeout cut short by the deadline says nothing about the host.
+    if isinstance(error, requests.Timeout) and deadline.expired():
+        return deadline.DeadlineExceeded(f"Deadline exceeded calling {host}")
+    return error
+
+
+def _finished_attempt(host, agent_name, started, response, stream=False):
+    """Record an attempt that received a response."""
+    metrics.record_http(host, agent_name, time.perf_counter() - started, status=response.status_code,
+                        size=_response_size(response, stream))
+
+
+def _trace_response(request_span, response, attempts):
+    """Describe the outcome of a request on its span."""
+    if request_span is not None:
+        request_span.set_attribute("status_code", response.status_code)
+        request_span.set_attribute("attempts", attempts)
+        _trace_json_decode(response)
+
+
+def _httpx_timeout(timeout):
+    """Convert a ``requests`` timeout into an ``httpx.Timeout``."""
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        return httpx.Timeout(read, connect=connect)
+    return httpx.Timeout(timeout)
+
+
+def _to_requests_response(response):
+    """Convert an ``httpx.Response`` into a ``requests.Response``."""
+    converted = requests.Response()
+    converted.status_code = response.status_code
+    converted.reason = response.reason_phrase
+    converted.headers = CaseInsensitiveDict(response.headers.items())
+    converted.encoding = get_encoding_from_headers(converted.headers)
+    converted.url = str(response.url)
+    converted.elapsed = response.elapsed
+    converted._content = response.content
+    return converted
+
+
+def _trace_json_decode(response):
+    """Make ``response.json()`` report its decoding time as a ``json.decode`` span."""
+    decode = response.json
+
+    def json(**kwargs):
+        with tracing.span("json.decode", bytes=len(response.content or b"")):
+            return decode(**kwargs)
+
+    response.json = json
+
+
+def _response_size(response, stream=False):
+    """Return the body size of a response, or None when it is streamed without a length."""
+    length = response.headers.get("Content-Length")
+    if length is not None and length.isdigit():
+        return int(length)
+    if stream or response.content is None:
+        return None
+    return len(response.content)
+
+
+class PooledResponse:
+    """Minimal ``http.client.HTTPResponse`` view over a ``requests.Response``."""
+
+    def __init__(self, response):
+        self._response = response
+        self.status = response.status_code
+        self.reason = response.reason
+
+    def read(self):
+        """Return the response body as bytes."""
+        return self._response.content
+
+    def getheader(self, name, default=None):
+        """Return a response header value."""
+        return self._response.headers.get(name, default)
+
+    def getheaders(self):
+        """Return the response headers as a list of pairs."""
+        return list(self._response.headers.items())
+
+
+class PooledConnection:
+    """
+    Drop-in replacement for ``http.client.HTTPSConnection`` backed by the shared pool.
+
+    ``close()`` does not tear down the socket; the connection goes back to the
+    host pool so the next call to the same host skips the TCP and TLS handshake.
+    """
+    scheme = "https"
+
+    def __init__(self, host, port=None, timeout=None, transport=None):
+        """
+        Initialize the connection.
+
+        Args:
+            host (str): Host name to connect to.
+            port (int, optional): Port, defaults to 443.
+            timeout (float, optional): Timeout overriding the transport default.
+            transport (Transport, optional): Transport to use, defaults to the shared one.
+        """
+        self.host = f"{host}:{port}" if port else host
+        self.timeout = timeout
+        self._transport = transport
+        self._response = None
+
+    def request(self, method, url, body=None, headers=None):
+        """Send a request for ``url`` (a path) on this host."""
+        transport = self._transport or get_transport()
+        kwargs = {"data": body, "headers": headers or {}}
+        if self.timeout is not None:
+            kwargs["timeout"] = self.timeout
+        self._response = transport.request(method, f"{self.scheme}://{self.host}{url}", **kwargs)
+
+    def getresponse(self):
+        """Return the response to the last request."""
+        if self._response is None:
+            raise RuntimeError("No request has been sent on this connection")
+        return PooledResponse(self._response)
+
+    def close(self):
+        """Release the last response; the socket stays in the pool."""
+        self._response = None
+
+
+_default_transport = None
+_default_lock = threading.Lock()
+
+
+def get_transport():
+    """Return the process-wide shared transport."""
+    global _default_transport
+    if _default_transport is None:
+        with _default_lock:
+            if _default_transport is None:
+                _default_transport = Transport()
+    return _default_transport
+
+
+def configure(**settings):
+    """
+    Replace the shared transport with one using the given settings.
+
+    Args:
+        **settings: Keyword arguments accepted by ``Transport``.
+
+    Returns:
+        Transport: The new shared transport.
+    """
+    global _default_transport
+    with _default_lock:
+        previous, _default_transport = _default_transport, Transport(**settings)
+    if previous is not None:
+        previous.close()
+    logger.info(f"Configured HTTP transport: {settings}")
+    return _default_transport
+
+
+def request(method, url, **kwargs):
+    """Send a request through the shared transport."""
+    return get_transport().request(method, url, **kwargs)
+
+
+def get(url, **kwargs):
+    """Send a GET request through the shared transport."""
+    return get_transport().get(url, **kwargs)
+
+
+def post(url, data=None, json=None, **kwargs):
+    """Send a POST request through the shared transport."""
+    return get_transport().post(url, data=data, json=json, **kwargs)
+
+
+async def arequest(method, url, **kwargs):
+    """Send a request through the shared transport without blocking the event loop."""
+    return await get_transport().arequest(method, url, **kwargs)
+
+
+async def aget(url, **kwargs):
+    """Send a GET request through the shared transport without blocking the event loop."""
+    return await get_transport().aget(url, **kwargs)
+
+
+async def apost(url, data=None, json=None, **kwargs):
+    """Send a POST request through the shared transport without blocking the event loop."""
+    return await get_transport().apost(url, data=data, json=json, **kwargs)
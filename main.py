@@ -1,25 +1,224 @@
+import json
+import os
+import asyncio
 import click
+from benchmarks.runner import run_suite, compare, DEFAULT_CALLS, DEFAULT_CONCURRENCY, DEFAULT_THRESHOLD, RESULTS_DIR
+from core import breaker, cache, cassette, metrics, ratelimit, timeseries, tracing
 from core.discovery import discover_agents
-from core.executor import execute_agent_flow
+from core.executor import (
+    execute_agent_flow, execute_agent_dag, aexecute_agent_dag, execute_agent_batch,
+    DEFAULT_MAX_WORKERS, DEFAULT_MAX_CONCURRENCY,
+)
+from core.server import make_server, DEFAULT_HOST, DEFAULT_PORT
 
 @click.group()
-
-def cli():
+@click.option("--cache", "cache_backend", type=click.Choice(["memory", "sqlite", "off"]), default="memory",
+              show_default=True, envvar="PLUGFLOW_CACHE",
+              help="Response cache for agents declaring a cache TTL in their manifest")
+@click.option("--cache-path", default=cache.DEFAULT_SQLITE_PATH, show_default=True,
+              help="Database file used by the sqlite cache")
+@click.option("--series-store", default=timeseries.DEFAULT_DIRECTORY, show_default=True, envvar="PLUGFLOW_SERIES_STORE",
+              help="Directory where market data agents keep downloaded time series, 'off' to always download")
+@click.option("--metrics", "show_metrics", is_flag=True, envvar="PLUGFLOW_METRICS",
+              help="Print a JSON summary of agent and HTTP metrics to stderr when the command ends")
+@click.option("--trace", "trace_path", default=None, envvar="PLUGFLOW_TRACE",
+              help="Append a JSON line per traced span (discovery, agents, HTTP calls) to this file")
+@click.option("--trace-endpoint", default=None, envvar="PLUGFLOW_TRACE_ENDPOINT",
+              help="OTLP/HTTP JSON traces endpoint to export spans to, e.g. http://localhost:4318/v1/traces")
+@click.option("--record", "record_dir", default=None, envvar="PLUGFLOW_RECORD",
+              help="Record every HTTP response into per-agent cassettes in this directory")
+@click.option("--replay", "replay_dir", default=None, envvar="PLUGFLOW_REPLAY",
+              help="Serve HTTP responses from the cassettes in this directory instead of the network")
+@click.option("--replay-latency", default=0.0, show_default=True, help="Seconds every replayed response waits")
+@click.option("--replay-jitter", default=0.0, show_default=True,
+              help="Up to this many extra seconds added to each replayed response")
+@click.option("--replay-error-rate", default=0.0, show_default=True,
+              help="Share of replayed responses turned into 503 errors")
+@click.option("--replay-seed", type=int, default=None, help="Seed making jitter and injected errors reproducible")
+@click.pass_context
+def cli(ctx, cache_backend, cache_path, series_store, show_metrics, trace_path, trace_endpoint, record_dir, replay_dir,
+        replay_latency, replay_jitter, replay_error_rate, replay_seed):
     """A CLI Tool with Agent Support"""
-    pass
+    if record_dir and replay_dir:
+        raise click.UsageError("--record and --replay cannot be combined")
+    try:
+        if record_dir:
+            cassette.configure(cassette.RECORD, record_dir)
+            ctx.call_on_close(cassette.shutdown)
+        elif replay_dir:
+            cassette.configure(cassette.REPLAY, replay_dir, latency=replay_latency, jitter=replay_jitter,
+                               error_rate=replay_error_rate, seed=replay_seed)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    if trace_path or trace_endpoint:
+        tracing.configure(path=trace_path, endpoint=trace_endpoint)
+        ctx.call_on_close(tracing.shutdown)
+    if show_metrics:
+        ctx.call_on_close(lambda: click.echo(json.dumps(metrics.summary(), indent=2), err=True))
+    if cache_backend == "sqlite":
+        cache.configure("sqlite", path=cache_path)
+    elif cache_backend == "off":
+        cache.configure("off")
+    if series_store != timeseries.DEFAULT_DIRECTORY:
+        timeseries.configure(None if series_store == "off" else series_store)
 
 @cli.command()
 @click.argument("flow", nargs=-1)
 @click.option("--params", default="", help="Additional parameters for agents (JSON format)")
-def execute(flow, params):
+@click.option("--spec", type=click.File("r"), default=None,
+              help="Flow specification file (JSON) declaring steps and their dependencies")
+@click.option("--parallel", is_flag=True, help="Run the agents in FLOW concurrently")
+@click.option("--max-workers", default=DEFAULT_MAX_WORKERS, show_default=True,
+              help="Maximum number of agents running at once with --spec or --parallel")
+@click.option("--async", "use_async", is_flag=True,
+              help="Drive the flow on an event loop; agents without aexecute run on worker threads")
+@click.option("--max-concurrency", default=DEFAULT_MAX_CONCURRENCY, show_default=True,
+              help="Maximum number of async agents in flight with --async")
+@click.option("--timeout", type=float, default=None,
+              help="Deadline of the whole flow in seconds; results of finished agents are still printed")
+@click.option("--step-timeout", type=float, default=None,
+              help="Deadline of each agent in seconds, applied to its HTTP connect and read timeouts")
+@click.option("--stream", is_flag=True,
+              help="Write results as NDJSON as they arrive, one line per record for agents that stream them")
+@click.option("--output", "output_file", type=click.File("w"), default="-", show_default=True,
+              help="File receiving the NDJSON output of --stream, '-' for stdout")
+def execute(flow, params, spec, parallel, max_workers, use_async, max_concurrency, timeout, step_timeout, stream,
+            output_file):
     """
     Execute agent in the specified order.
- 
+
     Example: python main.py execute youtube-review --params '{"video_url": "https://youtu.be/abc123"}'
+
+    Steps declared in a --spec file run as soon as the steps they depend on finish:
+
+    Example: python main.py execute --spec flow.json --params '{"api_key": "..."}'
+
+    With --stream, records are written as soon as agents yield them:
+
+    Example: python main.py execute --stream historical_event_scraper --params '{"month": 5, "day": 1}'
     """
+    if stream and (spec or parallel or use_async):
+        raise click.UsageError("--stream runs flows sequentially and cannot be combined with --spec, --parallel "
+                               "or --async")
     agents = discover_agents()
-    execute_agent_flow(flow, agents, params)
+    if use_async:
+        flow_spec = json.load(spec) if spec else list(flow)
+        results = asyncio.run(aexecute_agent_dag(flow_spec, agents, params, max_workers=max_workers,
+                                                 max_concurrency=max_concurrency, timeout=timeout,
+                                                 step_timeout=step_timeout))
+        for step_id, result in results.items():
+            click.echo(f"Result from {step_id}: {result}")
+    elif spec:
+        execute_agent_dag(json.load(spec), agents, params, max_workers=max_workers, timeout=timeout,
+                          step_timeout=step_timeout)
+    elif parallel:
+        execute_agent_dag(list(flow), agents, params, max_workers=max_workers, timeout=timeout,
+                          step_timeout=step_timeout)
+    else:
+        execute_agent_flow(flow, agents, params, timeout=timeout, step_timeout=step_timeout,
+                           sink=output_file if stream else None)
+
+@cli.command("execute-batch")
+@click.argument("agent")
+@click.option("--input", "input_file", type=click.File("r"), default="-", show_default=True,
+              help="JSONL file with one parameter object per line, '-' for stdin")
+@click.option("--output", "output_file", type=click.File("w"), default="-", show_default=True,
+              help="File receiving one JSON result per line, '-' for stdout")
+@click.option("--params", default="", help="Parameters shared by every record (JSON format)")
+@click.option("--max-workers", default=DEFAULT_MAX_WORKERS, show_default=True,
+              help="Maximum number of records executing at once")
+@click.option("--unordered", is_flag=True, help="Write results as they complete instead of in input order")
+@click.option("--timeout", type=float, default=None, help="Deadline of each record in seconds")
+def execute_batch(agent, input_file, output_file, params, max_workers, unordered, timeout):
+    """
+    Execute an agent once per line of a JSONL file.
+
+    Example: python main.py execute-batch bin_checker --input bins.jsonl --params '{"api_key": "..."}'
+
+    Each output line carries the record index and either its result or its error.
+    """
+    agents = discover_agents([agent])
+    try:
+        outcomes = execute_agent_batch(agent, agents, input_file, params=params, max_workers=max_workers,
+                                       ordered=not unordered, timeout=timeout)
+        for outcome in outcomes:
+            output_file.write(json.dumps(outcome, default=str) + "\n")
+            output_file.flush()
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    quota = ratelimit.snapshot()
+    if quota:
+        click.echo(f"Rate-limit consumption: {json.dumps(quota)}", err=True)
+    open_circuits = {host: state for host, state in breaker.snapshot().items() if state["state"] != breaker.CLOSED}
+    if open_circuits:
+        click.echo(f"Open circuits: {json.dumps(open_circuits)}", err=True)
+
+@cli.command()
+@click.option("--host", default=DEFAULT_HOST, show_default=True, help="Interface to listen on")
+@click.option("--port", default=DEFAULT_PORT, show_default=True, help="Port to listen on")
+@click.option("--preload", multiple=True, help="Agent to import and instantiate at startup (repeatable)")
+def serve(host, port, preload):
+    """
+    Keep agents loaded and execute requests over HTTP.
+
+    Example: python main.py serve --preload weather
+
+    Then: curl -d '{"agent": "weather", "params": {"city": "Paris"}}' http://127.0.0.1:8765/execute
+    """
+    httpd = make_server(discover_agents(), host=host, port=port, preload=preload)
+    click.echo(f"Serving agents on http://{host}:{httpd.server_address[1]}")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.server_close()
+
+@cli.command()
+@click.argument("agents", nargs=-1)
+@click.option("--calls", default=DEFAULT_CALLS, show_default=True,
+              help="Calls per agent for the warm latency and throughput measurements")
+@click.option("--concurrency", default=DEFAULT_CONCURRENCY, show_default=True,
+              help="Threads of the throughput measurement")
+@click.option("--no-cold", is_flag=True, help="Skip the cold-start measurement in a fresh interpreter")
+@click.option("--output", default=None,
+              help="File receiving the JSON results, defaults to benchmarks/results/<commit>.json")
+@click.option("--compare", "baseline_file", type=click.File("r"), default=None,
+              help="Results of an earlier run; exit with status 1 if any measurement regressed")
+@click.option("--threshold", default=DEFAULT_THRESHOLD, show_default=True,
+              help="Relative change counted as a regression by --compare")
+def bench(agents, calls, concurrency, no_cold, output, baseline_file, threshold):
+    """
+    Benchmark agents against recorded upstream responses served locally.
+
+    Example: python main.py bench weather lyricist --compare benchmarks/results/abc1234.json
+
+    Benchmarks every agent with a fixture in benchmarks/fixtures when AGENTS is empty.
+    """
+    try:
+        results = run_suite(agents, calls=calls, concurrency=concurrency, cold=not no_cold,
+                            progress=lambda name: click.echo(f"Benchmarking {name}...", err=True))
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    for name, measured in results["agents"].items():
+        if "warm_p50_ms" in measured:
+            cold = f"cold {measured['cold_start_ms']:.0f} ms, " if "cold_start_ms" in measured else ""
+            click.echo(f"{name}: {cold}p50 {measured['warm_p50_ms']:.2f} ms, p95 {measured['warm_p95_ms']:.2f} ms, "
+                       f"{measured['throughput_per_s']:.0f} calls/s, peak {measured['peak_memory_kb']:.0f} KiB")
+        else:
+            click.echo(f"{name}: {'skipped' if 'skipped' in measured else 'error'}, "
+                       f"{measured.get('skipped') or measured.get('error')}")
+    output = output or os.path.join(RESULTS_DIR, f"{results['commit'] or 'results'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    click.echo(f"Results written to {output}", err=True)
+    if baseline_file:
+        regressions = compare(json.load(baseline_file), results, threshold=threshold)
+        for name, key, before, after in regressions:
+            click.echo(f"Regression in {name} {key}: {before:.2f} -> {after:.2f}", err=True)
+        if regressions:
+            raise SystemExit(1)
 
 if __name__ == "__main__":
     cli()
-